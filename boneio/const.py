@@ -22,6 +22,8 @@ TOGGLE = "TOGGLE"
 STATE = "state"
 BRIGHTNESS = "brightness"
 SET_BRIGHTNESS = "set_brightness"
+TRANSITION = "transition"
+DIM = "dim"
 ENABLED = "enabled"
 OUTPUT = "output"
 PIN = "pin"
@@ -30,6 +32,7 @@ KIND = "kind"
 GPIO = "gpio"
 PCA = "pca"
 GPIO_MODE = "gpio_mode"
+GPIO_BACKEND = "gpio_backend"
 ACTIONS = "actions"
 ACTION = "action"
 SWITCH = "switch"
@@ -84,8 +87,11 @@ INPUT = "input"
 SINGLE = "single"
 DOUBLE = "double"
 LONG = "long"
+TRIPLE = "triple"
+HOLD = "hold"
 PRESSED = "pressed"
 RELEASED = "released"
+EDGE_GUARD = "edge_guard"
 
 
 # MQTT CONST
@@ -112,7 +118,19 @@ MCP_ID = "mcp_id"
 PCA_ID = "pca_id"
 PCF_ID = "pcf_id"
 INIT_SLEEP = "init_sleep"
+I2C_STATE = "i2c"
+I2C_DEVICE_STATE = "i2c_device"
+I2C_BUS = "i2c_bus"
+I2C_BUSES = "i2c_buses"
+I2C_STATS = "i2c_stats"
+DRIVER = "driver"
+BLINKA = "blinka"
+NATIVE = "native"
+VERIFY_INTERVAL = "verify_interval"
 OUTPUT_GROUP = "output_group"
+COVER_GROUP = "cover_group"
+COVER_ENGINE = "cover_engine"
+INTERLOCK = "interlock"
 
 # SENSOR CONST
 TEMPERATURE = "temperature"
@@ -122,6 +140,7 @@ BINARY_SENSOR = "binary_sensor"
 LM75 = "lm75"
 MCP_TEMP_9808 = "mcp9808"
 INPUT_SENSOR = "inputsensor"
+PULSE_COUNTER = "pulse_counter"
 DS2482 = "ds2482"
 DALLAS = "dallas"
 ONEWIRE = "onewire"
@@ -131,6 +150,7 @@ LENGTH = "length"
 REGISTERS = "registers"
 
 COVER = "cover"
+COVER_TILT = "cover_tilt"
 IDLE = "idle"
 OPENING = "opening"
 CLOSING = "closing"
@@ -140,7 +160,7 @@ CLOSE = "close"
 STOP = "stop"
 
 # TYPING
-ClickTypes = Literal[SINGLE, DOUBLE, LONG, PRESSED, RELEASED]
+ClickTypes = Literal[SINGLE, DOUBLE, TRIPLE, LONG, HOLD, PRESSED, RELEASED]
 OledDataTypes = Literal[UPTIME, NETWORK, CPU, DISK, MEMORY, SWAP, OUTPUT]
 Gpio_States = Literal[HIGH, LOW]
 Gpio_Edges = Literal[BOTH, FALLING]
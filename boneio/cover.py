@@ -2,12 +2,14 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Callable
+from typing import Callable, List
 
 from boneio.const import CLOSE, CLOSED, CLOSING, COVER, IDLE, OPEN, OPENING, STOP
+from boneio.cover_engine import CoverEngine
 from boneio.helper.events import EventBus
 from boneio.helper.mqtt import BasicMqtt
 from boneio.helper.timeperiod import TimePeriod
+from boneio.helper.timer import TimerEntry
 from boneio.relay import MCPRelay
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,6 +22,9 @@ COVER_COMMANDS = {
     "toggle_open": "toggle_open",
 }
 
+# Time between stop of motor and start in other direction.
+DEFAULT_DEAD_TIME = 0.5
+
 
 class RelayHelper:
     """Relay helper for cover either open/close."""
@@ -27,7 +32,7 @@ class RelayHelper:
     def __init__(self, relay: MCPRelay, time: TimePeriod) -> None:
         """Initialize helper."""
         self._relay = relay
-        self._steps = 100 / time.total_seconds
+        self._speed = 100 / time.total_seconds
 
     @property
     def relay(self) -> MCPRelay:
@@ -35,13 +40,28 @@ class RelayHelper:
         return self._relay
 
     @property
-    def steps(self) -> int:
-        """Get steps for each time."""
-        return self._steps
+    def speed(self) -> float:
+        """Get travel in percents per second."""
+        return self._speed
 
 
 class Cover(BasicMqtt):
-    """Cover class of boneIO"""
+    """Cover class of boneIO.
+
+    Position is computed from monotonic time elapsed since motor started, and
+    motor is stopped by timer at exact time when requested position is
+    reached. While moving, cover engine publishes its position. Position is
+    saved only when cover comes to rest at new position.
+
+    New target of moving cover in same direction only moves stop time, relays
+    are not touched. Change of direction stops motor and starts it the other
+    way after dead time, new targets during dead time only update target.
+
+    With tilt time, every move starts with tilt phase: slats turn fully in
+    direction of move first (open tilt is 100), only then cover travels.
+    Move to same position only turns slats. Tilt requested together with
+    position is set by reverse tilt move once position is reached.
+    """
 
     def __init__(
         self,
@@ -52,7 +72,11 @@ class Cover(BasicMqtt):
         open_time: TimePeriod,
         close_time: TimePeriod,
         event_bus: EventBus,
+        cover_engine: CoverEngine,
+        dead_time: TimePeriod | None = None,
+        tilt_time: TimePeriod | None = None,
         restored_state: int = 100,
+        restored_tilt: int = 100,
         **kwargs,
     ) -> None:
         """Initialize cover class."""
@@ -63,12 +87,29 @@ class Cover(BasicMqtt):
         self._state_save = state_save
         self._open = RelayHelper(relay=open_relay, time=open_time)
         self._close = RelayHelper(relay=close_relay, time=close_time)
-        self._set_position = None
+        self._dead_time = dead_time.total_in_seconds if dead_time else DEFAULT_DEAD_TIME
+        self._tilt_time = tilt_time.total_in_seconds if tilt_time else 0
+        self._target = None
+        self._target_tilt = None
+        self._next_tilt = None
         self._current_operation = IDLE
         self._position = restored_state
-        self._requested_closing = True
+        self._tilt = restored_tilt if self._tilt_time else None
+        self._move_start = None
+        self._move_start_position = None
+        self._move_start_tilt = None
+        self._tilt_phase = 0.0
+        self._last_direction = None
+        self._halted_at = None
+        self._start_entry: TimerEntry | None = None
+        self._stop_entry: TimerEntry | None = None
         self._event_bus = event_bus
-        self._timer_handle = None
+        self._cover_engine = cover_engine
+        self._published_position = None
+        self._published_tilt = None
+        self._saved_position = restored_state
+        self._saved_tilt = self._tilt
+        self._state_listeners: List[Callable[[], None]] = []
         if self._position is None:
             self._closed = True
         else:
@@ -83,26 +124,117 @@ class Cover(BasicMqtt):
     async def run_cover(
         self,
         current_operation: str,
+        target: float | None,
+        tilt: int | None = None,
     ) -> None:
-        """Run cover engine."""
-        if self._current_operation != IDLE:
-            self._stop_cover()
-        self._current_operation = current_operation
-
-        def get_relays():
-            if current_operation == OPENING:
-                return (self._open.relay, self._close.relay)
-            else:
-                return (self._close.relay, self._open.relay)
-
-        (relay, inverted_relay) = get_relays()
+        """Run cover engine until target position is reached. Without target
+        position only tilt is changed."""
         async with self._lock:
-            if inverted_relay.is_active:
-                inverted_relay.turn_off()
-            self._timer_handle = self._event_bus.add_listener(
-                f"{COVER}{self.id}", self.listen_cover
+            self._move(current_operation=current_operation, target=target, tilt=tilt)
+
+    def _move(
+        self, current_operation: str, target: float | None, tilt: int | None = None
+    ) -> None:
+        now = self._cover_engine.now()
+        self._target = target
+        self._target_tilt = tilt
+        if current_operation == self._current_operation:
+            if self._move_start is not None:
+                self._schedule_stop(now)
+            return
+        if self._move_start is not None:
+            self._halt(now)
+        if self._start_entry is not None:
+            self._start_entry.cancel()
+            self._start_entry = None
+        self._current_operation = current_operation
+        self._cover_engine.add(self)
+        start_at = now
+        if (
+            self._last_direction not in (None, current_operation)
+            and self._halted_at is not None
+        ):
+            start_at = self._halted_at + self._dead_time
+        if start_at > now:
+            _LOGGER.debug("Cover %s waits dead time before reversing.", self._id)
+            self._start_entry = self._cover_engine.timer_service.call_at(
+                start_at, self._start_motor
             )
-            relay.turn_on()
+        else:
+            self._start_motor()
+
+    def _helpers(self) -> tuple:
+        if self._current_operation == OPENING:
+            return (self._open, self._close)
+        return (self._close, self._open)
+
+    def _start_motor(self) -> None:
+        """Turn relay of current direction on."""
+        self._start_entry = None
+        (helper, inverted) = self._helpers()
+        if inverted.relay.is_active:
+            inverted.relay.turn_off()
+        helper.relay.turn_on()
+        now = self._cover_engine.now()
+        self._move_start = now
+        self._move_start_position = self._position
+        self._move_start_tilt = self._tilt
+        if self._tilt_time:
+            # Time to turn slats fully in direction of move.
+            left = (
+                100 - self._tilt if self._current_operation == OPENING else self._tilt
+            )
+            self._tilt_phase = left / 100 * self._tilt_time
+        self._last_direction = self._current_operation
+        self._schedule_stop(now)
+
+    def _schedule_stop(self, now: float) -> None:
+        """Schedule stop at time when target is reached."""
+        if self._stop_entry is not None:
+            self._stop_entry.cancel()
+        (helper, _) = self._helpers()
+        opening = self._current_operation == OPENING
+        # Without target position cover only tilts where it is.
+        distance = 0 if self._target is None else self._target - self._position_at(now)
+        if not opening:
+            distance = -distance
+        if not self._tilt_time:
+            duration, tilt = max(distance, 0) / helper.speed, None
+        elif distance > 0:
+            # Rest of tilt phase, then travel.
+            tilt = 100 if opening else 0
+            duration = abs(tilt - self._tilt_at(now)) / 100 * self._tilt_time
+            duration += distance / helper.speed
+        else:
+            # Only slats turn.
+            tilt = (
+                self._tilt_at(now) if self._target_tilt is None else self._target_tilt
+            )
+            tilt = (
+                max(tilt, self._tilt_at(now))
+                if opening
+                else min(tilt, self._tilt_at(now))
+            )
+            duration = abs(tilt - self._tilt_at(now)) / 100 * self._tilt_time
+        self._stop_entry = self._cover_engine.timer_service.call_at(
+            now + duration,
+            self._target_reached,
+            self._target,
+            tilt,
+        )
+
+    def _halt(self, now: float) -> None:
+        """Turn motor off and keep position it reached."""
+        self._open.relay.turn_off()
+        self._close.relay.turn_off()
+        if self._move_start is not None:
+            self._position = self._position_at(now)
+            self._tilt = self._tilt_at(now)
+            self._move_start = None
+            self._halted_at = now
+        if self._stop_entry is not None:
+            self._stop_entry.cancel()
+            self._stop_entry = None
 
     def on_exit(self) -> None:
         """Stop on exit."""
@@ -113,6 +245,15 @@ class Cover(BasicMqtt):
         """Current state of cover."""
         return CLOSED if self._closed else OPEN
 
+    @property
+    def is_moving(self) -> bool:
+        """Is cover moving."""
+        return self._current_operation != IDLE
+
+    def add_state_listener(self, listener: Callable[[], None]) -> None:
+        """Call listener every time cover sends its state."""
+        self._state_listeners.append(listener)
+
     def stop(self) -> None:
         """Public Stop cover graceful."""
         _LOGGER.info("Stopping cover %s.", self._id)
@@ -122,111 +263,169 @@ class Cover(BasicMqtt):
     def send_state(self) -> None:
         """Send state of cover to mqtt."""
         self._send_message(topic=f"{self._send_topic}/state", payload=self.cover_state)
-        pos = round(self._position, 0)
+        pos = self.current_cover_position
+        self._published_position = pos
         self._send_message(topic=f"{self._send_topic}/pos", payload=str(pos))
-        self._state_save(position=pos)
+        tilt = self.current_tilt
+        if tilt is not None:
+            self._published_tilt = tilt
+            self._send_message(topic=f"{self._send_topic}/tilt", payload=str(tilt))
+        if not self.is_moving and (pos, tilt) != (
+            self._saved_position,
+            self._saved_tilt,
+        ):
+            self._saved_position = pos
+            self._saved_tilt = tilt
+            if tilt is None:
+                self._state_save(position=pos)
+            else:
+                self._state_save(position=pos, tilt=tilt)
+        for listener in self._state_listeners:
+            listener()
+
+    def _position_at(self, now: float) -> float:
+        """Position of cover at monotonic time now."""
+        if self._move_start is None:
+            return self._position
+        elapsed = max(now - self._move_start - self._tilt_phase, 0)
+        if self._current_operation == OPENING:
+            return min(self._move_start_position + elapsed * self._open.speed, 100)
+        return max(self._move_start_position - elapsed * self._close.speed, 0)
+
+    def _tilt_at(self, now: float) -> float | None:
+        """Tilt of slats at monotonic time now, None without tilt."""
+        if self._move_start is None or not self._tilt_time:
+            return self._tilt
+        change = (now - self._move_start) / self._tilt_time * 100
+        if self._current_operation == OPENING:
+            return min(self._move_start_tilt + change, 100)
+        return max(self._move_start_tilt - change, 0)
+
+    def _target_reached(self, target: float | None, tilt: float | None) -> None:
+        """Stop cover at requested position, called by timer."""
+        self._stop_entry = None
+        self._halt(self._cover_engine.now())
+        if target is not None:
+            self._position = target
+        self._tilt = tilt
+        if self._next_tilt is not None and self._next_tilt != round(tilt):
+            # Position is reached, turn slats back to requested tilt.
+            next_tilt, self._next_tilt = self._next_tilt, None
+            self._move(
+                current_operation=OPENING if next_tilt > tilt else CLOSING,
+                target=None,
+                tilt=next_tilt,
+            )
+            return
+        self._stop_cover()
 
     def _stop_cover(self, on_exit=False) -> None:
         """Stop cover."""
-        self._open.relay.turn_off()
-        self._close.relay.turn_off()
-        if self._timer_handle is not None:
-            self._event_bus.remove_listener(f"{COVER}{self.id}")
-            self._timer_handle = None
-            self._set_position = None
-            if not on_exit:
-                self.send_state()
+        self._halt(self._cover_engine.now())
+        if self._start_entry is not None:
+            self._start_entry.cancel()
+            self._start_entry = None
+        self._closed = self._position <= 0
+        self._target = None
+        self._target_tilt = None
+        self._next_tilt = None
+        was_moving = self.is_moving
         self._current_operation = IDLE
+        self._cover_engine.remove(self)
+        if was_moving and not on_exit:
+            self.send_state()
 
     @property
     def current_cover_position(self) -> int:
         """Return the current position of the cover."""
-        return round(self._position, 0)
+        return round(self._position_at(self._cover_engine.now()))
 
-    def listen_cover(self, *args) -> None:
-        """Listen for change in cover."""
-        if self._current_operation == IDLE:
-            return
+    @property
+    def has_tilt(self) -> bool:
+        """Has cover tilting slats."""
+        return bool(self._tilt_time)
 
-        def get_step():
-            """Get step for current operation."""
-            if self._requested_closing:
-                return -self._close.steps
-            else:
-                return self._open.steps
-
-        step = get_step()
-        self._position += step
-        rounded_pos = round(self._position, 0)
-        if self._set_position:
-            # Set position is only working for every 10%, so round to nearest 10.
-            # Except for start moving time
-            if (self._requested_closing and rounded_pos < 95) or rounded_pos > 5:
-                rounded_pos = round(self._position, -1)
-        else:
-            if rounded_pos > 100:
-                rounded_pos = 100
-            elif rounded_pos < 0:
-                rounded_pos = 0
-        self._send_message(topic=f"{self._send_topic}/pos", payload=rounded_pos)
-        if rounded_pos == self._set_position or (
-            self._set_position is None and (rounded_pos >= 100 or rounded_pos <= 0)
-        ):
-            self._position = rounded_pos
-            self._closed = self.current_cover_position <= 0
-            self._stop_cover()
-            return
+    @property
+    def current_tilt(self) -> int | None:
+        """Return the current tilt of slats, None without tilt."""
+        tilt = self._tilt_at(self._cover_engine.now())
+        return None if tilt is None else round(tilt)
 
-        self._closed = self.current_cover_position <= 0
+    def publish_position(self) -> None:
+        """Publish position of moving cover if it changed, called by engine."""
+        if self._current_operation == IDLE:
+            return
+        position = self.current_cover_position
+        self._closed = position <= 0
+        if position != self._published_position:
+            self._published_position = position
+            self._send_message(topic=f"{self._send_topic}/pos", payload=position)
+        tilt = self.current_tilt
+        if tilt is not None and tilt != self._published_tilt:
+            self._published_tilt = tilt
+            self._send_message(topic=f"{self._send_topic}/tilt", payload=tilt)
 
     async def close_cover(self) -> None:
         """Close cover."""
-        if self._position == 0:
-            return
         if self._position is None:
             self._closed = True
             return
-        _LOGGER.info("Closing cover %s.", self._id)
-
-        self._requested_closing = True
-        self._send_message(topic=f"{self._send_topic}/state", payload=CLOSING)
-        await self.run_cover(
-            current_operation=CLOSING,
-        )
+        await self.set_cover_position(position=0)
 
     async def open_cover(self) -> None:
         """Open cover."""
-        if self._position == 100:
-            return
         if self._position is None:
             self._closed = False
             return
-        _LOGGER.info("Opening cover %s.", self._id)
-
-        self._requested_closing = False
-        self._send_message(topic=f"{self._send_topic}/state", payload=OPENING)
+        await self.set_cover_position(position=100)
+
+    async def set_cover_position(self, position: int, tilt: int | None = None) -> None:
+        """Move cover to a specific position, with 1% resolution. With tilt,
+        slats are turned to it once position is reached."""
+        if tilt is not None and self._tilt_time:
+            if position == round(self._position_at(self._cover_engine.now())):
+                await self.set_tilt(tilt=tilt)
+                return
+            self._next_tilt = tilt
+        if position == self._target or (
+            not self.is_moving and self._position == position
+        ):
+            return
+        current_operation = (
+            CLOSING
+            if position < self._position_at(self._cover_engine.now())
+            else OPENING
+        )
+        if current_operation != self._current_operation:
+            _LOGGER.info(
+                "Moving cover %s to position %s. Operation %s",
+                self._id,
+                position,
+                current_operation,
+            )
+            self._send_message(
+                topic=f"{self._send_topic}/state", payload=current_operation
+            )
         await self.run_cover(
-            current_operation=OPENING,
+            current_operation=current_operation,
+            target=position,
         )
 
-    async def set_cover_position(self, position: int) -> None:
-        """Move cover to a specific position."""
-        set_position = round(position, -1)
-        if self._position == position or set_position == self._set_position:
+    async def set_tilt(self, tilt: int) -> None:
+        """Turn slats to tilt, cover stays at its current position."""
+        if not self._tilt_time:
             return
-        if self._set_position:
-            self._stop_cover(on_exit=True)
-        _LOGGER.info("Setting cover at position %s.", set_position)
-        self._set_position = set_position
-
-        self._requested_closing = set_position < self._position
-        current_operation = CLOSING if self._requested_closing else OPENING
-        _LOGGER.debug(
-            "Requested set position %s. Operation %s", set_position, current_operation
-        )
-        self._send_message(topic=f"{self._send_topic}/state", payload=current_operation)
+        now = self._cover_engine.now()
+        current = self._tilt_at(now)
+        if tilt == self._target_tilt or (not self.is_moving and current == tilt):
+            return
+        self._next_tilt = tilt
+        current_operation = OPENING if tilt > current else CLOSING
+        _LOGGER.info("Tilting cover %s to %s.", self._id, tilt)
         await self.run_cover(
             current_operation=current_operation,
+            target=None,
+            tilt=tilt,
         )
 
     def open(self) -> None:
@@ -0,0 +1,63 @@
+"""Movement engine shared by all covers."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, Optional
+
+from boneio.helper.timer import TimerEntry, TimerService
+
+if TYPE_CHECKING:
+    from boneio.cover import Cover
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_COVER_UPDATE_INTERVAL = 1.0
+
+
+class CoverEngine:
+    """Track all moving covers.
+
+    One periodic timer publishes positions of every moving cover, so there is
+    no listener per cover. Timer runs only while some cover moves. Cover
+    publishes its position only if it changed since last message, and always
+    when it stops. Stops are exact deadlines of covers in same timer service.
+    """
+
+    def __init__(
+        self,
+        timer_service: TimerService,
+        update_interval: float = DEFAULT_COVER_UPDATE_INTERVAL,
+    ) -> None:
+        """Initialize engine."""
+        self._timer_service = timer_service
+        self._update_interval = update_interval
+        self._moving: Dict[str, Cover] = {}
+        self._frame_entry: Optional[TimerEntry] = None
+
+    @property
+    def timer_service(self) -> TimerService:
+        """Timer service scheduling cover stops."""
+        return self._timer_service
+
+    def now(self) -> float:
+        """Current monotonic time."""
+        return self._timer_service.now()
+
+    def add(self, cover: Cover) -> None:
+        """Track cover which started moving."""
+        self._moving[cover.id] = cover
+        if self._frame_entry is None:
+            self._frame_entry = self._timer_service.call_every(
+                self._update_interval, self._frame
+            )
+
+    def remove(self, cover: Cover) -> None:
+        """Stop tracking cover which came to rest."""
+        self._moving.pop(cover.id, None)
+        if not self._moving and self._frame_entry is not None:
+            self._frame_entry.cancel()
+            self._frame_entry = None
+
+    def _frame(self) -> None:
+        for cover in list(self._moving.values()):
+            cover.publish_position()
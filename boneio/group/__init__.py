@@ -1,4 +1,5 @@
 """Group classes."""
+from .cover import CoverGroup
 from .output import OutputGroup
 
-__all__ = ["OutputGroup"]
+__all__ = ["CoverGroup", "OutputGroup"]
@@ -0,0 +1,125 @@
+"""Group cover module."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List
+
+from boneio.const import CLOSED, CLOSING, COVER, OPEN, OPENING
+from boneio.cover import Cover
+from boneio.helper.mqtt import BasicMqtt
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CoverGroup(BasicMqtt):
+    """Group of covers moved by one command.
+
+    Command is passed to all members in same loop iteration, so relays of
+    members on one expander are written with one register write. Group
+    publishes its state once all members are at rest, position is average
+    of members.
+    """
+
+    def __init__(self, id: str, members: List[Cover], **kwargs) -> None:
+        """Initialize group."""
+        super().__init__(id=id, name=id, topic_type=COVER, **kwargs)
+        self._members = members
+        for member in members:
+            member.add_state_listener(self.send_state)
+
+    @property
+    def is_moving(self) -> bool:
+        """Is any member moving."""
+        return any(x.is_moving for x in self._members)
+
+    @property
+    def cover_state(self) -> str:
+        """Open if any member is open."""
+        return OPEN if any(x.cover_state == OPEN for x in self._members) else CLOSED
+
+    @property
+    def has_tilt(self) -> bool:
+        """Has any member tilting slats."""
+        return any(x.has_tilt for x in self._members)
+
+    @property
+    def current_tilt(self) -> int | None:
+        """Average tilt of members with slats."""
+        tilts = [x.current_tilt for x in self._members if x.has_tilt]
+        return round(sum(tilts) / len(tilts)) if tilts else None
+
+    @property
+    def current_cover_position(self) -> int:
+        """Average position of members."""
+        return round(
+            sum(x.current_cover_position for x in self._members) / len(self._members)
+        )
+
+    def send_state(self) -> None:
+        """Send state of group to mqtt when all members are at rest."""
+        if self.is_moving:
+            return
+        self._send_message(topic=f"{self._send_topic}/state", payload=self.cover_state)
+        self._send_message(
+            topic=f"{self._send_topic}/pos", payload=str(self.current_cover_position)
+        )
+        tilt = self.current_tilt
+        if tilt is not None:
+            self._send_message(topic=f"{self._send_topic}/tilt", payload=str(tilt))
+
+    async def close_cover(self) -> None:
+        """Close all members."""
+        _LOGGER.info("Closing cover group %s.", self._id)
+        self._send_message(topic=f"{self._send_topic}/state", payload=CLOSING)
+        await asyncio.gather(*(x.close_cover() for x in self._members))
+
+    async def open_cover(self) -> None:
+        """Open all members."""
+        _LOGGER.info("Opening cover group %s.", self._id)
+        self._send_message(topic=f"{self._send_topic}/state", payload=OPENING)
+        await asyncio.gather(*(x.open_cover() for x in self._members))
+
+    async def set_cover_position(self, position: int) -> None:
+        """Move all members to position."""
+        _LOGGER.info("Setting cover group %s at position %s.", self._id, position)
+        await asyncio.gather(
+            *(x.set_cover_position(position=position) for x in self._members)
+        )
+
+    async def set_tilt(self, tilt: int) -> None:
+        """Turn slats of all members with tilt."""
+        _LOGGER.info("Tilting cover group %s to %s.", self._id, tilt)
+        await asyncio.gather(
+            *(x.set_tilt(tilt=tilt) for x in self._members if x.has_tilt)
+        )
+
+    def stop(self) -> None:
+        """Stop all members."""
+        _LOGGER.info("Stopping cover group %s.", self._id)
+        for x in self._members:
+            x.stop()
+
+    def open(self) -> None:
+        asyncio.create_task(self.open_cover())
+
+    def close(self) -> None:
+        asyncio.create_task(self.close_cover())
+
+    def toggle(self) -> None:
+        if self.cover_state == CLOSED:
+            self.close()
+        else:
+            self.open()
+
+    def toggle_open(self) -> None:
+        if self.is_moving:
+            self.stop()
+        else:
+            self.open()
+
+    def toggle_close(self) -> None:
+        if self.is_moving:
+            self.stop()
+        else:
+            self.close()
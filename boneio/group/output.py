@@ -1,13 +1,18 @@
 """Group output module."""
 from __future__ import annotations
 import asyncio
-from typing import List
+from typing import Dict, List
 from boneio.const import COVER, SWITCH, ON, OFF
 from boneio.relay.basic import BasicRelay
 
 
 class OutputGroup(BasicRelay):
-    """Cover class of boneIO"""
+    """Group of outputs, members can be other groups.
+
+    Group keeps last known state of every member and count of active ones,
+    so member event updates group in O(1). Group only sends state and event
+    when it changes, so nested groups are updated incrementally too.
+    """
 
     def __init__(
         self,
@@ -16,38 +21,42 @@ class OutputGroup(BasicRelay):
         restored_state: bool = True,
         **kwargs,
     ) -> None:
-        """Initialize cover class."""
+        """Initialize group."""
         self._loop = asyncio.get_event_loop()
         super().__init__(
             **kwargs, output_type=output_type, restored_state=restored_state, topic_type="group"
         )
-        self._group_members = [x for x in members if x.output_type != COVER]
+        self._group_members = {x.id: x for x in members if x.output_type != COVER}
         self._timer_handle = None
-        for member in self._group_members:
+        self._member_states: Dict[str, bool] = {}
+        for member in self._group_members.values():
+            self._member_states[member.id] = member.state == ON
             self._event_bus.add_output_listener(member.id, self.event_listener)
+        self._active_count = sum(self._member_states.values())
+        self._state = ON if self._active_count else OFF
 
     async def event_listener(self, relay_id=None) -> None:
         """Listen for events called by children relays."""
-        state = OFF
-        for x in self._group_members:
-            if x.state == ON:
-                state = ON
-                break
+        if relay_id in self._member_states:
+            active = self._group_members[relay_id].state == ON
+            if active != self._member_states[relay_id]:
+                self._member_states[relay_id] = active
+                self._active_count += 1 if active else -1
+        state = ON if self._active_count else OFF
         if state != self._state or not relay_id:
             self._state = state
             self._loop.call_soon_threadsafe(self.send_state)
 
-    async def async_turn_on(self) -> None:
-        """Call turn on action."""
-        await asyncio.gather(
-            *[self._loop.run_in_executor(self.executor, x.turn_on) for x in self._group_members]
-        )
+    def turn_on(self) -> None:
+        """Turn on all members. They only update shadows of their expanders
+        here, so every expander is written once for whole group."""
+        for x in self._group_members.values():
+            x.turn_on()
 
-    async def async_turn_off(self) -> None:
-        """Call turn off action."""
-        await asyncio.gather(
-            *[self._loop.run_in_executor(self.executor, x.turn_off) for x in self._group_members]
-        )
+    def turn_off(self) -> None:
+        """Turn off all members."""
+        for x in self._group_members.values():
+            x.turn_off()
 
     @property
     def is_active(self) -> bool:
@@ -55,5 +64,6 @@ class OutputGroup(BasicRelay):
         return self._state == ON
 
     def send_state(self) -> None:
-        """Send state to Mqtt on action."""
+        """Send state to Mqtt on action and notify parent groups."""
         self._send_message(topic=self._send_topic, payload=self.payload(), retain=True)
+        self._event_bus.trigger_output_event(self.id)
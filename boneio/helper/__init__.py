@@ -15,12 +15,16 @@ from boneio.helper.ha_discovery import (
     ha_adc_sensor_availabilty_message,
     ha_binary_sensor_availabilty_message,
     ha_button_availabilty_message,
+    ha_edge_guard_availabilty_message,
+    ha_i2c_bus_availabilty_message,
+    ha_i2c_device_availabilty_message,
     ha_event_availabilty_message,
     ha_light_availabilty_message,
     ha_sensor_availabilty_message,
     ha_sensor_temp_availabilty_message,
     ha_switch_availabilty_message,
     ha_led_availabilty_message,
+    ha_pulse_counter_availabilty_message,
     ha_sensor_ina_availabilty_message
 )
 from boneio.helper.mqtt import BasicMqtt
@@ -57,7 +61,11 @@ __all__ = [
     "ha_button_availabilty_message",
     "ha_sensor_ina_availabilty_message",
     "ha_event_availabilty_message",
+    "ha_edge_guard_availabilty_message",
+    "ha_i2c_bus_availabilty_message",
+    "ha_i2c_device_availabilty_message",
     "ha_led_availabilty_message",
+    "ha_pulse_counter_availabilty_message",
     "GPIOInputException",
     "GPIOOutputException",
     "I2CError",
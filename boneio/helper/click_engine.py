@@ -0,0 +1,384 @@
+"""Click classification engine fed with timestamped edges."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from boneio.const import DOUBLE, HOLD, LONG, SINGLE, TRIPLE
+from boneio.helper.timeperiod import TimePeriod
+from boneio.helper.timer import TimerEntry, TimerService
+
+_LOGGER = logging.getLogger(__name__)
+
+CLICK_NAMES = {1: SINGLE, 2: DOUBLE, 3: TRIPLE}
+
+# Default timings of buttons.
+DOUBLE_CLICK_DURATION_MS = 180
+LONG_PRESS_DURATION_MS = 600
+# Polled inputs see edges up to one scan late, so they wait longer for next click.
+POLLED_DOUBLE_CLICK_DURATION_MS = 350
+
+
+def click_name(clicks: int) -> str:
+    """Name of event for number of clicks."""
+    return CLICK_NAMES.get(clicks, f"click_{clicks}")
+
+
+class ClickTimings:
+    """Timings of single input. All values in seconds."""
+
+    __slots__ = ("multi_click", "long_press", "hold_repeat", "max_clicks", "bounce")
+
+    def __init__(
+        self,
+        multi_click: float = DOUBLE_CLICK_DURATION_MS / 1000,
+        long_press: float = LONG_PRESS_DURATION_MS / 1000,
+        hold_repeat: Optional[float] = None,
+        max_clicks: int = 2,
+        bounce: float = 0.0,
+    ) -> None:
+        self.multi_click = multi_click
+        self.long_press = long_press
+        self.hold_repeat = hold_repeat
+        self.max_clicks = max(max_clicks, 1)
+        self.bounce = bounce
+
+    @classmethod
+    def from_config(
+        cls,
+        double_click_duration: TimePeriod | None = None,
+        long_press_duration: TimePeriod | None = None,
+        hold_repeat: TimePeriod | None = None,
+        max_clicks: int = 2,
+        bounce_time: TimePeriod | None = None,
+        default_multi_click: float = DOUBLE_CLICK_DURATION_MS / 1000,
+        default_long_press: float = LONG_PRESS_DURATION_MS / 1000,
+    ) -> ClickTimings:
+        """Create timings from input config."""
+        return cls(
+            multi_click=double_click_duration.total_in_seconds
+            if double_click_duration
+            else default_multi_click,
+            long_press=long_press_duration.total_in_seconds
+            if long_press_duration
+            else default_long_press,
+            hold_repeat=hold_repeat.total_in_seconds if hold_repeat else None,
+            max_clicks=max_clicks,
+            bounce=bounce_time.total_in_seconds if bounce_time else 0.0,
+        )
+
+    @property
+    def event_types(self) -> List[str]:
+        """All events this input can emit."""
+        types = [click_name(x) for x in range(1, self.max_clicks + 1)] + [LONG]
+        if self.hold_repeat:
+            types.append(HOLD)
+        return types
+
+
+class InputState:
+    """Click state of single input."""
+
+    __slots__ = (
+        "pin",
+        "timings",
+        "callback",
+        "pressed",
+        "clicks",
+        "press_ts",
+        "window_deadline",
+        "long_deadline",
+        "repeat_deadline",
+        "long_fired",
+        "release_callbacks",
+    )
+
+    def __init__(
+        self,
+        pin: str,
+        timings: ClickTimings,
+        callback: Callable[[str, Optional[float]], None],
+    ) -> None:
+        self.pin = pin
+        self.timings = timings
+        self.callback = callback
+        self.pressed = False
+        self.clicks = 0
+        self.press_ts = float("-inf")
+        self.window_deadline: Optional[float] = None
+        self.long_deadline: Optional[float] = None
+        self.repeat_deadline: Optional[float] = None
+        self.long_fired = False
+        self.release_callbacks: List[Callable[[], None]] = []
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """Nearest deadline of this input."""
+        deadlines = [
+            x
+            for x in (self.window_deadline, self.long_deadline, self.repeat_deadline)
+            if x is not None
+        ]
+        return min(deadlines) if deadlines else None
+
+
+class ClickEngine:
+    """State machine classifying edges into single/N-click, long and hold events.
+
+    Engine is fed with (pin, pressed, timestamp) edges. Timestamps are
+    monotonic seconds. Deadlines (multi click window, long press, hold repeat)
+    are kept in one heap for all inputs and processed either when a later
+    edge arrives or by TimerService. Without timer service engine is driven
+    only by edges and advance(), so recorded traces can be replayed.
+    """
+
+    def __init__(self, timer_service: Optional[TimerService] = None) -> None:
+        """Initialize engine."""
+        self._timer_service = timer_service
+        self._inputs: Dict[str, InputState] = {}
+        self._heap: List[Tuple[float, int, InputState]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[TimerEntry] = None
+        self._timer_when: Optional[float] = None
+        self._time = 0.0
+
+    @property
+    def time(self) -> float:
+        """Time of currently processed edge or deadline."""
+        return self._time
+
+    def now(self) -> float:
+        """Current monotonic time of timer service."""
+        return self._timer_service.now()
+
+    def add_input(
+        self,
+        pin: str,
+        timings: ClickTimings,
+        callback: Callable[[str, Optional[float]], None],
+    ) -> None:
+        """Register input. Callback receives click type and duration."""
+        self._inputs[pin] = InputState(pin=pin, timings=timings, callback=callback)
+
+    def set_timings(self, pin: str, timings: ClickTimings) -> None:
+        """Change timings of registered input. Deadlines already running are
+        kept, new timings apply from next edge."""
+        self._inputs[pin].timings = timings
+
+    def on_release(self, pin: str, callback: Callable[[], None]) -> bool:
+        """Call callback once on next release of pressed input.
+        Return False if input is not pressed, callback is not registered then."""
+        state = self._inputs.get(pin)
+        if not state or not state.pressed:
+            return False
+        state.release_callbacks.append(callback)
+        return True
+
+    def feed(self, pin: str, pressed: bool, timestamp: float) -> None:
+        """Feed edge of input."""
+        self.advance(timestamp)
+        state = self._inputs[pin]
+        self._time = timestamp
+        if pressed:
+            self._press(state, timestamp)
+        else:
+            self._release(state, timestamp)
+        self._push(state)
+        self._arm_timer()
+
+    def advance(self, now: float) -> None:
+        """Process all deadlines up to now."""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, _, state = heapq.heappop(heap)
+            if state.next_deadline != when:
+                # Stale entry, deadlines of input changed since.
+                continue
+            self._expire(state, when)
+            self._push(state)
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """Nearest deadline of all inputs."""
+        heap = self._heap
+        while heap and heap[0][2].next_deadline != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _push(self, state: InputState) -> None:
+        deadline = state.next_deadline
+        if deadline is not None:
+            heapq.heappush(self._heap, (deadline, next(self._counter), state))
+
+    def _arm_timer(self) -> None:
+        if self._timer_service is None:
+            return
+        deadline = self.next_deadline
+        if deadline is None or deadline == self._timer_when:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_when = deadline
+        self._timer = self._timer_service.call_at(deadline, self._on_timer, deadline)
+
+    def _on_timer(self, when: float) -> None:
+        self._timer = None
+        self._timer_when = None
+        self.advance(when)
+        self._arm_timer()
+
+    def _emit(
+        self, state: InputState, click_type: str, duration: Optional[float] = None
+    ) -> None:
+        try:
+            state.callback(click_type, duration)
+        except Exception as err:
+            _LOGGER.error("Error in click callback of %s. %s", state.pin, err)
+
+    def _press(self, state: InputState, ts: float) -> None:
+        timings = state.timings
+        if state.pressed or ts - state.press_ts < timings.bounce:
+            return
+        state.pressed = True
+        state.press_ts = ts
+        state.long_fired = False
+        state.long_deadline = ts + timings.long_press
+        state.clicks += 1
+        if state.clicks >= timings.max_clicks and timings.max_clicks > 1:
+            state.window_deadline = None
+            clicks = state.clicks
+            state.clicks = 0
+            self._emit(state, click_name(clicks))
+        elif timings.max_clicks > 1:
+            state.window_deadline = ts + timings.multi_click
+
+    def _release(self, state: InputState, ts: float) -> None:
+        if not state.pressed:
+            return
+        state.pressed = False
+        state.long_deadline = None
+        state.repeat_deadline = None
+        if state.release_callbacks:
+            callbacks = state.release_callbacks
+            state.release_callbacks = []
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as err:
+                    _LOGGER.error("Error in release callback of %s. %s", state.pin, err)
+        if state.long_fired:
+            state.clicks = 0
+            state.window_deadline = None
+        elif state.clicks and state.window_deadline is None:
+            # Window closed while button was held, click is complete now.
+            clicks = state.clicks
+            state.clicks = 0
+            self._emit(state, click_name(clicks))
+
+    def _expire(self, state: InputState, now: float) -> None:
+        while True:
+            deadline = state.next_deadline
+            if deadline is None or deadline > now:
+                return
+            self._time = deadline
+            if deadline == state.long_deadline:
+                state.long_deadline = None
+                state.long_fired = True
+                state.clicks = 0
+                state.window_deadline = None
+                if state.timings.hold_repeat:
+                    state.repeat_deadline = deadline + state.timings.hold_repeat
+                self._emit(state, LONG, round(deadline - state.press_ts, 2))
+            elif deadline == state.repeat_deadline:
+                state.repeat_deadline = deadline + state.timings.hold_repeat
+                self._emit(state, HOLD, round(deadline - state.press_ts, 2))
+            else:
+                state.window_deadline = None
+                if not state.pressed and state.clicks:
+                    clicks = state.clicks
+                    state.clicks = 0
+                    self._emit(state, click_name(clicks))
+
+
+class ClickInput:
+    """Click timings and engine registration shared by event inputs.
+
+    Input sets self._pin and self._click_engine, then calls
+    _add_click_input() with its config. Default timings are class attributes,
+    so input type can override them.
+    """
+
+    double_click_duration_ms = DOUBLE_CLICK_DURATION_MS
+    long_press_duration_ms = LONG_PRESS_DURATION_MS
+    # Engine rejects bounces only if edges don't come debounced already.
+    click_debounce = False
+
+    def _add_click_input(self, config: dict) -> None:
+        self._timings = self._click_timings(config)
+        self._click_engine.add_input(
+            pin=self._pin, timings=self._timings, callback=self.press_callback
+        )
+
+    def _click_timings(self, config: dict) -> ClickTimings:
+        return ClickTimings.from_config(
+            double_click_duration=config.get("double_click_duration"),
+            long_press_duration=config.get("long_press_duration"),
+            hold_repeat=config.get("hold_repeat"),
+            max_clicks=config.get("max_clicks", 2),
+            bounce_time=config.get("bounce_time") if self.click_debounce else None,
+            default_multi_click=self.double_click_duration_ms / 1000,
+            default_long_press=self.long_press_duration_ms / 1000,
+        )
+
+    def set_timings(self, **kwargs) -> None:
+        """Change click timings, eg. after inputs reload."""
+        self._timings = self._click_timings(kwargs)
+        self._click_engine.set_timings(self._pin, self._timings)
+
+    @property
+    def event_types(self) -> List[str]:
+        """Events this input can send."""
+        return self._timings.event_types
+
+
+def replay(
+    edges: Iterable[Tuple[str, bool, float]],
+    timings: ClickTimings | Dict[str, ClickTimings],
+    until: Optional[float] = None,
+) -> List[Tuple[float, str, str, Optional[float]]]:
+    """Replay recorded (pin, pressed, timestamp) edges.
+
+    Deadlines are processed up to until, by default long enough after last
+    edge to close pending clicks. Return list of
+    (timestamp, pin, click_type, duration) events.
+    """
+    engine = ClickEngine()
+    events = []
+    last_ts = 0.0
+
+    def collector(pin: str) -> Callable[[str, Optional[float]], None]:
+        return lambda click_type, duration: events.append(
+            (engine.time, pin, click_type, duration)
+        )
+
+    for pin, pressed, timestamp in edges:
+        if pin not in engine._inputs:
+            engine.add_input(
+                pin=pin,
+                timings=timings[pin] if isinstance(timings, dict) else timings,
+                callback=collector(pin),
+            )
+        engine.feed(pin, pressed, timestamp)
+        last_ts = timestamp
+    if until is None:
+        until = last_ts + max(
+            (
+                max(state.timings.multi_click, state.timings.long_press)
+                for state in engine._inputs.values()
+            ),
+            default=0.0,
+        )
+    engine.advance(until)
+    return events
@@ -0,0 +1,194 @@
+"""Edge-rate accounting protecting loop from chattering inputs."""
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, Optional
+
+from boneio.helper.timer import TimerService
+
+_LOGGER = logging.getLogger(__name__)
+
+GUARD_OK = "ok"
+GUARD_THROTTLED = "throttled"
+GUARD_QUARANTINED = "quarantined"
+
+# Edges per second above which input is debounced harder.
+DEFAULT_EDGE_RATE_LIMIT = 50
+# Quarantine input if rate reaches limit times this factor.
+QUARANTINE_FACTOR = 10
+# Minimum time between edges accepted from throttled input.
+THROTTLE_DEBOUNCE = 0.2
+# Rate must stay under limit that long before input steps back.
+RECOVERY_TIME = 10.0
+# Length of rate accounting window.
+RATE_WINDOW = 1.0
+
+
+class EdgeGuard:
+    """Count edges of one input and decide which of them are processed.
+
+    Edges are counted in RATE_WINDOW long windows. Crossing edge rate limit
+    throttles input (edges closer than THROTTLE_DEBOUNCE are dropped), crossing
+    QUARANTINE_FACTOR times limit suspends input. Guard steps back one level
+    after RECOVERY_TIME without exceeding the limit. edge() is cheap enough to
+    be called on every edge, also outside of loop thread.
+    """
+
+    __slots__ = (
+        "pin",
+        "limit",
+        "state",
+        "rate",
+        "total_dropped",
+        "_on_change",
+        "_window_start",
+        "_window_count",
+        "_last_accepted",
+        "_calm_since",
+    )
+
+    def __init__(
+        self,
+        pin: str,
+        limit: int = DEFAULT_EDGE_RATE_LIMIT,
+        on_change: Optional[Callable[[EdgeGuard, str], None]] = None,
+    ) -> None:
+        self.pin = pin
+        self.limit = limit
+        self.state = GUARD_OK
+        self.rate = 0.0
+        self.total_dropped = 0
+        self._on_change = on_change
+        self._window_start = 0.0
+        self._window_count = 0
+        self._last_accepted = 0.0
+        self._calm_since = 0.0
+
+    def edge(self, timestamp: float) -> bool:
+        """Account edge. Return True if edge should be processed."""
+        if timestamp - self._window_start >= RATE_WINDOW:
+            self._close_window(timestamp)
+        self._window_count += 1
+        if self._window_count > self.limit:
+            # Don't wait for end of window, storm can be thousands of edges.
+            self._calm_since = timestamp
+            self.rate = self._window_count / max(
+                timestamp - self._window_start, THROTTLE_DEBOUNCE
+            )
+            if (
+                self.state != GUARD_QUARANTINED
+                and self._window_count >= self.limit * QUARANTINE_FACTOR
+            ):
+                self._set_state(GUARD_QUARANTINED)
+            elif self.state == GUARD_OK:
+                self._set_state(GUARD_THROTTLED)
+        if self.state == GUARD_OK:
+            return True
+        if (
+            self.state == GUARD_THROTTLED
+            and timestamp - self._last_accepted >= THROTTLE_DEBOUNCE
+        ):
+            self._last_accepted = timestamp
+            return True
+        self.total_dropped += 1
+        return False
+
+    def check(self, now: float) -> None:
+        """Close stale window and step back if input was calm long enough."""
+        if now - self._window_start >= RATE_WINDOW:
+            self._close_window(now)
+        if self.state == GUARD_OK or now - self._calm_since < RECOVERY_TIME:
+            return
+        self._calm_since = now
+        self._set_state(
+            GUARD_THROTTLED if self.state == GUARD_QUARANTINED else GUARD_OK
+        )
+
+    def _close_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        # Window without edges for a long time means rate is 0.
+        self.rate = self._window_count / elapsed if elapsed < 2 * RATE_WINDOW else 0.0
+        if self._window_count > self.limit * elapsed:
+            self._calm_since = now
+        self._window_start = now
+        self._window_count = 0
+
+    def _set_state(self, state: str) -> None:
+        old_state = self.state
+        self.state = state
+        if self._on_change:
+            self._on_change(self, old_state)
+
+
+class EdgeGuardMonitor:
+    """Keep guards of all inputs and run their recovery checks.
+
+    Transitions are reported to listener in loop thread, even if edge causing
+    them came from foreign thread.
+    """
+
+    def __init__(
+        self,
+        timer_service: TimerService,
+        listener: Optional[Callable[[EdgeGuard], None]] = None,
+        check_interval: float = RATE_WINDOW,
+    ) -> None:
+        """Initialize monitor."""
+        self._timer_service = timer_service
+        self._listener = listener
+        self._guards: Dict[str, EdgeGuard] = {}
+        self._callbacks: Dict[str, Callable[[EdgeGuard, str], None]] = {}
+        self._check_interval = check_interval
+        self._check_entry = None
+
+    def add_input(
+        self,
+        pin: str,
+        limit: int = DEFAULT_EDGE_RATE_LIMIT,
+        on_change: Optional[Callable[[EdgeGuard, str], None]] = None,
+    ) -> EdgeGuard:
+        """Create guard of pin. on_change is called in loop with (guard, old_state)."""
+        guard = EdgeGuard(pin=pin, limit=limit, on_change=self._state_changed)
+        self._guards[pin] = guard
+        if on_change:
+            self._callbacks[pin] = on_change
+        if self._check_entry is None:
+            self._check_entry = self._timer_service.call_every(
+                self._check_interval, self.check
+            )
+        return guard
+
+    @property
+    def guards(self) -> Dict[str, EdgeGuard]:
+        """Guards by pin."""
+        return self._guards
+
+    def check(self) -> None:
+        """Run recovery check of every guard."""
+        now = self._timer_service.now()
+        for guard in list(self._guards.values()):
+            guard.check(now)
+
+    def _state_changed(self, guard: EdgeGuard, old_state: str) -> None:
+        loop = self._timer_service.loop
+        if loop is None:
+            self._dispatch(guard, old_state)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, guard, old_state)
+
+    def _dispatch(self, guard: EdgeGuard, old_state: str) -> None:
+        if guard.state == GUARD_OK:
+            _LOGGER.info("Input %s recovered from %s.", guard.pin, old_state)
+        else:
+            _LOGGER.warning(
+                "Input %s is %s. Edge rate %.0f/s, limit %s/s.",
+                guard.pin,
+                guard.state,
+                guard.rate,
+                guard.limit,
+            )
+        callback = self._callbacks.get(guard.pin)
+        if callback:
+            callback(guard, old_state)
+        if self._listener:
+            self._listener(guard)
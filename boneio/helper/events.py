@@ -122,16 +122,18 @@ class EventBus:
         self._sigterm_listeners.append(target)
 
     def add_output_listener(self, name, target):
-        """Add output listener."""
-        self._output_listeners[name] = ListenerJob(target=target)
-        return self._output_listeners[name]
+        """Add output listener. Output can have many of them, eg. when it is
+        member of several groups."""
+        listener = ListenerJob(target=target)
+        self._output_listeners.setdefault(name, []).append(listener)
+        return listener
     
     def trigger_output_event(self, event):
-        asyncio.create_task(self.async_trigger_output_event(event=event))
+        if event in self._output_listeners:
+            asyncio.create_task(self.async_trigger_output_event(event=event))
     
     async def async_trigger_output_event(self, event):
-        listener = self._output_listeners.get(event)
-        if listener:
+        for listener in self._output_listeners.get(event, []):
             await listener.target(event)
 
     def add_haonline_listener(self, target):
@@ -0,0 +1,82 @@
+"""Shared thread pools of boneIO."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from boneio.helper.i2c_worker import I2CBusWorker
+
+_LOGGER = logging.getLogger(__name__)
+
+I2C_POOL = "i2c"
+DISK_POOL = "disk"
+MQTT_POOL = "mqtt"
+
+POOL_SIZES = {DISK_POOL: 1, MQTT_POOL: 2}
+# I2C2 on P9_19/P9_20, board.SCL and board.SDA.
+DEFAULT_I2C_BUS = 2
+
+
+class ExecutorService:
+    """Named, bounded thread pools shared by whole runtime.
+    Every I2C bus is owned by its worker, which keeps bus access serialized.
+    Workers of different buses run in parallel."""
+
+    def __init__(self, pool_sizes: Dict[str, int] = POOL_SIZES) -> None:
+        """Create pools."""
+        self._pools: Dict[str, Executor] = {
+            name: ThreadPoolExecutor(
+                max_workers=size, thread_name_prefix=f"boneio_{name}"
+            )
+            for name, size in pool_sizes.items()
+        }
+        self._i2c_workers: Dict[int, I2CBusWorker] = {}
+        self._pools[I2C_POOL] = self.i2c_worker(DEFAULT_I2C_BUS)
+
+    def get(self, name: str) -> Executor:
+        """Get pool by name."""
+        return self._pools[name]
+
+    @property
+    def i2c(self) -> I2CBusWorker:
+        """Worker of default I2C bus."""
+        return self._pools[I2C_POOL]
+
+    def i2c_worker(self, bus: int) -> I2CBusWorker:
+        """Worker of I2C bus, created on first use."""
+        if bus not in self._i2c_workers:
+            self._i2c_workers[bus] = I2CBusWorker(name=f"{I2C_POOL}{bus}")
+        return self._i2c_workers[bus]
+
+    @property
+    def i2c_workers(self) -> Dict[int, I2CBusWorker]:
+        """Workers of all used I2C buses by bus number."""
+        return self._i2c_workers
+
+    @property
+    def disk(self) -> ThreadPoolExecutor:
+        """Pool for disk writes."""
+        return self._pools[DISK_POOL]
+
+    @property
+    def mqtt(self) -> ThreadPoolExecutor:
+        """Pool for MQTT side work."""
+        return self._pools[MQTT_POOL]
+
+    def run(self, name: str, func: Callable, *args: Any) -> asyncio.Future:
+        """Run function in named pool from event loop."""
+        return asyncio.get_running_loop().run_in_executor(
+            self._pools[name], func, *args
+        )
+
+    def shutdown(self) -> None:
+        """Shutdown all pools without waiting for pending jobs."""
+        _LOGGER.debug("Shutting down executor pools.")
+        for name, pool in self._pools.items():
+            # I2C pool is worker of default bus, it is shut down with workers.
+            if name != I2C_POOL:
+                pool.shutdown(wait=False)
+        for worker in self._i2c_workers.values():
+            worker.shutdown(wait=False)
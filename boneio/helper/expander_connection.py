@@ -0,0 +1,155 @@
+"""Expander driver with health tracking and reconnects."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional
+
+from boneio.helper.exceptions import I2CError
+from boneio.helper.i2c_stats import I2CStats, instrument_driver
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors in row after which expander is taken as failed.
+EXPANDER_MAX_ERRORS = 3
+EXPANDER_RETRY_MIN = 1.0
+EXPANDER_RETRY_MAX = 300.0
+
+
+class ExpanderConnection:
+    """Connection to one expander.
+
+    Driver is created by factory, at boot and again on every reconnect.
+    Attributes of driver are reached through connection, so expander readers
+    and writers use connection as driver. Shadows report result of every
+    transaction. After EXPANDER_MAX_ERRORS failures in row expander is
+    failed: its attributes raise I2CError at once, so commands don't spend
+    bus time, and reconnect is retried with exponential backoff. Before
+    every attempt stuck bus is recovered. Once reconnected, listeners write
+    their shadowed state back. With stats, every driver is instrumented to
+    record its transactions.
+    """
+
+    def __init__(
+        self,
+        expander_id: str,
+        factory: Callable[[], Any],
+        executor: Executor,
+        recover_bus: Optional[Callable[[], bool]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        stats: Optional[I2CStats] = None,
+    ) -> None:
+        """Initialize connection, nothing is connected until connect()."""
+        self._expander_id = expander_id
+        self._factory = factory
+        self._executor = executor
+        self._recover_bus = recover_bus
+        self._loop = loop or asyncio.get_event_loop()
+        self._stats = stats
+        self._driver = None
+        self._errors = 0
+        self._failed = True
+        self._reconnect_task = None
+        self._reconnect_listeners: List[Callable[[], None]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if self._failed:
+            raise I2CError(f"Expander {self._expander_id} is failed.")
+        return getattr(self._driver, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if self._failed:
+            raise I2CError(f"Expander {self._expander_id} is failed.")
+        setattr(self._driver, name, value)
+
+    @property
+    def id(self) -> str:
+        """Id of expander."""
+        return self._expander_id
+
+    @property
+    def online(self) -> bool:
+        """Is expander working."""
+        return not self._failed
+
+    def add_reconnect_listener(self, listener: Callable[[], None]) -> None:
+        """Call listener in loop every time expander is reconnected."""
+        self._reconnect_listeners.append(listener)
+
+    def connect(self) -> bool:
+        """Create driver, which also checks expander responds."""
+        try:
+            self._driver = self._factory()
+        except (OSError, ValueError, I2CError) as err:
+            _LOGGER.error("Can't connect to expander %s. %s", self._expander_id, err)
+            return False
+        if self._stats:
+            instrument_driver(self._driver, self._stats)
+        self._errors = 0
+        self._failed = False
+        return True
+
+    def report_ok(self) -> None:
+        """Transaction succeeded. Can be called from any thread."""
+        self._errors = 0
+
+    def report_error(self, err: Exception) -> None:
+        """Transaction failed. Can be called from any thread."""
+        if self._failed:
+            return
+        self._errors += 1
+        if self._errors < EXPANDER_MAX_ERRORS:
+            return
+        _LOGGER.error(
+            "Expander %s failed %s times in row, reconnecting. %s",
+            self._expander_id,
+            self._errors,
+            err,
+        )
+        self._failed = True
+        self._loop.call_soon_threadsafe(self.start_reconnect)
+
+    def start_reconnect(self) -> None:
+        """Reconnect in background until it succeeds. Runs in loop."""
+        if self._reconnect_task is None:
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    @property
+    def stats(self) -> Optional[I2CStats]:
+        """Transaction stats, None if disabled."""
+        return self._stats
+
+    def _try_reconnect(self) -> bool:
+        if self._stats:
+            self._stats.reconnects += 1
+        if self._recover_bus:
+            try:
+                self._recover_bus()
+            except Exception as err:
+                _LOGGER.warning("Can't recover I2C bus. %s", err)
+        return self.connect()
+
+    async def _reconnect(self) -> None:
+        delay = EXPANDER_RETRY_MIN
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                if await self._loop.run_in_executor(
+                    self._executor, self._try_reconnect
+                ):
+                    break
+                delay = min(delay * 2, EXPANDER_RETRY_MAX)
+                _LOGGER.debug(
+                    "Next reconnect of expander %s in %ss.", self._expander_id, delay
+                )
+        finally:
+            self._reconnect_task = None
+        _LOGGER.info("Expander %s reconnected.", self._expander_id)
+        for listener in self._reconnect_listeners:
+            listener()
@@ -0,0 +1,315 @@
+"""Inputs on MCP23017 and PCF8575 expanders, read 16 pins at once."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
+from boneio.helper.expander_connection import ExpanderConnection
+from boneio.helper.gpio_cdev import CdevEventSource, LineEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+# MCP23017 registers, IOCON.BANK = 0.
+MCP23017_INTFA = 0x0E
+MCP23017_IOCON_MIRROR = 0x40
+# INTF, INTCAP and GPIO of both ports are 6 consecutive registers.
+MCP23017_INT_READ_SIZE = 6
+
+# Poll period of expander without interrupt line.
+EXPANDER_POLL_PERIOD = 0.02
+# Even with interrupt line read from time to time, in case INT edge was lost.
+EXPANDER_SAFETY_PERIOD = 5.0
+
+
+class MCP23017InputReader:
+    """Read MCP23017 pins with one I2C transaction."""
+
+    def __init__(self, mcp) -> None:
+        """Initialize reader of MCP23017 driver, adafruit or native."""
+        self._mcp = mcp
+        self._buf = bytearray(MCP23017_INT_READ_SIZE)
+
+    def setup(self, mask: int) -> None:
+        """Switch pins of mask to inputs with pull-up and interrupt on change.
+        INTA and INTB are mirrored, so one host GPIO serves whole chip."""
+        self._mcp.iodir |= mask
+        self._mcp.gppu |= mask
+        self._mcp.interrupt_configuration &= ~mask
+        self._mcp.interrupt_enable |= mask
+        self._mcp.io_control |= MCP23017_IOCON_MIRROR
+
+    def read(self) -> Tuple[int, int, int]:
+        """Return (captured mask, levels at interrupt, current levels).
+
+        INTF, INTCAP and GPIO are read in one sequential read, which also
+        clears pending interrupt. Captured mask tells which port captured
+        levels are valid.
+        """
+        with self._mcp._device as i2c:
+            i2c.write_then_readinto(bytes([MCP23017_INTFA]), self._buf)
+        buf = self._buf
+        captured = (0x00FF if buf[0] else 0) | (0xFF00 if buf[1] else 0)
+        return captured, buf[2] | buf[3] << 8, buf[4] | buf[5] << 8
+
+
+class PCF8575InputReader:
+    """Read PCF8575 pins. Reading port also releases its INT line."""
+
+    def __init__(self, pcf) -> None:
+        """Initialize reader of PCF8575 driver, adafruit or native."""
+        self._pcf = pcf
+
+    def setup(self, mask: int) -> None:
+        """Quasi-bidirectional pins become inputs when written high."""
+        for pin in range(16):
+            if mask & (1 << pin):
+                self._pcf.write_pin(pin, True)
+
+    def read(self) -> Tuple[int, int, int]:
+        """Return (captured mask, levels at interrupt, current levels)."""
+        levels = self._pcf.read_gpio()
+        return 0, levels, levels
+
+
+class ExpanderPin:
+    """Input pin registered on expander."""
+
+    __slots__ = ("pin", "callback", "on_ready", "bounce_time", "last_change")
+
+    def __init__(
+        self,
+        pin: int,
+        callback: Callable[[bool], None],
+        on_ready: Callable[[bool], None],
+        bounce_time: float,
+    ) -> None:
+        self.pin = pin
+        self.callback = callback
+        self.on_ready = on_ready
+        self.bounce_time = bounce_time
+        self.last_change = 0.0
+
+
+class ExpanderInputs:
+    """Dispatch input changes of one expander.
+
+    Falling edge on host GPIO wired to expander INT schedules one read of all
+    16 pins in I2C pool. Bits which changed against last reported state are
+    dispatched in loop. Pins are active low (button to ground, pull-up).
+    MCP23017 also gives levels captured at interrupt time, so pulse shorter
+    than I2C read is still reported as two changes. Without interrupt pin
+    expander is polled. While expander is failed it isn't read, pins are
+    set up again by restore() once it reconnects.
+    """
+
+    def __init__(
+        self,
+        expander_id: str,
+        reader: MCP23017InputReader | PCF8575InputReader,
+        executor: Executor,
+        cdev_source: CdevEventSource,
+        interrupt_pin: Optional[str] = None,
+        poll_period: float = EXPANDER_POLL_PERIOD,
+        safety_period: float = EXPANDER_SAFETY_PERIOD,
+        connection: Optional[ExpanderConnection] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Initialize expander inputs."""
+        self._id = expander_id
+        self._reader = reader
+        self._executor = executor
+        self._cdev_source = cdev_source
+        self._interrupt_pin = interrupt_pin
+        self._poll_period = poll_period
+        self._safety_period = safety_period
+        self._connection = connection
+        self._loop = loop or asyncio.get_event_loop()
+        self._pins: Dict[int, ExpanderPin] = {}
+        self._mask = 0
+        # Pins registered, but not set up yet.
+        self._setup_mask = 0
+        # Mask of active (low) pins as reported to callbacks.
+        self._reported = 0
+        self._reading = False
+        self._read_again = False
+        self._task = None
+
+    @property
+    def id(self) -> str:
+        """Id of expander."""
+        return self._id
+
+    def register(
+        self,
+        pin: int,
+        callback: Callable[[bool], None],
+        on_ready: Callable[[bool], None],
+        bounce_time: float,
+    ) -> None:
+        """Register pin. It is set up and read in I2C pool, together with
+        other pins registered meanwhile, and on_ready is invoked with its
+        state then. Callback is invoked with new state on every later change."""
+        self._pins[pin] = ExpanderPin(
+            pin=pin, callback=callback, on_ready=on_ready, bounce_time=bounce_time
+        )
+        if not self._setup_mask:
+            self._loop.call_soon(self._setup_pins)
+        self._setup_mask |= 1 << pin
+        if self._task is None:
+            self._start()
+        _LOGGER.debug("Registered pin %s of expander %s.", pin, self._id)
+
+    def _setup_pins(self) -> None:
+        mask = self._setup_mask
+        self._setup_mask = 0
+        future = self._loop.run_in_executor(self._executor, self._setup_and_read, mask)
+        future.add_done_callback(partial(self._setup_done, mask))
+
+    def _setup_and_read(self, mask: int) -> Tuple[int, int, int]:
+        self._reader.setup(mask)
+        return self._reader.read()
+
+    def _setup_done(self, mask: int, future: asyncio.Future) -> None:
+        # Pins are dispatched only once their initial state is known.
+        self._mask |= mask
+        try:
+            captured, capture_levels, levels = future.result()
+        except Exception as err:
+            # Pins are set up and read once expander is reconnected.
+            _LOGGER.error(
+                "Can't set up pins %s of expander %s. %s", hex(mask), self._id, err
+            )
+            self._report(err)
+            return
+        self._report()
+        self._reported = (self._reported & ~mask) | (~levels & mask)
+        for pin, expander_pin in self._pins.items():
+            if mask & (1 << pin):
+                expander_pin.on_ready(self.is_active(pin))
+        # Read cleared interrupt, so report changes of other pins too.
+        self.dispatch(
+            captured=captured & ~mask, capture_levels=capture_levels, levels=levels
+        )
+
+    def restore(self) -> None:
+        """Set up all registered pins again after expander was reset and read
+        them, so changes made meanwhile are reported."""
+        if not self._mask:
+            return
+        future = self._loop.run_in_executor(
+            self._executor, self._reader.setup, self._mask
+        )
+        future.add_done_callback(self._restore_done)
+
+    def _restore_done(self, future: asyncio.Future) -> None:
+        try:
+            future.result()
+        except Exception as err:
+            _LOGGER.error("Can't set up inputs of expander %s. %s", self._id, err)
+            self._report(err)
+            return
+        self.schedule_read()
+
+    def _report(self, err: Optional[Exception] = None) -> None:
+        if self._connection is None:
+            return
+        if err:
+            self._connection.report_error(err)
+        else:
+            self._connection.report_ok()
+
+    def is_active(self, pin: int) -> bool:
+        """Last reported state of pin."""
+        return bool(self._reported & (1 << pin))
+
+    def _start(self) -> None:
+        period = self._poll_period
+        if self._interrupt_pin:
+            try:
+                self._cdev_source.add_pin(
+                    pin=self._interrupt_pin,
+                    callback=self._interrupt,
+                    bias="gpio_pu",
+                    active_low=True,
+                )
+                period = self._safety_period
+                _LOGGER.info(
+                    "Expander %s inputs driven by interrupt on %s.",
+                    self._id,
+                    self._interrupt_pin,
+                )
+            except Exception as err:
+                _LOGGER.error(
+                    "Can't watch interrupt pin %s of expander %s, polling. %s",
+                    self._interrupt_pin,
+                    self._id,
+                    err,
+                )
+        self._task = self._loop.create_task(self._run(period))
+
+    def _interrupt(self, event: LineEvent) -> None:
+        if event.rising:
+            self.schedule_read()
+
+    def schedule_read(self) -> None:
+        """Read expander in I2C pool. Calls during read are merged into one."""
+        if self._connection and not self._connection.online:
+            return
+        if self._reading:
+            self._read_again = True
+            return
+        self._reading = True
+        future = self._loop.run_in_executor(self._executor, self._reader.read)
+        future.add_done_callback(self._read_done)
+
+    def _read_done(self, future: asyncio.Future) -> None:
+        self._reading = False
+        try:
+            captured, capture_levels, levels = future.result()
+        except Exception as err:
+            _LOGGER.error("Can't read inputs of expander %s. %s", self._id, err)
+            self._report(err)
+        else:
+            self._report()
+            self.dispatch(
+                captured=captured, capture_levels=capture_levels, levels=levels
+            )
+        if self._read_again:
+            self._read_again = False
+            self.schedule_read()
+
+    def dispatch(self, captured: int, capture_levels: int, levels: int) -> None:
+        """Report changed pins. Levels are raw (bit set means line high)."""
+        active = ~levels & self._mask
+        at_capture = ~capture_levels & captured & self._mask
+        # Pin was in other state at interrupt, but it is back already.
+        pulsed = (at_capture ^ self._reported) & captured & ~(active ^ self._reported)
+        changed = (active ^ self._reported) | pulsed
+        if not changed:
+            return
+        now = time.monotonic()
+        for pin, expander_pin in self._pins.items():
+            bit = 1 << pin
+            if not changed & bit:
+                continue
+            if now - expander_pin.last_change < expander_pin.bounce_time:
+                # Keep old state and look again once bounce time is over.
+                self._loop.call_later(expander_pin.bounce_time, self.schedule_read)
+                continue
+            expander_pin.last_change = now
+            if pulsed & bit:
+                # Report both edges of short pulse.
+                expander_pin.callback(not (self._reported & bit))
+                expander_pin.callback(bool(self._reported & bit))
+                continue
+            self._reported ^= bit
+            expander_pin.callback(bool(self._reported & bit))
+
+    async def _run(self, period: float) -> None:
+        while True:
+            await asyncio.sleep(period)
+            self.schedule_read()
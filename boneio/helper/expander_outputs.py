@@ -0,0 +1,399 @@
+"""Outputs on MCP23017 and PCF8575 expanders written through shadow latch."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from boneio.helper.expander_connection import ExpanderConnection
+
+_LOGGER = logging.getLogger(__name__)
+
+# MCP23017 registers, IOCON.BANK = 0.
+MCP23017_IODIRA = 0x00
+MCP23017_OLATA = 0x14
+# IODIRA to OLATB.
+MCP23017_REGISTERS = 0x16
+
+# How often shadow latch is compared with expander.
+EXPANDER_VERIFY_PERIOD = 60.0
+
+
+class MCP23017OutputWriter:
+    """Write all 16 output latches of MCP23017 in one I2C transaction."""
+
+    def __init__(self, mcp) -> None:
+        """Initialize writer of MCP23017 driver, adafruit or native."""
+        self._mcp = mcp
+        self._buf = bytearray(MCP23017_REGISTERS)
+
+    def setup(self, mask: int) -> None:
+        """Switch pins of mask to outputs and all others to inputs, with one
+        write. Latch has to be written before and input pins set up after."""
+        self._mcp.iodir = ~mask & 0xFFFF
+
+    def read_latch(self) -> int:
+        """Read OLATA and OLATB."""
+        return self._mcp._read_u16le(MCP23017_OLATA)
+
+    def read_state(self) -> Tuple[int, int]:
+        """Read all registers from IODIRA to OLATB in one sequential read.
+        Return (latch, mask of input pins)."""
+        with self._mcp._device as i2c:
+            i2c.write_then_readinto(bytes([MCP23017_IODIRA]), self._buf)
+        buf = self._buf
+        return buf[MCP23017_OLATA] | buf[MCP23017_OLATA + 1] << 8, buf[0] | buf[1] << 8
+
+    def write_latch(self, value: int, output_mask: int) -> None:
+        """Write OLATA and OLATB. Latch of input pins doesn't matter."""
+        self._mcp._write_u16le(MCP23017_OLATA, value)
+
+
+class PCF8575OutputWriter:
+    """Write all 16 pins of PCF8575 in one I2C transaction."""
+
+    def __init__(self, pcf) -> None:
+        """Initialize writer of PCF8575 driver, adafruit or native."""
+        self._pcf = pcf
+
+    def setup(self, mask: int) -> None:
+        """PCF8575 has no direction register."""
+
+    def read_latch(self) -> int:
+        """PCF8575 latch can't be read back, port levels follow it for outputs."""
+        return self._pcf.read_gpio()
+
+    def read_state(self) -> Tuple[int, int]:
+        """Return (latch, mask of input pins). Direction of PCF8575 pin is
+        given by latch only, so rewrite of latch also restores it."""
+        return self._pcf.read_gpio(), 0
+
+    def write_latch(self, value: int, output_mask: int) -> None:
+        """Write port. Pins which are not outputs are kept high, so they stay inputs."""
+        self._pcf.write_gpio((value & output_mask) | (~output_mask & 0xFFFF))
+
+
+class Interlock:
+    """Pins of which at most one can be active at a time."""
+
+    __slots__ = ("mask", "inverted", "dead_time", "released", "released_at", "pending")
+
+    def __init__(self, mask: int, inverted: int, dead_time: float) -> None:
+        self.mask = mask
+        # Pins which are active on low level.
+        self.inverted = inverted
+        self.dead_time = dead_time
+        # Pins which were active last and when they were released.
+        self.released = 0
+        self.released_at = 0.0
+        # Pin waiting for dead time to turn on.
+        self.pending: Optional[int] = None
+
+    def active(self, value: int) -> int:
+        """Mask of active pins in latch value."""
+        return (value ^ self.inverted) & self.mask
+
+
+class ExpanderOutputs:
+    """Shadow copy of output latch of one expander.
+
+    Pin changes only update shadow and schedule flush. All changes made
+    until flush runs in I2C pool (eg. every member of output group) are
+    written with one 16-bit write. States are read from shadow and shadow is
+    compared with expander every verify period.
+
+    Outputs are set up the same way. Pins only register with their initial
+    level and setup() writes latch and direction of all of them at once.
+
+    Verify reads latch and direction with one transaction. Expander which
+    lost direction of outputs was reset (eg. brown-out), it is set up again
+    and on_reset is called, so its inputs can be set up too.
+
+    With connection, results of transactions are reported to it. Nothing is
+    written while expander is failed, restore() writes shadow back once it
+    reconnects.
+
+    Interlocked pins are enforced in shadow, whoever sets them. Activating
+    pin releases other active pins of interlock at once, and pin itself is
+    activated only after dead time since release. Every latch value is
+    checked under lock before it is written, so interlock can't be broken
+    by changes batched from several threads.
+    """
+
+    def __init__(
+        self,
+        expander_id: str,
+        writer: MCP23017OutputWriter | PCF8575OutputWriter,
+        executor: Executor,
+        verify_period: float = EXPANDER_VERIFY_PERIOD,
+        on_reset: Optional[Callable[[], None]] = None,
+        connection: Optional[ExpanderConnection] = None,
+        on_interlock: Optional[Callable[[int], None]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Initialize expander outputs. Nothing is written until setup().
+        on_interlock is called in loop with mask of pins whose level was
+        changed by interlock: released ones, pending ones activated after
+        dead time and pending ones dropped before."""
+        self._id = expander_id
+        self._writer = writer
+        self._executor = executor
+        self._verify_period = verify_period
+        self._on_reset = on_reset
+        self._connection = connection
+        self._loop = loop or asyncio.get_event_loop()
+        self._lock = threading.Lock()
+        self._shadow = 0
+        self._output_mask = 0
+        self._setup_mask = 0
+        self._setup_started = False
+        self._flush_scheduled = False
+        self._task = None
+        self._on_interlock = on_interlock
+        self._interlocks: Dict[int, Interlock] = {}
+        self._interlock_list: List[Interlock] = []
+
+    @property
+    def id(self) -> str:
+        """Id of expander."""
+        return self._id
+
+    def setup_output(self, pin: int, level: bool) -> None:
+        """Register pin as output with initial level. It is written by setup(),
+        which is scheduled right away if boot setup has already run."""
+        bit = 1 << pin
+        with self._lock:
+            self._shadow = self._shadow | bit if level else self._shadow & ~bit
+            self._setup_mask |= bit
+            late = self._setup_started
+        if self._task is None and self._verify_period:
+            self._task = self._loop.create_task(self._run_verify())
+        if late:
+            self._loop.call_soon_threadsafe(
+                self._loop.run_in_executor, self._executor, self.setup
+            )
+
+    def add_interlock(self, pins: Dict[int, bool], dead_time: float) -> None:
+        """Interlock pins, given with their active level. If more of them
+        are active already, all are released."""
+        mask = inverted = 0
+        for pin, active_level in pins.items():
+            if pin in self._interlocks:
+                _LOGGER.error(
+                    "Pin %s of expander %s is already interlocked.", pin, self._id
+                )
+                return
+            mask |= 1 << pin
+            if not active_level:
+                inverted |= 1 << pin
+        interlock = Interlock(mask=mask, inverted=inverted, dead_time=dead_time)
+        with self._lock:
+            for pin in pins:
+                self._interlocks[pin] = interlock
+            self._interlock_list.append(interlock)
+            value = self._check_interlocks(self._shadow)
+            if value == self._shadow or self._flush_scheduled or not self._output_mask:
+                # Unchanged, or pending flush or setup writes it.
+                self._shadow = value
+                return
+            self._shadow = value
+            self._flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+
+    def _check_interlocks(self, value: int) -> int:
+        """Release all pins of interlock which has more of them active.
+        Called under lock with latch value to write."""
+        for interlock in self._interlock_list:
+            active = interlock.active(value)
+            if active & (active - 1):
+                _LOGGER.error(
+                    "Interlocked outputs of expander %s (mask %s) are active together. Releasing them.",
+                    self._id,
+                    hex(active),
+                )
+                value = (value & ~active) | (active & interlock.inverted)
+        return value
+
+    def setup(self) -> None:
+        """Write latch of all registered outputs, then switch them to outputs.
+        Runs in I2C pool. Failed setup is retried by verify."""
+        with self._lock:
+            self._setup_started = True
+        if not self._online:
+            return
+        with self._lock:
+            mask = self._setup_mask
+            if not mask:
+                return
+            self._setup_mask = 0
+            self._output_mask |= mask
+            self._shadow = self._check_interlocks(self._shadow)
+            value, output_mask = self._shadow, self._output_mask
+        try:
+            self._writer.write_latch(value, output_mask)
+            self._writer.setup(output_mask)
+        except Exception as err:
+            _LOGGER.error("Can't set up outputs of expander %s. %s", self._id, err)
+            with self._lock:
+                self._setup_mask |= mask
+            self._report(err)
+        else:
+            self._report()
+
+    def restore(self) -> None:
+        """Set up all outputs again with shadowed levels, eg. after reconnect."""
+        with self._lock:
+            self._setup_mask |= self._output_mask
+        self._loop.run_in_executor(self._executor, self.setup)
+
+    @property
+    def _online(self) -> bool:
+        return self._connection is None or self._connection.online
+
+    def _report(self, err: Optional[Exception] = None) -> None:
+        if self._connection is None:
+            return
+        if err:
+            self._connection.report_error(err)
+        else:
+            self._connection.report_ok()
+
+    def level(self, pin: int) -> bool:
+        """Level of pin from shadow."""
+        return bool(self._shadow & (1 << pin))
+
+    def set_level(self, pin: int, level: bool) -> bool:
+        """Set pin in shadow and schedule flush. Can be called from any thread.
+        Return False if interlock keeps pin pending for dead time, on_interlock
+        reports it once it is activated or dropped."""
+        bit = 1 << pin
+        with self._lock:
+            interlock = self._interlocks.get(pin)
+            if interlock is None:
+                value = self._shadow | bit if level else self._shadow & ~bit
+            else:
+                value = self._interlocked_level(interlock, pin, level)
+            applied = bool(value & bit) == level
+            if value == self._shadow:
+                return applied
+            self._shadow = value
+            if self._flush_scheduled:
+                return applied
+            self._flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+        return applied
+
+    def _interlocked_level(self, interlock: Interlock, pin: int, level: bool) -> int:
+        """Latch value after setting interlocked pin. Called under lock."""
+        bit = 1 << pin
+        value = self._shadow | bit if level else self._shadow & ~bit
+        now = time.monotonic()
+        if not interlock.active(value) & bit:
+            if interlock.pending == pin:
+                interlock.pending = None
+            if interlock.active(self._shadow) & bit:
+                interlock.released = bit
+                interlock.released_at = now
+            return value
+        if interlock.active(self._shadow) & bit:
+            return value
+        others = interlock.active(self._shadow) & ~bit
+        if others:
+            value = (value & ~others) | (others & interlock.inverted)
+            interlock.released = others
+            interlock.released_at = now
+            if self._on_interlock:
+                self._loop.call_soon_threadsafe(self._on_interlock, others)
+        wait = interlock.released_at + interlock.dead_time - now
+        if interlock.released & ~bit and wait > 0:
+            # Keep pin released until dead time passes.
+            self._drop_pending(interlock, pin)
+            interlock.pending = pin
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, wait, self._activate_pending, interlock, pin
+            )
+            return value ^ bit
+        self._drop_pending(interlock, pin)
+        return value
+
+    def _drop_pending(self, interlock: Interlock, pin: int) -> None:
+        """Forget pin waiting for dead time, which pin replaces. Its relay
+        is told it stays released. Called under lock."""
+        pending = interlock.pending
+        interlock.pending = None
+        if pending is not None and pending != pin and self._on_interlock:
+            self._loop.call_soon_threadsafe(self._on_interlock, 1 << pending)
+
+    def _activate_pending(self, interlock: Interlock, pin: int) -> None:
+        if interlock.pending != pin:
+            return
+        if (
+            self.set_level(pin, not interlock.inverted & 1 << pin)
+            and self._on_interlock
+        ):
+            self._on_interlock(1 << pin)
+
+    def _schedule_flush(self) -> None:
+        self._loop.run_in_executor(self._executor, self.flush)
+
+    def flush(self) -> None:
+        """Write shadow to expander. Runs in I2C pool."""
+        with self._lock:
+            self._flush_scheduled = False
+            self._shadow = self._check_interlocks(self._shadow)
+            value = self._shadow
+        if not self._online:
+            return
+        try:
+            self._writer.write_latch(value, self._output_mask)
+        except Exception as err:
+            _LOGGER.error("Can't write outputs of expander %s. %s", self._id, err)
+            self._report(err)
+        else:
+            self._report()
+
+    def verify(self) -> bool:
+        """Compare expander latch with shadow and rewrite it on mismatch.
+        Runs in I2C pool. Return True if latch was correct."""
+        if not self._online:
+            return False
+        if self._setup_mask:
+            self.setup()
+        try:
+            latch, inputs = self._writer.read_state()
+        except Exception as err:
+            _LOGGER.error("Can't verify outputs of expander %s. %s", self._id, err)
+            self._report(err)
+            return False
+        self._report()
+        if inputs & self._output_mask:
+            _LOGGER.warning(
+                "Outputs of expander %s are not set up, it was reset. Setting it up again.",
+                self._id,
+            )
+            with self._lock:
+                self._setup_mask |= self._output_mask
+            self.setup()
+            if self._on_reset:
+                self._loop.call_soon_threadsafe(self._on_reset)
+            return False
+        with self._lock:
+            diff = (latch ^ self._shadow) & self._output_mask
+            if not diff or self._flush_scheduled:
+                # Pending flush will write new shadow anyway.
+                return True
+        _LOGGER.warning(
+            "Outputs of expander %s differ from expected state (mask %s). Rewriting.",
+            self._id,
+            hex(diff),
+        )
+        self.flush()
+        return False
+
+    async def _run_verify(self) -> None:
+        while True:
+            await asyncio.sleep(self._verify_period)
+            await self._loop.run_in_executor(self._executor, self.verify)
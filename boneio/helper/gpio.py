@@ -16,18 +16,112 @@ except ModuleNotFoundError:
 
     pass
 
+import mmap
+import os
 import subprocess
-from typing import Callable, Awaitable, List
+from typing import Callable, Awaitable, List, Tuple
 
-from boneio.const import CONFIG_PIN, FALLING
+from boneio.const import CONFIG_PIN, FALLING, HIGH
 from boneio.const import GPIO as GPIO_STR
 from boneio.const import GPIO_MODE, LOW, ClickTypes, Gpio_Edges, Gpio_States, InputTypes
+from boneio.helper.edge_guard import (
+    DEFAULT_EDGE_RATE_LIMIT,
+    GUARD_QUARANTINED,
+    GUARD_THROTTLED,
+    THROTTLE_DEBOUNCE,
+    EdgeGuard,
+    EdgeGuardMonitor,
+)
 from boneio.helper.exceptions import GPIOInputException
 from boneio.helper.timeperiod import TimePeriod
-from concurrent.futures import ThreadPoolExecutor
 
 _LOGGER = logging.getLogger(__name__)
 
+# AM335x GPIO numbers (bank * 32 + bit) of BeagleBone header pins.
+PIN_GPIO_NUMBERS = {
+    "P8_3": 38,
+    "P8_4": 39,
+    "P8_5": 34,
+    "P8_6": 35,
+    "P8_7": 66,
+    "P8_8": 67,
+    "P8_9": 69,
+    "P8_10": 68,
+    "P8_11": 45,
+    "P8_12": 44,
+    "P8_13": 23,
+    "P8_14": 26,
+    "P8_15": 47,
+    "P8_16": 46,
+    "P8_17": 27,
+    "P8_18": 65,
+    "P8_19": 22,
+    "P8_20": 63,
+    "P8_21": 62,
+    "P8_22": 37,
+    "P8_23": 36,
+    "P8_24": 33,
+    "P8_25": 32,
+    "P8_26": 61,
+    "P8_27": 86,
+    "P8_28": 88,
+    "P8_29": 87,
+    "P8_30": 89,
+    "P8_31": 10,
+    "P8_32": 11,
+    "P8_33": 9,
+    "P8_34": 81,
+    "P8_35": 8,
+    "P8_36": 80,
+    "P8_37": 78,
+    "P8_38": 79,
+    "P8_39": 76,
+    "P8_40": 77,
+    "P8_41": 74,
+    "P8_42": 75,
+    "P8_43": 72,
+    "P8_44": 73,
+    "P8_45": 70,
+    "P8_46": 71,
+    "P9_11": 30,
+    "P9_12": 60,
+    "P9_13": 31,
+    "P9_14": 50,
+    "P9_15": 48,
+    "P9_16": 51,
+    "P9_17": 5,
+    "P9_18": 4,
+    "P9_19": 13,
+    "P9_20": 12,
+    "P9_21": 3,
+    "P9_22": 2,
+    "P9_23": 49,
+    "P9_24": 15,
+    "P9_25": 117,
+    "P9_26": 14,
+    "P9_27": 115,
+    "P9_28": 113,
+    "P9_29": 111,
+    "P9_30": 112,
+    "P9_31": 110,
+    "P9_41": 20,
+    "P9_42": 7,
+}
+
+
+def gpio_number(pin: str) -> int:
+    """Return AM335x GPIO number of header pin, eg. P8_37 -> 78."""
+    header, _, number = pin.upper().replace(".", "_").partition("_")
+    try:
+        return PIN_GPIO_NUMBERS[f"{header}_{int(number)}"]
+    except (KeyError, ValueError):
+        raise GPIOInputException(f"Pin {pin} is not a GPIO pin.")
+
+
+def gpio_bank(pin: str) -> tuple[int, int]:
+    """Return (bank, bit) of header pin."""
+    return divmod(gpio_number(pin), 32)
+
 
 def configure_pin(pin: str, mode: str = GPIO_STR) -> None:
     pin = f"{pin[0:3]}0{pin[3]}" if len(pin) == 4 else pin
@@ -100,6 +194,125 @@ def add_event_callback(pin: str, callback: Callable) -> None:
         raise GPIOInputException(err)
 
 
+# AM335x GPIO bank register map.
+AM335X_GPIO_BANKS = (0x44E07000, 0x4804C000, 0x481AC000, 0x481AE000)
+GPIO_BANK_SIZE = 0x1000
+GPIO_OE = 0x134
+GPIO_DATAIN = 0x138
+GPIO_DATAOUT = 0x13C
+GPIO_CLEARDATAOUT = 0x190
+GPIO_SETDATAOUT = 0x194
+
+BANK_PINS = {}
+for _pin, _number in PIN_GPIO_NUMBERS.items():
+    BANK_PINS.setdefault(_number // 32, {})[_number % 32] = _pin
+
+
+class GpioBackend:
+    """Raw access to GPIO levels. Bit set in bank mask means HIGH level."""
+
+    def read_bank(self, bank: int, mask: int = 0xFFFFFFFF) -> int:
+        """Read levels of bank pins selected by mask."""
+        raise NotImplementedError
+
+    def write_bank(self, bank: int, set_mask: int = 0, clear_mask: int = 0) -> None:
+        """Drive pins of set_mask HIGH and pins of clear_mask LOW."""
+        raise NotImplementedError
+
+    def read_pin(self, pin: str) -> bool:
+        """Read level of single pin."""
+        bank, bit = gpio_bank(pin)
+        return bool(self.read_bank(bank, 1 << bit))
+
+    def write_pin(self, pin: str, value: bool) -> None:
+        """Write level of single pin."""
+        bank, bit = gpio_bank(pin)
+        if value:
+            self.write_bank(bank, set_mask=1 << bit)
+        else:
+            self.write_bank(bank, clear_mask=1 << bit)
+
+
+class BBIOGpioBackend(GpioBackend):
+    """Backend using Adafruit_BBIO, one call per pin."""
+
+    def read_bank(self, bank: int, mask: int = 0xFFFFFFFF) -> int:
+        levels = 0
+        for bit, pin in BANK_PINS.get(bank, {}).items():
+            if mask & (1 << bit) and GPIO.input(pin) == HIGH:
+                levels |= 1 << bit
+        return levels
+
+    def write_bank(self, bank: int, set_mask: int = 0, clear_mask: int = 0) -> None:
+        for bit, pin in BANK_PINS.get(bank, {}).items():
+            if set_mask & (1 << bit):
+                GPIO.output(pin, HIGH)
+            elif clear_mask & (1 << bit):
+                GPIO.output(pin, LOW)
+
+
+class MmapGpioBackend(GpioBackend):
+    """Backend reading and writing whole banks through mmap of GPIO registers.
+
+    Pins still have to be configured (pinmux, direction) by Adafruit_BBIO.
+    Any file can be used instead of /dev/mem, eg. a file of
+    4 * GPIO_BANK_SIZE bytes with bank_addresses=(0, 0x1000, 0x2000, 0x3000).
+    """
+
+    def __init__(
+        self,
+        path: str = "/dev/mem",
+        bank_addresses: Tuple[int, ...] = AM335X_GPIO_BANKS,
+    ) -> None:
+        """Map register block of every bank."""
+        self._maps = []
+        self._registers = []
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            for address in bank_addresses:
+                _map = mmap.mmap(
+                    fd,
+                    GPIO_BANK_SIZE,
+                    flags=mmap.MAP_SHARED,
+                    prot=mmap.PROT_READ | mmap.PROT_WRITE,
+                    offset=address,
+                )
+                self._maps.append(_map)
+                # 32bit view so every register access is a single load/store.
+                self._registers.append(memoryview(_map).cast("I"))
+        finally:
+            os.close(fd)
+
+    def read_bank(self, bank: int, mask: int = 0xFFFFFFFF) -> int:
+        return self._registers[bank][GPIO_DATAIN // 4] & mask
+
+    def write_bank(self, bank: int, set_mask: int = 0, clear_mask: int = 0) -> None:
+        registers = self._registers[bank]
+        if set_mask:
+            registers[GPIO_SETDATAOUT // 4] = set_mask
+        if clear_mask:
+            registers[GPIO_CLEARDATAOUT // 4] = clear_mask
+
+    def close(self) -> None:
+        """Unmap registers."""
+        for registers in self._registers:
+            registers.release()
+        for _map in self._maps:
+            _map.close()
+        self._registers = []
+        self._maps = []
+
+
+def create_gpio_backend(kind: str = "bbio") -> GpioBackend:
+    """Create GPIO backend. Fallback to Adafruit_BBIO if mmap is not available."""
+    if kind == "mmap":
+        try:
+            return MmapGpioBackend()
+        except OSError as err:
+            _LOGGER.error("Can't map GPIO registers, using Adafruit_BBIO. %s", err)
+    return BBIOGpioBackend()
+
+
 class GpioBaseClass:
     """Base class for initialize GPIO"""
 
@@ -123,11 +336,63 @@ class GpioBaseClass:
         self._loop = asyncio.get_running_loop()
         self._press_callback = press_callback
         self._name = name
-        setup_input(pin=self._pin, pull_mode=gpio_mode)
-        self.executor = ThreadPoolExecutor()
+        self._setup_pin(gpio_mode=gpio_mode)
         self._actions = actions
         self._input_type = input_type
         self._empty_message_after = empty_message_after
+        self._resync_pending = False
+        edge_guard_monitor: EdgeGuardMonitor | None = kwargs.get("edge_guard_monitor")
+        self._edge_guard = (
+            edge_guard_monitor.add_input(
+                pin=pin,
+                limit=kwargs.get("edge_rate_limit", DEFAULT_EDGE_RATE_LIMIT),
+                on_change=self._edge_guard_changed,
+            )
+            if edge_guard_monitor
+            else None
+        )
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        """Configure pin as input."""
+        setup_input(pin=self._pin, pull_mode=gpio_mode)
+
+    def _edge_allowed(self, timestamp: float) -> bool:
+        """Account edge in guard. Can be called from foreign thread."""
+        if self._edge_guard is None or self._edge_guard.edge(timestamp):
+            return True
+        if self._edge_guard.state == GUARD_THROTTLED and not self._resync_pending:
+            # Dropped edge might be the last one, read line once it settles.
+            self._resync_pending = True
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, THROTTLE_DEBOUNCE, self._guarded_resync
+            )
+        return False
+
+    def _guarded_resync(self) -> None:
+        self._resync_pending = False
+        self.resync()
+
+    def _edge_guard_changed(self, guard: EdgeGuard, old_state: str) -> None:
+        if guard.state == GUARD_QUARANTINED:
+            self._suspend_edges()
+            return
+        if old_state == GUARD_QUARANTINED:
+            self._resume_edges()
+        self.resync()
+
+    def _suspend_edges(self) -> None:
+        """Stop receiving edges if backend allows it."""
+
+    def _resume_edges(self) -> None:
+        """Start receiving edges again."""
+
+    def resync(self) -> None:
+        """Update state from current pin value."""
+
+    @property
+    def edge_guard(self) -> EdgeGuard | None:
+        """Edge rate guard of input."""
+        return self._edge_guard
 
     def press_callback(self, click_type: ClickTypes, duration: float | None = None) -> None:
         actions = self._actions.get(click_type, [])
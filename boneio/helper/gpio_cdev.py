@@ -0,0 +1,415 @@
+"""Edge events from Linux GPIO character device (v2 uAPI)."""
+from __future__ import annotations
+
+import asyncio
+import errno
+import fcntl
+import logging
+import os
+import struct
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from boneio.helper.exceptions import GPIOInputException
+from boneio.helper.gpio import gpio_bank
+
+_LOGGER = logging.getLogger(__name__)
+
+# ioctls from linux/gpio.h
+GPIO_V2_GET_LINE_IOCTL = 0xC250B407
+GPIO_V2_LINE_GET_VALUES_IOCTL = 0xC010B40E
+
+GPIO_V2_LINE_FLAG_ACTIVE_LOW = 1 << 1
+GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+GPIO_V2_LINE_FLAG_EDGE_RISING = 1 << 4
+GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 5
+GPIO_V2_LINE_FLAG_BIAS_PULL_UP = 1 << 8
+GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN = 1 << 9
+GPIO_V2_LINE_FLAG_BIAS_DISABLED = 1 << 10
+
+GPIO_V2_LINE_ATTR_ID_DEBOUNCE = 3
+
+GPIO_V2_LINE_EVENT_RISING_EDGE = 1
+GPIO_V2_LINE_EVENT_FALLING_EDGE = 2
+
+GPIO_V2_LINES_MAX = 64
+GPIO_V2_LINE_NUM_ATTRS_MAX = 10
+GPIO_MAX_NAME_SIZE = 32
+
+# struct gpio_v2_line_request, fd is last field.
+LINE_REQUEST_SIZE = 592
+LINE_REQUEST_FD_OFFSET = 588
+# struct gpio_v2_line_event: timestamp_ns, id, offset, seqno, line_seqno, padding.
+LINE_EVENT_FORMAT = "=QIIII24x"
+LINE_EVENT_SIZE = struct.calcsize(LINE_EVENT_FORMAT)
+# How many events to read at once from one line.
+EVENT_READ_BATCH = 16
+# Counters don't look into every event, read more of them at once.
+COUNTER_READ_BATCH = 64
+
+BIAS_FLAGS = {
+    "gpio": 0,
+    "gpio_input": GPIO_V2_LINE_FLAG_BIAS_DISABLED,
+    "gpio_pu": GPIO_V2_LINE_FLAG_BIAS_PULL_UP,
+    "gpio_pd": GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN,
+}
+
+
+class LineEvent(NamedTuple):
+    """Edge event of GPIO line. Timestamp is CLOCK_MONOTONIC in ns."""
+
+    timestamp_ns: int
+    id: int
+    offset: int
+    seqno: int
+    line_seqno: int
+
+    @property
+    def timestamp(self) -> float:
+        """Timestamp in seconds, same clock as time.monotonic()."""
+        return self.timestamp_ns / 1e9
+
+    @property
+    def rising(self) -> bool:
+        """Line became active."""
+        return self.id == GPIO_V2_LINE_EVENT_RISING_EDGE
+
+
+def pack_line_event(
+    timestamp_ns: int,
+    rising: bool,
+    offset: int = 0,
+    seqno: int = 0,
+    line_seqno: int = 0,
+) -> bytes:
+    """Pack event the way kernel does. Useful to feed fake event fd."""
+    return struct.pack(
+        LINE_EVENT_FORMAT,
+        timestamp_ns,
+        GPIO_V2_LINE_EVENT_RISING_EDGE if rising else GPIO_V2_LINE_EVENT_FALLING_EDGE,
+        offset,
+        seqno,
+        line_seqno,
+    )
+
+
+def unpack_line_events(data: bytes) -> list[LineEvent]:
+    """Unpack events read from line fd."""
+    return [LineEvent(*x) for x in struct.iter_unpack(LINE_EVENT_FORMAT, data)]
+
+
+def chip_line(pin: str) -> Tuple[str, int]:
+    """Return (gpiochip path, line offset) of header pin.
+    On AM335x every GPIO bank is a separate gpiochip."""
+    bank, bit = gpio_bank(pin)
+    return f"/dev/gpiochip{bank}", bit
+
+
+def _line_request(
+    offset: int, consumer: str, flags: int, debounce_us: int
+) -> bytearray:
+    request = bytearray(LINE_REQUEST_SIZE)
+    struct.pack_into("=I", request, 0, offset)
+    struct.pack_into(
+        f"={GPIO_MAX_NAME_SIZE}s",
+        request,
+        GPIO_V2_LINES_MAX * 4,
+        consumer.encode()[: GPIO_MAX_NAME_SIZE - 1],
+    )
+    config_offset = GPIO_V2_LINES_MAX * 4 + GPIO_MAX_NAME_SIZE
+    num_attrs = 1 if debounce_us else 0
+    struct.pack_into("=QI", request, config_offset, flags, num_attrs)
+    if debounce_us:
+        # First attribute: id, padding, debounce_period_us, mask of lines.
+        struct.pack_into(
+            "=IIQQ",
+            request,
+            config_offset + 32,
+            GPIO_V2_LINE_ATTR_ID_DEBOUNCE,
+            0,
+            debounce_us,
+            1,
+        )
+    num_lines_offset = config_offset + 32 + GPIO_V2_LINE_NUM_ATTRS_MAX * 24
+    struct.pack_into("=I", request, num_lines_offset, 1)
+    return request
+
+
+def request_line(
+    pin: str,
+    consumer: str = "boneio",
+    bias: str = "gpio",
+    active_low: bool = True,
+    debounce_us: int = 0,
+    falling_edge: bool = True,
+) -> Tuple[int, bool]:
+    """Request input line with edge detection on rising and falling edges.
+
+    Return (line fd, True if kernel debounce is used). If kernel refuses
+    debounce, line is requested without it.
+    """
+    chip_path, offset = chip_line(pin)
+    flags = (
+        GPIO_V2_LINE_FLAG_INPUT
+        | GPIO_V2_LINE_FLAG_EDGE_RISING
+        | BIAS_FLAGS.get(bias, 0)
+    )
+    if falling_edge:
+        flags |= GPIO_V2_LINE_FLAG_EDGE_FALLING
+    if active_low:
+        flags |= GPIO_V2_LINE_FLAG_ACTIVE_LOW
+    try:
+        chip_fd = os.open(chip_path, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError as err:
+        raise GPIOInputException(f"Can't open {chip_path}. {err}")
+    try:
+        for debounce in (debounce_us, 0) if debounce_us else (0,):
+            request = _line_request(
+                offset=offset, consumer=consumer, flags=flags, debounce_us=debounce
+            )
+            try:
+                fcntl.ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, request)
+            except OSError as err:
+                if debounce and err.errno in (errno.EINVAL, errno.ENOTSUP):
+                    _LOGGER.debug("Kernel debounce not available for %s. %s", pin, err)
+                    continue
+                raise GPIOInputException(f"Can't request line of {pin}. {err}")
+            (fd,) = struct.unpack_from("=i", request, LINE_REQUEST_FD_OFFSET)
+            os.set_blocking(fd, False)
+            return fd, bool(debounce)
+    finally:
+        os.close(chip_fd)
+    raise GPIOInputException(f"Can't request line of {pin}.")
+
+
+def read_line_value(fd: int) -> bool:
+    """Read current (active) value of requested line."""
+    values = bytearray(struct.pack("=QQ", 0, 1))
+    fcntl.ioctl(fd, GPIO_V2_LINE_GET_VALUES_IOCTL, values)
+    return bool(struct.unpack_from("=Q", values)[0] & 1)
+
+
+class CdevLine:
+    """Line registered in event source."""
+
+    __slots__ = ("pin", "fd", "callback", "kernel_debounce", "buffer", "paused")
+
+    def __init__(
+        self,
+        pin: str,
+        fd: int,
+        callback: Callable[[LineEvent], None],
+        kernel_debounce: bool,
+    ) -> None:
+        self.pin = pin
+        self.fd = fd
+        self.callback = callback
+        self.kernel_debounce = kernel_debounce
+        self.buffer = b""
+        self.paused = False
+
+
+class CdevCounter:
+    """Line counting its rising edges without per edge callback."""
+
+    __slots__ = (
+        "pin",
+        "fd",
+        "kernel_debounce",
+        "buffer",
+        "paused",
+        "pulses",
+        "seqno",
+        "last_pulse",
+    )
+
+    def __init__(self, pin: str, fd: int, kernel_debounce: bool) -> None:
+        self.pin = pin
+        self.fd = fd
+        self.kernel_debounce = kernel_debounce
+        self.buffer = b""
+        self.paused = False
+        self.pulses = 0
+        self.seqno = 0
+        # Monotonic time of last pulse in seconds.
+        self.last_pulse: Optional[float] = None
+
+
+class CdevEventSource:
+    """Dispatch kernel edge events of many lines from event loop.
+
+    Every line fd is watched with loop.add_reader, so events are read in
+    loop thread and carry kernel monotonic timestamps. Any readable fd
+    producing packed gpio_v2_line_event structs can be added with
+    add_fd(), eg. pipe in tests.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Initialize event source."""
+        self._loop = loop
+        self._lines: Dict[str, Union[CdevLine, CdevCounter]] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def add_pin(
+        self,
+        pin: str,
+        callback: Callable[[LineEvent], None],
+        bias: str = "gpio",
+        active_low: bool = True,
+        debounce: float = 0,
+    ) -> CdevLine:
+        """Request line of pin and watch its events."""
+        fd, kernel_debounce = request_line(
+            pin=pin,
+            consumer=f"boneio {pin}",
+            bias=bias,
+            active_low=active_low,
+            debounce_us=int(debounce * 1_000_000),
+        )
+        return self.add_fd(
+            pin=pin, fd=fd, callback=callback, kernel_debounce=kernel_debounce
+        )
+
+    def add_fd(
+        self,
+        pin: str,
+        fd: int,
+        callback: Callable[[LineEvent], None],
+        kernel_debounce: bool = False,
+    ) -> CdevLine:
+        """Watch events of already opened fd."""
+        self.remove(pin)
+        line = CdevLine(
+            pin=pin, fd=fd, callback=callback, kernel_debounce=kernel_debounce
+        )
+        self._lines[pin] = line
+        self.loop.add_reader(fd, self._read, line)
+        _LOGGER.debug("Watching edge events of %s on fd %s.", pin, fd)
+        return line
+
+    def add_counter(
+        self,
+        pin: str,
+        bias: str = "gpio",
+        active_low: bool = True,
+        debounce: float = 0,
+    ) -> CdevCounter:
+        """Request line of pin and count its rising edges."""
+        fd, kernel_debounce = request_line(
+            pin=pin,
+            consumer=f"boneio {pin}",
+            bias=bias,
+            active_low=active_low,
+            debounce_us=int(debounce * 1_000_000),
+            falling_edge=False,
+        )
+        return self.add_counter_fd(pin=pin, fd=fd, kernel_debounce=kernel_debounce)
+
+    def add_counter_fd(
+        self, pin: str, fd: int, kernel_debounce: bool = False
+    ) -> CdevCounter:
+        """Count events of already opened fd."""
+        self.remove(pin)
+        counter = CdevCounter(pin=pin, fd=fd, kernel_debounce=kernel_debounce)
+        self._lines[pin] = counter
+        self.loop.add_reader(fd, self._count, counter)
+        _LOGGER.debug("Counting edge events of %s on fd %s.", pin, fd)
+        return counter
+
+    def pause(self, pin: str) -> None:
+        """Stop reading events of pin. Kernel drops them once its buffer is full."""
+        line = self._lines.get(pin)
+        if line is None or line.paused:
+            return
+        line.paused = True
+        self.loop.remove_reader(line.fd)
+
+    def resume(self, pin: str) -> None:
+        """Drop events queued while paused and watch pin again."""
+        line = self._lines.get(pin)
+        if line is None or not line.paused:
+            return
+        line.paused = False
+        line.buffer = b""
+        try:
+            while os.read(line.fd, LINE_EVENT_SIZE * EVENT_READ_BATCH):
+                pass
+        except BlockingIOError:
+            pass
+        except OSError as err:
+            _LOGGER.error("Can't drain events of %s. %s", line.pin, err)
+        self.loop.add_reader(
+            line.fd, self._count if isinstance(line, CdevCounter) else self._read, line
+        )
+
+    def value(self, pin: str) -> bool:
+        """Current active value of line."""
+        return read_line_value(self._lines[pin].fd)
+
+    def remove(self, pin: str) -> None:
+        """Stop watching pin and close its fd."""
+        line = self._lines.pop(pin, None)
+        if line is None:
+            return
+        if not line.paused:
+            self.loop.remove_reader(line.fd)
+        os.close(line.fd)
+
+    def _count(self, counter: CdevCounter) -> None:
+        try:
+            data = os.read(counter.fd, LINE_EVENT_SIZE * COUNTER_READ_BATCH)
+        except BlockingIOError:
+            return
+        except OSError as err:
+            _LOGGER.error("Can't read events of %s. %s", counter.pin, err)
+            return
+        if not data:
+            _LOGGER.error("Event source of %s closed.", counter.pin)
+            self.loop.remove_reader(counter.fd)
+            return
+        data = counter.buffer + data
+        complete = len(data) - len(data) % LINE_EVENT_SIZE
+        counter.buffer = data[complete:]
+        if not complete:
+            return
+        # Only last event is unpacked. Kernel numbers events of line, so
+        # its line_seqno also covers events dropped on buffer overflow.
+        timestamp_ns, _, _, _, line_seqno = struct.unpack_from(
+            LINE_EVENT_FORMAT, data, complete - LINE_EVENT_SIZE
+        )
+        if line_seqno > counter.seqno:
+            counter.pulses += line_seqno - counter.seqno
+            counter.seqno = line_seqno
+        else:
+            counter.pulses += complete // LINE_EVENT_SIZE
+        counter.last_pulse = timestamp_ns / 1e9
+
+    def close(self) -> None:
+        """Close all lines."""
+        for pin in list(self._lines):
+            self.remove(pin)
+
+    def _read(self, line: CdevLine) -> None:
+        try:
+            data = os.read(line.fd, LINE_EVENT_SIZE * EVENT_READ_BATCH)
+        except BlockingIOError:
+            return
+        except OSError as err:
+            _LOGGER.error("Can't read events of %s. %s", line.pin, err)
+            return
+        if not data:
+            _LOGGER.error("Event source of %s closed.", line.pin)
+            self.loop.remove_reader(line.fd)
+            return
+        data = line.buffer + data
+        complete = len(data) - len(data) % LINE_EVENT_SIZE
+        line.buffer = data[complete:]
+        for event in unpack_line_events(data[:complete]):
+            try:
+                line.callback(event)
+            except Exception as err:
+                _LOGGER.error("Error in edge callback of %s. %s", line.pin, err)
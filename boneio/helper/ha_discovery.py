@@ -1,8 +1,12 @@
+from __future__ import annotations
 from boneio.const import (
     CLOSE,
     CLOSED,
     CLOSING,
     COVER,
+    EDGE_GUARD,
+    I2C_DEVICE_STATE,
+    I2C_STATE,
     INPUT,
     INPUT_SENSOR,
     OFF,
@@ -56,16 +60,14 @@ def ha_light_availabilty_message(id: str, topic: str = "boneIO", device_type: st
 
 
 def ha_led_availabilty_message(id: str, topic: str = "boneIO", **kwargs):
-    """Create LED availability topic for HA."""
+    """Create LED availability topic for HA.
+    JSON schema is used, so HA sends brightness and transition in one command."""
     msg = ha_availabilty_message(device_type=RELAY, topic=topic, id=id, **kwargs)
+    msg["schema"] = "json"
     msg["command_topic"] = f"{topic}/cmd/{RELAY}/{id}/set"
-    msg["brightness_state_topic"] = f"{topic}/{RELAY}/{id}"
-    msg["brightness_command_topic"] = f"{topic}/cmd/{RELAY}/{id}/set_brightness"
+    msg["brightness"] = True
     msg["brightness_scale"] = 65535
-    msg["payload_off"] = OFF
-    msg["payload_on"] = ON
-    msg["state_value_template"] = "{{ value_json.state }}"
-    msg["brightness_value_template"] = "{{ value_json.brightness }}"
+    msg["supported_color_modes"] = ["brightness"]
     return msg
 
 
@@ -89,10 +91,44 @@ def ha_switch_availabilty_message(id: str, topic: str = "boneIO", device_type: s
     return msg
 
 
-def ha_event_availabilty_message(**kwargs):
+def ha_event_availabilty_message(event_types: list | None = None, **kwargs):
     msg = ha_availabilty_message(device_type=INPUT, **kwargs)
     msg["icon"] = "mdi:gesture-double-tap"
-    msg["event_types"] = [SINGLE, DOUBLE, LONG]
+    msg["event_types"] = event_types or [SINGLE, DOUBLE, LONG]
+    return msg
+
+
+def ha_edge_guard_availabilty_message(**kwargs):
+    """Create diagnostic sensor of input edge guard."""
+    msg = ha_availabilty_message(device_type=EDGE_GUARD, **kwargs)
+    msg["icon"] = "mdi:pulse"
+    msg["entity_category"] = "diagnostic"
+    msg["value_template"] = "{{ value_json.state }}"
+    msg["json_attributes_topic"] = msg["state_topic"]
+    return msg
+
+
+def ha_i2c_bus_availabilty_message(**kwargs):
+    """Create diagnostic sensor of I2C bus utilization."""
+    msg = ha_availabilty_message(device_type=I2C_STATE, **kwargs)
+    msg["icon"] = "mdi:chip"
+    msg["entity_category"] = "diagnostic"
+    msg["unit_of_measurement"] = "%"
+    msg["state_class"] = "measurement"
+    msg["value_template"] = "{{ value_json.utilization }}"
+    msg["json_attributes_topic"] = msg["state_topic"]
+    return msg
+
+
+def ha_i2c_device_availabilty_message(**kwargs):
+    """Create diagnostic sensor of I2C device latency."""
+    msg = ha_availabilty_message(device_type=I2C_DEVICE_STATE, **kwargs)
+    msg["icon"] = "mdi:timer-outline"
+    msg["entity_category"] = "diagnostic"
+    msg["unit_of_measurement"] = "ms"
+    msg["state_class"] = "measurement"
+    msg["value_template"] = "{{ value_json.latency_p99 }}"
+    msg["json_attributes_topic"] = msg["state_topic"]
     return msg
 
 
@@ -153,6 +189,16 @@ def ha_sensor_ina_availabilty_message(
     }
 
 
+def ha_pulse_counter_availabilty_message(
+    id: str, state_id: str, value_key: str, topic: str = "boneIO", **kwargs
+):
+    """Create availability topic for HA of one value of pulse counter."""
+    msg = ha_availabilty_message(device_type=SENSOR, topic=topic, id=id, **kwargs)
+    msg["state_topic"] = f"{topic}/{SENSOR}/{state_id}"
+    msg["value_template"] = f"{{{{ value_json.{value_key} }}}}"
+    return msg
+
+
 def ha_sensor_temp_availabilty_message(
     id: str, name: str, topic: str = "boneIO", **kwargs
 ):
@@ -204,13 +250,18 @@ def modbus_sensor_availabilty_message(
 
 
 def ha_cover_availabilty_message(
-    id: str, name: str, device_class: str, topic: str = "boneIO"
+    id: str, name: str, device_class: str, topic: str = "boneIO", tilt: bool = False
 ):
     """Create Cover availability topic for HA."""
     kwargs = {"device_class": device_class} if device_class else {}
     msg = ha_availabilty_message(
         device_type=COVER, topic=topic, id=id, name=name, **kwargs
     )
+    if tilt:
+        msg["tilt_command_topic"] = f"{topic}/cmd/cover/{id}/tilt"
+        msg["tilt_status_topic"] = f"{topic}/{COVER}/{id}/tilt"
+        msg["tilt_min"] = 0
+        msg["tilt_max"] = 100
 
     return {
         **msg,
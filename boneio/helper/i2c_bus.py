@@ -0,0 +1,115 @@
+"""I2C buses of board."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from boneio.helper.exceptions import I2CError
+from boneio.helper.executor import DEFAULT_I2C_BUS
+
+if TYPE_CHECKING:
+    from busio import I2C
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_I2C_FREQUENCY = 100000
+# SCL and SDA header pins of buses which can be recovered.
+BUS_PINS = {1: ("P9_17", "P9_18"), 2: ("P9_19", "P9_20")}
+RECOVERY_CLOCKS = 9
+RECOVERY_HALF_PERIOD = 0.0001
+# Clock of bus is set by device tree, Linux can't change it at runtime.
+BUS_CLOCK_PATH = "/sys/bus/i2c/devices/i2c-{bus}/of_node/clock-frequency"
+
+
+def bus_clock(bus: int) -> int | None:
+    """Clock of bus in Hz as set by device tree."""
+    try:
+        with open(BUS_CLOCK_PATH.format(bus=bus), "rb") as file:
+            return int.from_bytes(file.read(4), "big")
+    except (OSError, ValueError):
+        return None
+
+
+def open_i2c_bus(bus: int, frequency: int | None = None) -> I2C:
+    """Open I2C bus by its number. Warn if requested clock differs from
+    clock bus runs with."""
+    # Blinka is imported only when some device needs it.
+    from busio import I2C
+
+    if bus == DEFAULT_I2C_BUS:
+        from board import SCL, SDA
+
+        i2c = I2C(SCL, SDA, frequency=frequency or DEFAULT_I2C_FREQUENCY)
+    else:
+        from microcontroller.pin import i2cPorts
+
+        for port, scl, sda in i2cPorts:
+            if port == bus:
+                i2c = I2C(scl, sda, frequency=frequency or DEFAULT_I2C_FREQUENCY)
+                break
+        else:
+            raise I2CError(f"There is no I2C bus {bus} on this board.")
+    clock = bus_clock(bus)
+    if frequency and clock and clock != frequency:
+        _LOGGER.warning(
+            "I2C bus %s runs at %s Hz, requested %s Hz. Its clock is set by device tree overlay.",
+            bus,
+            clock,
+            frequency,
+        )
+    _LOGGER.debug("Opened I2C bus %s, clock %s Hz.", bus, clock or "unknown")
+    return i2c
+
+
+def recover_bus(bus: int) -> bool:
+    """Free bus held by slave stuck in middle of transfer (SDA low).
+
+    Pins are switched to GPIO, SCL is clocked until slave releases SDA
+    and STOP is generated. Lines are only pulled low or released, pull-ups
+    drive them high. Return True if SDA is free after recovery.
+    """
+    if bus not in BUS_PINS:
+        return False
+    from boneio.const import HIGH, LOW
+    from boneio.helper.gpio import (
+        configure_pin,
+        read_input,
+        setup_input,
+        setup_output,
+        write_output,
+    )
+
+    def pull_low(pin: str) -> None:
+        setup_output(pin)
+        write_output(pin, LOW)
+        time.sleep(RECOVERY_HALF_PERIOD)
+
+    def release(pin: str) -> None:
+        setup_input(pin, "gpio_pu")
+        time.sleep(RECOVERY_HALF_PERIOD)
+
+    scl, sda = BUS_PINS[bus]
+    configure_pin(scl, "gpio_pu")
+    configure_pin(sda, "gpio_pu")
+    try:
+        release(scl)
+        release(sda)
+        for _ in range(RECOVERY_CLOCKS):
+            if read_input(sda, HIGH):
+                break
+            pull_low(scl)
+            release(scl)
+        # STOP, SDA rises while SCL is high.
+        pull_low(scl)
+        pull_low(sda)
+        release(scl)
+        release(sda)
+        free = read_input(sda, HIGH)
+    finally:
+        configure_pin(scl, "i2c")
+        configure_pin(sda, "i2c")
+    _LOGGER.info(
+        "Recovered I2C bus %s, SDA %s.", bus, "free" if free else "still held low"
+    )
+    return free
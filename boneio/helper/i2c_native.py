@@ -0,0 +1,211 @@
+"""Expander drivers talking to i2c-dev directly through smbus2.
+
+They skip Blinka layers (busio, adafruit_bus_device, register descriptors)
+and every register read is one combined i2c_rdwr transaction (write of
+register pointer, repeated start, read). Attributes used by expander
+readers and writers are the same as in adafruit drivers, so both can be
+used interchangeably.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from smbus2 import SMBus, i2c_msg
+
+from boneio.helper.exceptions import I2CError
+
+# MCP23017 registers, IOCON.BANK = 0.
+MCP23017_IODIRA = 0x00
+MCP23017_GPINTENA = 0x04
+MCP23017_INTCONA = 0x08
+MCP23017_IOCON = 0x0A
+MCP23017_GPPUA = 0x0C
+
+# PCA9685 registers.
+PCA9685_MODE1 = 0x00
+
+_buses: Dict[int, SMBus] = {}
+
+
+def _smbus(bus: int) -> SMBus:
+    """Open i2c-dev of bus once, devices on same bus share it."""
+    if bus not in _buses:
+        try:
+            _buses[bus] = SMBus(bus)
+        except OSError as err:
+            raise I2CError(f"Can't open I2C bus {bus}. {err}") from err
+    return _buses[bus]
+
+
+class NativeI2CDevice:
+    """I2C device on i2c-dev with transaction methods of adafruit I2CDevice."""
+
+    def __init__(self, bus: int, address: int) -> None:
+        """Open bus and check that device responds."""
+        self._bus_number = bus
+        self._bus = _smbus(bus)
+        self._address = address
+        try:
+            self._bus.i2c_rdwr(i2c_msg.read(address, 1))
+        except OSError as err:
+            raise I2CError(
+                f"No I2C device at address {hex(address)} on bus {bus}."
+            ) from err
+
+    def __enter__(self) -> NativeI2CDevice:
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def write(self, buf, *, start: int = 0, end: Optional[int] = None) -> None:
+        """Write buffer in one transaction."""
+        self._bus.i2c_rdwr(i2c_msg.write(self._address, bytes(buf[start:end])))
+
+    def readinto(self, buf, *, start: int = 0, end: Optional[int] = None) -> None:
+        """Fill buffer in one transaction."""
+        end = len(buf) if end is None else end
+        read = i2c_msg.read(self._address, end - start)
+        self._bus.i2c_rdwr(read)
+        buf[start:end] = bytes(read)
+
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        """Write then read with repeated start, one i2c_rdwr call."""
+        in_end = len(in_buffer) if in_end is None else in_end
+        write = i2c_msg.write(self._address, bytes(out_buffer[out_start:out_end]))
+        read = i2c_msg.read(self._address, in_end - in_start)
+        self._bus.i2c_rdwr(write, read)
+        in_buffer[in_start:in_end] = bytes(read)
+
+
+class _NativeRegisterDevice:
+    """Device with 8-bit register pointer."""
+
+    def __init__(self, bus: int, address: int) -> None:
+        self.i2c_device = NativeI2CDevice(bus=bus, address=address)
+        self._reg = bytearray(1)
+        self._buf = bytearray(2)
+
+    def _read_u8(self, register: int) -> int:
+        self._reg[0] = register
+        self.i2c_device.write_then_readinto(self._reg, self._buf, in_end=1)
+        return self._buf[0]
+
+    def _write_u8(self, register: int, value: int) -> None:
+        self.i2c_device.write(bytes((register, value & 0xFF)))
+
+    def _read_u16le(self, register: int) -> int:
+        self._reg[0] = register
+        self.i2c_device.write_then_readinto(self._reg, self._buf)
+        return self._buf[0] | self._buf[1] << 8
+
+    def _write_u16le(self, register: int, value: int) -> None:
+        self.i2c_device.write(bytes((register, value & 0xFF, (value >> 8) & 0xFF)))
+
+
+class NativeMCP23017(_NativeRegisterDevice):
+    """MCP23017 on i2c-dev."""
+
+    def __init__(self, bus: int, address: int, reset: bool = False) -> None:
+        """Initialize MCP23017, reset sets all pins to inputs without pull-up."""
+        super().__init__(bus=bus, address=address)
+        if reset:
+            self.iodir = 0xFFFF
+            self.gppu = 0x0000
+            self.io_control = 0x04
+
+    @property
+    def _device(self) -> NativeI2CDevice:
+        return self.i2c_device
+
+    @property
+    def iodir(self) -> int:
+        return self._read_u16le(MCP23017_IODIRA)
+
+    @iodir.setter
+    def iodir(self, value: int) -> None:
+        self._write_u16le(MCP23017_IODIRA, value)
+
+    @property
+    def gppu(self) -> int:
+        return self._read_u16le(MCP23017_GPPUA)
+
+    @gppu.setter
+    def gppu(self, value: int) -> None:
+        self._write_u16le(MCP23017_GPPUA, value)
+
+    @property
+    def interrupt_enable(self) -> int:
+        return self._read_u16le(MCP23017_GPINTENA)
+
+    @interrupt_enable.setter
+    def interrupt_enable(self, value: int) -> None:
+        self._write_u16le(MCP23017_GPINTENA, value)
+
+    @property
+    def interrupt_configuration(self) -> int:
+        return self._read_u16le(MCP23017_INTCONA)
+
+    @interrupt_configuration.setter
+    def interrupt_configuration(self, value: int) -> None:
+        self._write_u16le(MCP23017_INTCONA, value)
+
+    @property
+    def io_control(self) -> int:
+        return self._read_u8(MCP23017_IOCON)
+
+    @io_control.setter
+    def io_control(self, value: int) -> None:
+        self._write_u8(MCP23017_IOCON, value)
+
+
+class NativePCF8575:
+    """PCF8575 on i2c-dev. It has no registers, port is read and written as
+    two bytes."""
+
+    def __init__(self, bus: int, address: int, reset: bool = False) -> None:
+        """Initialize PCF8575. After power on all pins are high."""
+        self.i2c_device = NativeI2CDevice(bus=bus, address=address)
+        self._buf = bytearray(2)
+        self._port = 0xFFFF
+
+    def read_gpio(self) -> int:
+        """Read levels of all 16 pins."""
+        self.i2c_device.readinto(self._buf)
+        return self._buf[0] | self._buf[1] << 8
+
+    def write_gpio(self, value: int) -> None:
+        """Write all 16 pins."""
+        self._port = value & 0xFFFF
+        self.i2c_device.write(bytes((value & 0xFF, (value >> 8) & 0xFF)))
+
+    def write_pin(self, pin: int, value: bool) -> None:
+        """Write one pin, others keep last written level."""
+        self.write_gpio(self._port | 1 << pin if value else self._port & ~(1 << pin))
+
+
+class NativePCA9685(_NativeRegisterDevice):
+    """PCA9685 on i2c-dev."""
+
+    def __init__(self, bus: int, address: int, reset: bool = False) -> None:
+        """Initialize PCA9685 and wake it up, as adafruit driver does.
+        Channel registers are kept."""
+        super().__init__(bus=bus, address=address)
+        self.mode1_reg = 0x00
+
+    @property
+    def mode1_reg(self) -> int:
+        return self._read_u8(PCA9685_MODE1)
+
+    @mode1_reg.setter
+    def mode1_reg(self, value: int) -> None:
+        self._write_u8(PCA9685_MODE1, value)
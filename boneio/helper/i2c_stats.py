@@ -0,0 +1,158 @@
+"""Transaction statistics of I2C devices."""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Optional
+
+# Upper bounds of latency buckets in microseconds, last bucket is open.
+LATENCY_BUCKETS = (50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000)
+
+
+class I2CStats:
+    """Counters and latency histogram of one I2C device.
+
+    Buckets are allocated once, recording a transaction only increments
+    counters. Values are cumulative since start.
+    """
+
+    __slots__ = (
+        "transactions",
+        "bytes_written",
+        "bytes_read",
+        "errors",
+        "reconnects",
+        "_total_time",
+        "_max_time",
+        "_buckets",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.errors = 0
+        self.reconnects = 0
+        self._total_time = 0.0
+        self._max_time = 0.0
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, duration: float, written: int, read: int) -> None:
+        """Record successful transaction, duration in seconds."""
+        self.transactions += 1
+        self.bytes_written += written
+        self.bytes_read += read
+        self._total_time += duration
+        if duration > self._max_time:
+            self._max_time = duration
+        self._buckets[bisect_left(LATENCY_BUCKETS, duration * 1_000_000)] += 1
+
+    def record_error(self) -> None:
+        """Record failed transaction."""
+        self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of bucket holding q-th part of transactions in ms.
+        None if it is in open bucket or there were no transactions."""
+        if not self.transactions:
+            return None
+        limit = q * self.transactions
+        count = 0
+        for bound, bucket in zip(LATENCY_BUCKETS, self._buckets):
+            count += bucket
+            if count >= limit:
+                return bound / 1000
+        return None
+
+    def summary(self) -> dict:
+        """Summary to publish, latencies in ms."""
+        return {
+            "transactions": self.transactions,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "latency_avg": round(self._total_time / self.transactions * 1000, 3)
+            if self.transactions
+            else None,
+            "latency_p50": self.percentile(0.5),
+            "latency_p99": self.percentile(0.99),
+            "latency_max": round(self._max_time * 1000, 3),
+            "histogram": {
+                **{
+                    f"{bound}us": bucket
+                    for bound, bucket in zip(LATENCY_BUCKETS, self._buckets)
+                },
+                "more": self._buckets[-1],
+            },
+        }
+
+
+def _span(buf, start: int, end: Optional[int]) -> int:
+    return (len(buf) if end is None else end) - start
+
+
+class InstrumentedI2CDevice:
+    """I2C device which records its transactions to stats.
+    Used only when stats are enabled, otherwise device is used directly."""
+
+    def __init__(self, device: Any, stats: I2CStats) -> None:
+        self._device = device
+        self._stats = stats
+
+    def __enter__(self) -> InstrumentedI2CDevice:
+        self._device.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> Any:
+        return self._device.__exit__(*exc)
+
+    def write(self, buf, *, start: int = 0, end: Optional[int] = None) -> None:
+        self._run(
+            self._device.write, _span(buf, start, end), 0, buf, start=start, end=end
+        )
+
+    def readinto(self, buf, *, start: int = 0, end: Optional[int] = None) -> None:
+        self._run(
+            self._device.readinto, 0, _span(buf, start, end), buf, start=start, end=end
+        )
+
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        self._run(
+            self._device.write_then_readinto,
+            _span(out_buffer, out_start, out_end),
+            _span(in_buffer, in_start, in_end),
+            out_buffer,
+            in_buffer,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+
+    def _run(self, fn, written: int, read: int, *args, **kwargs) -> None:
+        start = time.perf_counter()
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            self._stats.record_error()
+            raise
+        self._stats.record(time.perf_counter() - start, written, read)
+
+
+def instrument_driver(driver: Any, stats: I2CStats) -> None:
+    """Route I2C device of adafruit or native expander driver through stats."""
+    for attr in ("i2c_device", "_device"):
+        device = vars(driver).get(attr)
+        if device is not None:
+            setattr(driver, attr, InstrumentedI2CDevice(device=device, stats=stats))
@@ -0,0 +1,144 @@
+"""Worker thread owning one I2C bus."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, List, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value runs first.
+PRIORITY_OUTPUT = 0
+PRIORITY_INPUT = 1
+PRIORITY_POLL = 2
+
+
+class I2CBusWorker(Executor):
+    """Run all transactions of one I2C bus in one thread.
+
+    Jobs are queued by priority, so pending output writes go before input
+    reads and those before sensor polls. Jobs of same priority run in order
+    they came. Running job is never interrupted, so job should be one
+    transaction or short sequence of them.
+
+    Worker is Executor (jobs of poll priority), so it can be passed to
+    loop.run_in_executor. Executor with other priority is given by
+    executor().
+    """
+
+    def __init__(self, name: str = "i2c") -> None:
+        """Start worker thread."""
+        self._name = name
+        self._queue: List[tuple] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._shutdown = False
+        # Time spent in jobs and count of jobs since last take_stats().
+        self._busy = 0.0
+        self._jobs = 0
+        self._stats_since = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._work, name=f"boneio_{name}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def name(self) -> str:
+        """Name of bus."""
+        return self._name
+
+    @property
+    def pending(self) -> int:
+        """Count of queued jobs."""
+        return len(self._queue)
+
+    def take_stats(self) -> Tuple[float, int]:
+        """Return share of time bus was busy (0-1) and count of jobs since
+        last call."""
+        now = time.monotonic()
+        with self._condition:
+            busy, jobs = self._busy, self._jobs
+            self._busy, self._jobs = 0.0, 0
+            since, self._stats_since = self._stats_since, now
+        return (min(busy / (now - since), 1.0) if now > since else 0.0), jobs
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        """Queue job with poll priority."""
+        return self.submit_with_priority(PRIORITY_POLL, fn, *args, **kwargs)
+
+    def submit_with_priority(
+        self, priority: int, fn: Callable, /, *args: Any, **kwargs: Any
+    ) -> Future:
+        """Queue job. Can be called from any thread. Job submitted after
+        shutdown is dropped, its future is cancelled."""
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                _LOGGER.debug("I2C worker %s is shut down, dropping job.", self._name)
+                future.cancel()
+                return future
+            heapq.heappush(
+                self._queue, (priority, next(self._counter), future, fn, args, kwargs)
+            )
+            self._condition.notify()
+        return future
+
+    def executor(self, priority: int) -> Executor:
+        """Executor queueing jobs of this worker with given priority."""
+        return _PriorityExecutor(worker=self, priority=priority)
+
+    async def run(self, fn: Callable, *args: Any, priority: int = PRIORITY_POLL) -> Any:
+        """Run job from loop and wait for its result."""
+        return await asyncio.wrap_future(self.submit_with_priority(priority, fn, *args))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop worker once queued jobs are done."""
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for job in self._queue:
+                    job[2].cancel()
+                self._queue = []
+            self._condition.notify()
+        if wait:
+            self._thread.join()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                _, _, future, fn, args, kwargs = heapq.heappop(self._queue)
+            if not future.set_running_or_notify_cancel():
+                continue
+            start = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            with self._condition:
+                self._busy += time.monotonic() - start
+                self._jobs += 1
+
+
+class _PriorityExecutor(Executor):
+    """Executor view of I2C worker with fixed priority."""
+
+    def __init__(self, worker: I2CBusWorker, priority: int) -> None:
+        self._worker = worker
+        self._priority = priority
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self._worker.submit_with_priority(self._priority, fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Worker is shut down by its owner."""
@@ -0,0 +1,155 @@
+"""Shared scanner for polled GPIO inputs."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict
+
+from boneio.const import LOW, Gpio_States
+from boneio.helper.gpio import BBIOGpioBackend, GpioBackend, gpio_bank
+
+_LOGGER = logging.getLogger(__name__)
+
+# Poll period used for a while after any input changed.
+SCAN_ACTIVE_PERIOD = 0.01
+# How long (in seconds) to keep fast polling after last change.
+SCAN_ACTIVE_WINDOW = 1.0
+# Poll period if nothing is registered with bounce time.
+SCAN_IDLE_PERIOD = 0.05
+
+
+class ScannedPin:
+    """Pin registered in scanner."""
+
+    __slots__ = ("pin", "bit", "callback", "bounce_time", "on_state", "last_change")
+
+    def __init__(
+        self,
+        pin: str,
+        bit: int,
+        callback: Callable[[bool], None],
+        bounce_time: float,
+        on_state: Gpio_States,
+    ) -> None:
+        self.pin = pin
+        self.bit = bit
+        self.callback = callback
+        self.bounce_time = bounce_time
+        self.on_state = on_state
+        self.last_change = 0.0
+
+
+class InputScanner:
+    """Read all polled inputs bank by bank in one task.
+
+    Every cycle each GPIO bank is read into a bitmask (bit set means input is
+    active) and compared with the previously reported one. Only pins which
+    changed are dispatched. After any change scanner polls faster for
+    SCAN_ACTIVE_WINDOW, then falls back to the shortest bounce time of
+    registered pins.
+    """
+
+    def __init__(
+        self,
+        backend: GpioBackend | None = None,
+        active_period: float = SCAN_ACTIVE_PERIOD,
+        active_window: float = SCAN_ACTIVE_WINDOW,
+    ) -> None:
+        """Initialize scanner."""
+        self._backend = backend or BBIOGpioBackend()
+        self._banks: Dict[int, Dict[int, ScannedPin]] = {}
+        self._reported: Dict[int, int] = {}
+        # Per bank: mask of registered pins and mask of pins active on LOW.
+        self._pin_masks: Dict[int, int] = {}
+        self._low_masks: Dict[int, int] = {}
+        self._active_period = active_period
+        self._active_window = active_window
+        self._idle_period = None
+        self._last_activity = 0.0
+        self._task = None
+
+    def register(
+        self,
+        pin: str,
+        callback: Callable[[bool], None],
+        bounce_time: float,
+        on_state: Gpio_States = LOW,
+    ) -> bool:
+        """Register pin. Callback is invoked with new state on every change.
+        Return current state of pin."""
+        bank, bit = gpio_bank(pin)
+        scanned = ScannedPin(
+            pin=pin,
+            bit=bit,
+            callback=callback,
+            bounce_time=bounce_time,
+            on_state=on_state,
+        )
+        self._banks.setdefault(bank, {})[bit] = scanned
+        self._update_masks(bank)
+        if self._idle_period is None or bounce_time < self._idle_period:
+            self._idle_period = bounce_time
+        state = bool(self.read_bank(bank) & (1 << bit))
+        mask = self._reported.get(bank, 0)
+        self._reported[bank] = mask | (1 << bit) if state else mask & ~(1 << bit)
+        _LOGGER.debug("Registered pin %s (bank %s, bit %s) in scanner.", pin, bank, bit)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return state
+
+    def _update_masks(self, bank: int) -> None:
+        pin_mask = 0
+        low_mask = 0
+        for bit, scanned in self._banks[bank].items():
+            pin_mask |= 1 << bit
+            if scanned.on_state == LOW:
+                low_mask |= 1 << bit
+        self._pin_masks[bank] = pin_mask
+        self._low_masks[bank] = low_mask
+
+    def read_bank(self, bank: int) -> int:
+        """Read bitmask of active registered pins of bank in one backend call."""
+        pin_mask = self._pin_masks[bank]
+        return (
+            self._backend.read_bank(bank, pin_mask) ^ self._low_masks[bank]
+        ) & pin_mask
+
+    @property
+    def period(self) -> float:
+        """Current poll period."""
+        idle_period = self._idle_period or SCAN_IDLE_PERIOD
+        if time.monotonic() - self._last_activity < self._active_window:
+            return min(self._active_period, idle_period)
+        return idle_period
+
+    def scan(self) -> None:
+        """Read every bank once and dispatch changed pins."""
+        now = time.monotonic()
+        for bank, pins in self._banks.items():
+            if not pins:
+                continue
+            reported = self._reported.get(bank, 0)
+            changed = self.read_bank(bank) ^ reported
+            if not changed:
+                continue
+            self._last_activity = now
+            for bit, scanned in pins.items():
+                bit_mask = 1 << bit
+                if not changed & bit_mask:
+                    continue
+                if now - scanned.last_change < scanned.bounce_time:
+                    # Keep old state. It will be compared again next cycle.
+                    continue
+                scanned.last_change = now
+                reported ^= bit_mask
+                scanned.callback(bool(reported & bit_mask))
+            self._reported[bank] = reported
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.scan()
+            except Exception as err:
+                _LOGGER.error("Input scanner error. %s", err)
+            await asyncio.sleep(self.period)
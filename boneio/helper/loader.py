@@ -2,16 +2,15 @@ from __future__ import annotations
 import logging
 import time
 from collections import namedtuple
-from typing import TYPE_CHECKING, Any, Callable, Dict, Union
-
-from adafruit_mcp230xx.mcp23017 import MCP23017
-from adafruit_pca9685 import PCA9685
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
 
 from boneio.const import (
     ACTIONS,
     ADDRESS,
     BINARY_SENSOR,
     COVER,
+    COVER_TILT,
     DEVICE_CLASS,
     FILTERS,
     GPIO,
@@ -41,19 +40,25 @@ from boneio.const import (
     PCF,
     PCA,
     PCF_ID,
+    I2C_BUS,
+    DRIVER,
+    BLINKA,
+    NATIVE,
 )
 from boneio.cover import Cover
-from boneio.group import OutputGroup
+from boneio.group import CoverGroup, OutputGroup
 from boneio.helper import (
     GPIOInputException,
     GPIOOutputException,
     I2CError,
     StateManager,
+    configure_pin,
     ha_adc_sensor_availabilty_message,
     ha_binary_sensor_availabilty_message,
     ha_event_availabilty_message,
     ha_sensor_temp_availabilty_message,
     ha_sensor_ina_availabilty_message,
+    ha_pulse_counter_availabilty_message,
 )
 from boneio.helper.onewire import (
     DS2482,
@@ -63,21 +68,36 @@ from boneio.helper.onewire import (
     OneWireAddress,
 )
 from boneio.helper.ha_discovery import ha_cover_availabilty_message
+from boneio.helper.click_engine import ClickEngine
+from boneio.helper.edge_guard import EdgeGuardMonitor
+from boneio.helper.gpio_cdev import CdevEventSource
+from boneio.helper.executor import DEFAULT_I2C_BUS
+from boneio.helper.expander_connection import ExpanderConnection
+from boneio.helper.i2c_bus import recover_bus
+from boneio.helper.input_scanner import InputScanner
 from boneio.helper.timeperiod import TimePeriod
-from boneio.helper.pcf8575 import PCF8575
-from boneio.input import GpioEventButtonOld, GpioEventButtonNew
+from boneio.helper.util import strip_accents
+from boneio.helper.expander_inputs import ExpanderInputs
+from boneio.input import (
+    ExpanderEventButton,
+    GpioEventButtonOld,
+    GpioEventButtonNew,
+    GpioEventButtonCdev,
+)
 from boneio.sensor import (
     DallasSensorDS2482,
+    ExpanderInputBinarySensor,
     GpioInputBinarySensorOld,
     GpioInputBinarySensorNew,
+    GpioInputBinarySensorCdev,
 )
 from boneio.sensor.temp.dallas import DallasSensorW1
 
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
-    from ..manager import Manager
+    from busio import I2C
 
-from busio import I2C
+    from ..manager import Manager
 
 from boneio.relay import GpioRelay, MCPRelay, PWMPCA, PCFRelay
 from boneio.sensor import GpioADCSensor, initialize_adc
@@ -122,7 +142,6 @@ def create_temp_sensor(
     manager: Manager,
     topic_prefix: str,
     sensor_type: str,
-    i2cbusio: I2C,
     config: dict = {},
 ):
     """Create LM sensor in manager."""
@@ -134,11 +153,13 @@ def create_temp_sensor(
         return
     name = config.get(ID)
     id = name.replace(" ", "")
+    i2c_bus = config.get(I2C_BUS, DEFAULT_I2C_BUS)
     try:
         temp_sensor = TempSensor(
             id=id,
             name=name,
-            i2c=i2cbusio,
+            i2c=manager.get_i2c_bus(i2c_bus),
+            i2c_worker=manager.get_i2c_worker(i2c_bus),
             address=config[ADDRESS],
             manager=manager,
             send_message=manager.send_message,
@@ -159,34 +180,93 @@ def create_temp_sensor(
         pass
 
 
-expander_class = {MCP: MCP23017, PCA: PCA9685, PCF: PCF8575}
+def expander_class(exp_type: ExpanderTypes, driver: str = BLINKA) -> type:
+    """Class of expander driver. Drivers are imported on first use, so
+    Blinka stack isn't loaded when only native drivers are used."""
+    if driver == NATIVE:
+        from boneio.helper.i2c_native import (
+            NativeMCP23017,
+            NativePCA9685,
+            NativePCF8575,
+        )
+
+        return {MCP: NativeMCP23017, PCA: NativePCA9685, PCF: NativePCF8575}[
+            exp_type
+        ]
+    if exp_type == MCP:
+        from adafruit_mcp230xx.mcp23017 import MCP23017
+
+        return MCP23017
+    if exp_type == PCA:
+        from adafruit_pca9685 import PCA9685
+
+        return PCA9685
+    from boneio.helper.pcf8575 import PCF8575
+
+    return PCF8575
+
+
+def _create_expander_driver(
+    manager: Manager, exp_type: ExpanderTypes, driver: str, bus: int, address: int
+) -> Any:
+    if driver == NATIVE:
+        return expander_class(exp_type, driver)(bus=bus, address=address, reset=False)
+    return expander_class(exp_type, driver)(
+        i2c=manager.get_i2c_bus(bus), address=address, reset=False
+    )
 
 
 def create_expander(
-    expander_dict: dict, expander_config: list, exp_type: ExpanderTypes, i2cbusio: I2C
+    manager: Manager,
+    expander_dict: dict,
+    expander_config: list,
+    exp_type: ExpanderTypes,
 ) -> dict:
+    """Create connection of every expander. Expander which doesn't respond
+    is kept and reconnected in background, so its outputs come up later."""
     grouped_outputs = {}
     for expander in expander_config:
         id = expander[ID] or expander[ADDRESS]
-        try:
-            expander_dict[id] = expander_class[exp_type](
-                i2c=i2cbusio, address=expander[ADDRESS], reset=False
-            )
-            sleep_time = expander.get(INIT_SLEEP, TimePeriod(seconds=0))
-            if sleep_time.total_seconds > 0:
-                _LOGGER.debug(
-                    f"Sleeping for {sleep_time.total_seconds}s while {exp_type} {id} is initializing."
-                )
-                time.sleep(sleep_time.total_seconds)
-            else:
-                _LOGGER.debug(f"{exp_type} {id} is initializing.")
-            grouped_outputs[id] = {}
-        except TimeoutError as err:
-            _LOGGER.error("Can't connect to %s %s. %s", exp_type, id, err)
-            pass
+        bus = expander.get(I2C_BUS, DEFAULT_I2C_BUS)
+        connection = ExpanderConnection(
+            expander_id=id,
+            factory=partial(
+                _create_expander_driver,
+                manager=manager,
+                exp_type=exp_type,
+                driver=expander.get(DRIVER, BLINKA),
+                bus=bus,
+                address=expander[ADDRESS],
+            ),
+            executor=manager.get_i2c_worker(bus),
+            recover_bus=partial(recover_bus, bus),
+            stats=manager.get_i2c_stats(id),
+        )
+        if connection.connect():
+            _LOGGER.debug(f"{exp_type} {id} is initializing.")
+        else:
+            connection.start_reconnect()
+        expander_dict[id] = connection
+        grouped_outputs[id] = {}
     return grouped_outputs
 
 
+def wait_for_expanders(*expander_configs: list) -> None:
+    """Sleep for longest init sleep of all expanders. Expanders are created
+    before, so they initialize at the same time instead of one by one."""
+    sleep_time = max(
+        (
+            expander.get(INIT_SLEEP, TimePeriod(seconds=0)).total_in_seconds
+            for expander_config in expander_configs
+            for expander in expander_config
+        ),
+        default=0,
+    )
+    if sleep_time > 0:
+        _LOGGER.debug(f"Sleeping for {sleep_time}s while expanders are initializing.")
+        time.sleep(sleep_time)
+
+
 def create_modbus_sensors(manager: Manager, sensors, **kwargs) -> None:
     """Create Modbus sensor for each device."""
     from boneio.sensor.modbus import ModbusSensor
@@ -279,35 +359,42 @@ def configure_relay(
     output = output_chooser(output_kind=config.pop(KIND), config=config)
 
     if getattr(output, "output_kind") == MCP:
-        mcp = manager.mcp.get(getattr(output, "expander_id"))
-        if not mcp:
+        expander_outputs = manager.get_expander_outputs(
+            kind=MCP, expander_id=getattr(output, "expander_id")
+        )
+        if not expander_outputs:
             _LOGGER.error("No such MCP configured!")
             return None
         extra_args = {
             "pin": int(config.pop(PIN)),
-            "mcp": mcp,
+            "expander_outputs": expander_outputs,
             "mcp_id": getattr(output, "expander_id"),
             "output_type": output_type,
         }
     elif getattr(output, "output_kind") == PCA:
-        pca = manager.pca.get(getattr(output, "expander_id"))
-        if not pca:
+        pca_outputs = manager.get_pca_outputs(pca_id=getattr(output, "expander_id"))
+        if not pca_outputs:
             _LOGGER.error("No such PCA configured!")
             return None
         extra_args = {
             "pin": int(config.pop(PIN)),
-            "pca": pca,
+            "pca_outputs": pca_outputs,
+            "fade_engine": manager.get_fade_engine(
+                pca_id=getattr(output, "expander_id")
+            ),
             "pca_id": getattr(output, "expander_id"),
             "output_type": output_type,
         }
     elif getattr(output, "output_kind") == PCF:
-        expander = manager.pcf.get(getattr(output, "expander_id"))
-        if not expander:
+        expander_outputs = manager.get_expander_outputs(
+            kind=PCF, expander_id=getattr(output, "expander_id")
+        )
+        if not expander_outputs:
             _LOGGER.error("No such PCF configured!")
             return None
         extra_args = {
             "pin": int(config.pop(PIN)),
-            "expander": expander,
+            "expander_outputs": expander_outputs,
             "expander_id": getattr(output, "expander_id"),
             "output_type": output_type,
         }
@@ -342,19 +429,43 @@ def configure_relay(
     return relay
 
 
+EVENT_BUTTON_CLASSES = {
+    "new": GpioEventButtonNew,
+    "old": GpioEventButtonOld,
+    "cdev": GpioEventButtonCdev,
+}
+BINARY_SENSOR_CLASSES = {
+    "new": GpioInputBinarySensorNew,
+    "old": GpioInputBinarySensorOld,
+    "cdev": GpioInputBinarySensorCdev,
+}
+
+
 def configure_event_sensor(
     gpio: dict,
     pin: str,
     press_callback: Callable,
     send_ha_autodiscovery: Callable,
-    input: GpioEventButtonOld | GpioEventButtonNew | None = None
-) -> GpioEventButtonOld | GpioEventButtonNew | None:
+    input_scanner: InputScanner,
+    click_engine: ClickEngine,
+    cdev_source: CdevEventSource,
+    edge_guard_monitor: EdgeGuardMonitor,
+    expander_inputs: ExpanderInputs | None = None,
+    expander_pin: int | None = None,
+    input: GpioEventButtonOld
+    | GpioEventButtonNew
+    | GpioEventButtonCdev
+    | ExpanderEventButton
+    | None = None,
+) -> GpioEventButtonOld | GpioEventButtonNew | GpioEventButtonCdev | ExpanderEventButton | None:
     """Configure input sensor or button."""
     try:
         GpioEventButtonClass = (
-            GpioEventButtonNew
-            if gpio.get("detection_type", "new") == "new"
-            else GpioEventButtonOld
+            ExpanderEventButton
+            if expander_inputs
+            else EVENT_BUTTON_CLASSES.get(
+                gpio.get("detection_type", "new"), GpioEventButtonOld
+            )
         )
         name = gpio.pop(ID, pin)
         if input:
@@ -364,6 +475,7 @@ def configure_event_sensor(
                 )
                 return input
             input.set_actions(actions=gpio.get(ACTIONS, {}))
+            input.set_timings(**gpio)
         else:
             input = GpioEventButtonClass(
                 pin=pin,
@@ -372,6 +484,12 @@ def configure_event_sensor(
                 empty_message_after=gpio.pop("clear_message", False),
                 actions=gpio.pop(ACTIONS, {}),
                 press_callback=press_callback,
+                input_scanner=input_scanner,
+                click_engine=click_engine,
+                cdev_source=cdev_source,
+                edge_guard_monitor=edge_guard_monitor,
+                expander_inputs=expander_inputs,
+                expander_pin=expander_pin,
                 **gpio,
             )
         if gpio.get(SHOW_HA, True):
@@ -381,6 +499,7 @@ def configure_event_sensor(
                 ha_type=EVENT_ENTITY,
                 device_class=gpio.get(DEVICE_CLASS, None),
                 availability_msg_func=ha_event_availabilty_message,
+                event_types=input.event_types,
             )
         return input
     except GPIOInputException as err:
@@ -393,14 +512,31 @@ def configure_binary_sensor(
     pin: str,
     press_callback: Callable,
     send_ha_autodiscovery: Callable,
-    input: GpioInputBinarySensorOld | GpioInputBinarySensorNew | None = None,
-) -> GpioInputBinarySensorOld | GpioInputBinarySensorNew | None:
+    input_scanner: InputScanner,
+    cdev_source: CdevEventSource,
+    edge_guard_monitor: EdgeGuardMonitor,
+    expander_inputs: ExpanderInputs | None = None,
+    expander_pin: int | None = None,
+    input: GpioInputBinarySensorOld
+    | GpioInputBinarySensorNew
+    | GpioInputBinarySensorCdev
+    | ExpanderInputBinarySensor
+    | None = None,
+) -> (
+    GpioInputBinarySensorOld
+    | GpioInputBinarySensorNew
+    | GpioInputBinarySensorCdev
+    | ExpanderInputBinarySensor
+    | None
+):
     """Configure input sensor or button."""
     try:
         GpioInputBinarySensorClass = (
-            GpioInputBinarySensorNew
-            if gpio.get("detection_type", "new") == "new"
-            else GpioInputBinarySensorOld
+            ExpanderInputBinarySensor
+            if expander_inputs
+            else BINARY_SENSOR_CLASSES.get(
+                gpio.get("detection_type", "new"), GpioInputBinarySensorOld
+            )
         )
         name = gpio.pop(ID, pin)
         if input:
@@ -418,6 +554,11 @@ def configure_binary_sensor(
                 input_type=INPUT_SENSOR,
                 empty_message_after=gpio.pop("clear_message", False),
                 press_callback=press_callback,
+                input_scanner=input_scanner,
+                cdev_source=cdev_source,
+                edge_guard_monitor=edge_guard_monitor,
+                expander_inputs=expander_inputs,
+                expander_pin=expander_pin,
                 **gpio,
             )
         if gpio.get(SHOW_HA, True):
@@ -445,20 +586,30 @@ def configure_cover(
     restored_state = state_manager.get(
         attr_type=COVER, attr=cover_id, default_value=100
     )
+    restored_tilt = state_manager.get(
+        attr_type=COVER_TILT, attr=cover_id, default_value=100
+    )
 
-    def state_save(position: int):
+    def state_save(position: int, tilt: int | None = None):
         if config[RESTORE_STATE]:
             state_manager.save_attribute(
                 attr_type=COVER,
                 attribute=cover_id,
                 value=position,
             )
+            if tilt is not None:
+                state_manager.save_attribute(
+                    attr_type=COVER_TILT,
+                    attribute=cover_id,
+                    value=tilt,
+                )
 
     cover = Cover(
         id=cover_id,
         state_save=state_save,
         send_message=manager.send_message,
         restored_state=restored_state,
+        restored_tilt=restored_tilt,
         **kwargs,
     )
     if config.get(SHOW_HA, True):
@@ -467,12 +618,40 @@ def configure_cover(
             name=cover.name,
             ha_type=COVER,
             device_class=config.get(DEVICE_CLASS),
+            tilt=cover.has_tilt,
             availability_msg_func=ha_cover_availabilty_message,
         )
     _LOGGER.debug("Configured cover %s", cover_id)
     return cover
 
 
+def configure_cover_group(
+    manager: Manager,
+    group_id: str,
+    members: List[Cover],
+    send_ha_autodiscovery: Callable,
+    config: dict,
+    topic_prefix: str,
+) -> CoverGroup:
+    cover_group = CoverGroup(
+        id=group_id,
+        members=members,
+        send_message=manager.send_message,
+        topic_prefix=topic_prefix,
+    )
+    if config.get(SHOW_HA, True):
+        send_ha_autodiscovery(
+            id=cover_group.id,
+            name=cover_group.name,
+            ha_type=COVER,
+            device_class=config.get(DEVICE_CLASS),
+            tilt=cover_group.has_tilt,
+            availability_msg_func=ha_cover_availabilty_message,
+        )
+    _LOGGER.debug("Configured cover group %s", group_id)
+    return cover_group
+
+
 def configure_ds2482(i2cbusio: I2C, address: str = DS2482_ADDRESS) -> OneWireBus:
     ds2482 = DS2482(i2c=i2cbusio, address=address)
     ow_bus = OneWireBus(ds2482=ds2482)
@@ -546,6 +725,8 @@ def create_ina219_sensor(
             id=id,
             address=address,
             sensors=config.get("sensors", []),
+            i2c_bus=config.get(I2C_BUS, DEFAULT_I2C_BUS),
+            i2c_worker=manager.get_i2c_worker(config.get(I2C_BUS, DEFAULT_I2C_BUS)),
             manager=manager,
             send_message=manager.send_message,
             topic_prefix=topic_prefix,
@@ -564,3 +745,78 @@ def create_ina219_sensor(
     except I2CError as err:
         _LOGGER.error("Can't configure Temp sensor. %s", err)
         pass
+
+
+RATE_DEVICE_CLASSES = {
+    "energy": "power",
+    "water": "volume_flow_rate",
+    "gas": "volume_flow_rate",
+}
+
+
+def create_pulse_counter(
+    manager: Manager,
+    topic_prefix: str,
+    state_manager: StateManager,
+    cdev_source: CdevEventSource,
+    config: dict = {},
+):
+    """Create pulse counter in manager."""
+    from boneio.sensor import GpioPulseSource, PulseCounter
+
+    pin = config[PIN]
+    name = config.get(ID, pin)
+    id = strip_accents(name.replace(" ", ""))
+    gpio_mode = config.get("gpio_mode", GPIO)
+    try:
+        if config.get("detection_type", "cdev") == "cdev":
+            configure_pin(pin=pin, mode=gpio_mode)
+            bounce_time = config.get("bounce_time")
+            source = cdev_source.add_counter(
+                pin=pin,
+                bias=gpio_mode,
+                debounce=bounce_time.total_in_seconds if bounce_time else 0,
+            )
+        else:
+            source = GpioPulseSource(pin=pin, gpio_mode=gpio_mode)
+    except GPIOInputException as err:
+        _LOGGER.error("Can't configure pulse counter on pin %s. %s", pin, err)
+        return None
+    pulse_counter = PulseCounter(
+        id=id,
+        name=name,
+        source=source,
+        state_manager=state_manager,
+        pulses_per_unit=config.get("pulses_per_unit", 1000),
+        rate_time_unit=config.get("rate_time_unit", "h"),
+        rate_multiplier=config.get("rate_multiplier", 1),
+        manager=manager,
+        send_message=manager.send_message,
+        topic_prefix=topic_prefix,
+        update_interval=config.get(UPDATE_INTERVAL, TimePeriod(seconds=60)),
+    )
+    if config.get(SHOW_HA, True):
+        device_class = config.get(DEVICE_CLASS, "energy")
+        manager.send_ha_autodiscovery(
+            id=f"{id}_total",
+            name=name,
+            ha_type=SENSOR,
+            availability_msg_func=ha_pulse_counter_availabilty_message,
+            state_id=pulse_counter.id,
+            value_key="total",
+            device_class=device_class,
+            state_class="total_increasing",
+            unit_of_measurement=config.get("unit_of_measurement", "kWh"),
+        )
+        manager.send_ha_autodiscovery(
+            id=f"{id}_rate",
+            name=f"{name} rate",
+            ha_type=SENSOR,
+            availability_msg_func=ha_pulse_counter_availabilty_message,
+            state_id=pulse_counter.id,
+            value_key="rate",
+            device_class=RATE_DEVICE_CLASSES.get(device_class),
+            state_class="measurement",
+            unit_of_measurement=config.get("rate_unit_of_measurement", "kW"),
+        )
+    return pulse_counter
@@ -0,0 +1,289 @@
+"""PCA9685 channels written through shadow of duty cycles."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+from boneio.helper.expander_connection import ExpanderConnection
+
+_LOGGER = logging.getLogger(__name__)
+
+# PCA9685 registers.
+PCA9685_MODE1 = 0x00
+PCA9685_MODE1_RESTART = 0x80
+PCA9685_MODE1_AI = 0x20
+PCA9685_MODE1_SLEEP = 0x10
+PCA9685_LED0_ON_L = 0x06
+PCA9685_CHANNELS = 16
+# Bit 4 of ON_H or OFF_H switches channel fully on or off.
+PCA9685_FULL = 0x1000
+
+# How often shadow is compared with PCA.
+PCA_VERIFY_PERIOD = 60.0
+# Delay of revalidation after failed write.
+PCA_ERROR_RETRY = 1.0
+
+
+def duty_to_regs(value: int) -> Tuple[int, int]:
+    """Convert 16-bit duty cycle to ON and OFF registers of channel."""
+    if value >= 0xFFFF:
+        return PCA9685_FULL, 0
+    if value < 0x0010:
+        return 0, PCA9685_FULL
+    return 0, value >> 4
+
+
+def regs_to_duty(on: int, off: int) -> int:
+    """Convert ON and OFF registers of channel to 16-bit duty cycle.
+    Full off wins over full on, as in PCA9685."""
+    if off & PCA9685_FULL:
+        return 0
+    if on & PCA9685_FULL:
+        return 0xFFFF
+    return (off & 0x0FFF) << 4
+
+
+class PCA9685Writer:
+    """Read and write PCA9685 channels with auto-increment transactions."""
+
+    def __init__(self, pca) -> None:
+        """Initialize writer of PCA9685 driver, adafruit or native."""
+        self._pca = pca
+        self._buf = bytearray(4 * PCA9685_CHANNELS)
+        self._state_buf = bytearray(PCA9685_LED0_ON_L + 4 * PCA9685_CHANNELS)
+
+    def setup(self) -> None:
+        """Wake PCA up and enable register auto-increment, so many channels go
+        in one transaction."""
+        mode1 = self._pca.mode1_reg
+        if mode1 & PCA9685_MODE1_SLEEP or not mode1 & PCA9685_MODE1_AI:
+            self._pca.mode1_reg = (
+                mode1 & ~(PCA9685_MODE1_RESTART | PCA9685_MODE1_SLEEP)
+            ) | PCA9685_MODE1_AI
+
+    def read_channels(self) -> List[int]:
+        """Read duty cycles of all 16 channels in one transaction."""
+        buf = self._buf
+        with self._pca.i2c_device as i2c:
+            i2c.write_then_readinto(bytes([PCA9685_LED0_ON_L]), buf)
+        return self._to_duty(buf)
+
+    def read_state(self) -> Tuple[List[int], bool]:
+        """Read MODE1 and all channels in one transaction. Return (duty
+        cycles, True if PCA was reset and has to be set up again)."""
+        buf = self._state_buf
+        with self._pca.i2c_device as i2c:
+            i2c.write_then_readinto(bytes([PCA9685_MODE1]), buf)
+        mode1 = buf[PCA9685_MODE1]
+        reset = bool(mode1 & PCA9685_MODE1_SLEEP or not mode1 & PCA9685_MODE1_AI)
+        return self._to_duty(memoryview(buf)[PCA9685_LED0_ON_L:]), reset
+
+    @staticmethod
+    def _to_duty(buf) -> List[int]:
+        return [
+            regs_to_duty(on=buf[i] | buf[i + 1] << 8, off=buf[i + 2] | buf[i + 3] << 8)
+            for i in range(0, len(buf), 4)
+        ]
+
+    def write_channels(self, first: int, values: List[int]) -> None:
+        """Write duty cycles of consecutive channels starting at first
+        in one transaction."""
+        buf = bytearray(1 + 4 * len(values))
+        buf[0] = PCA9685_LED0_ON_L + 4 * first
+        for i, value in enumerate(values):
+            on, off = duty_to_regs(value)
+            buf[1 + 4 * i : 5 + 4 * i] = bytes(
+                (on & 0xFF, on >> 8, off & 0xFF, off >> 8)
+            )
+        with self._pca.i2c_device as i2c:
+            i2c.write(buf)
+
+
+class PCAOutputs:
+    """Shadow copy of duty cycles of one PCA9685.
+
+    Channel changes only update shadow and schedule flush. All channels
+    changed until flush runs in I2C pool are written with one auto-increment
+    block write. Brightness is read from shadow, never from PCA. Shadow is
+    compared with PCA every verify period and shortly after failed write.
+    PCA found reset (asleep or without auto-increment) is set up again and
+    all its channels are rewritten.
+
+    With connection, results of transactions are reported to it. Nothing is
+    written while PCA is failed, restore() writes shadow back once it
+    reconnects.
+    """
+
+    def __init__(
+        self,
+        pca_id: str,
+        writer: PCA9685Writer,
+        executor: Executor,
+        verify_period: float = PCA_VERIFY_PERIOD,
+        connection: Optional[ExpanderConnection] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Initialize PCA outputs, shadow starts from PCA registers."""
+        self._id = pca_id
+        self._writer = writer
+        self._executor = executor
+        self._verify_period = verify_period
+        self._connection = connection
+        self._loop = loop or asyncio.get_event_loop()
+        self._lock = threading.Lock()
+        try:
+            writer.setup()
+            self._duty = writer.read_channels()
+        except Exception as err:
+            if connection is None:
+                raise
+            # Channels are written once PCA is reconnected.
+            _LOGGER.error("Can't read channels of PCA %s. %s", pca_id, err)
+            self._duty = [0] * PCA9685_CHANNELS
+        self._channel_mask = 0
+        self._dirty = 0
+        self._flush_scheduled = False
+        self._task = None
+
+    @property
+    def id(self) -> str:
+        """Id of PCA."""
+        return self._id
+
+    def setup_channel(self, channel: int) -> None:
+        """Register channel, so it is verified."""
+        self._channel_mask |= 1 << channel
+        if self._task is None and self._verify_period:
+            self._task = self._loop.create_task(self._run_verify())
+
+    def duty_cycle(self, channel: int) -> int:
+        """Duty cycle of channel from shadow."""
+        return self._duty[channel]
+
+    def set_duty_cycle(self, channel: int, value: int) -> None:
+        """Set channel in shadow and schedule flush. Can be called from any thread."""
+        self.set_duty_cycles({channel: value})
+
+    def set_duty_cycles(self, values: Dict[int, int]) -> None:
+        """Set many channels in shadow, they are written in one transaction.
+        Can be called from any thread."""
+        with self._lock:
+            for channel, value in values.items():
+                # Keep what PCA really outputs, 12-bit resolution.
+                value = regs_to_duty(*duty_to_regs(value))
+                if value == self._duty[channel]:
+                    continue
+                self._duty[channel] = value
+                self._dirty |= 1 << channel
+            if not self._dirty or self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        self._loop.run_in_executor(self._executor, self.flush)
+
+    def flush(self) -> None:
+        """Write dirty channels to PCA. Runs in I2C pool.
+
+        Channels between first and last dirty one are written too, one
+        block write is cheaper than several transactions.
+        """
+        with self._lock:
+            self._flush_scheduled = False
+            dirty = self._dirty
+            self._dirty = 0
+            if not dirty:
+                return
+            first = (dirty & -dirty).bit_length() - 1
+            last = dirty.bit_length() - 1
+            values = self._duty[first : last + 1]
+        if not self._online:
+            with self._lock:
+                self._dirty |= dirty
+            return
+        try:
+            self._writer.write_channels(first=first, values=values)
+        except Exception as err:
+            _LOGGER.error("Can't write channels of PCA %s. %s", self._id, err)
+            with self._lock:
+                self._dirty |= dirty
+            self._report(err)
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, PCA_ERROR_RETRY, self._schedule_verify
+            )
+        else:
+            self._report()
+
+    def verify(self) -> bool:
+        """Compare PCA channels with shadow and rewrite them on mismatch.
+        Runs in I2C pool. Return True if channels were correct."""
+        if not self._online:
+            return False
+        try:
+            duty, reset = self._writer.read_state()
+            if reset:
+                _LOGGER.warning("PCA %s was reset. Setting it up again.", self._id)
+                self._writer.setup()
+        except Exception as err:
+            _LOGGER.error("Can't verify channels of PCA %s. %s", self._id, err)
+            self._report(err)
+            return False
+        self._report()
+        with self._lock:
+            diff = 0
+            for channel in range(PCA9685_CHANNELS):
+                if reset or duty[channel] != self._duty[channel]:
+                    diff |= 1 << channel
+            # Dirty channels are going to be written anyway.
+            diff &= self._channel_mask & ~self._dirty
+            if not diff and (not self._dirty or self._flush_scheduled):
+                return True
+            self._dirty |= diff
+        if diff:
+            _LOGGER.warning(
+                "Channels of PCA %s differ from expected state (mask %s). Rewriting.",
+                self._id,
+                hex(diff),
+            )
+        # Also retries write which failed before.
+        self.flush()
+        return not diff
+
+    def restore(self) -> None:
+        """Set PCA up and write all channels again, eg. after reconnect."""
+        self._loop.run_in_executor(self._executor, self._restore)
+
+    def _restore(self) -> None:
+        try:
+            self._writer.setup()
+        except Exception as err:
+            _LOGGER.error("Can't set up PCA %s. %s", self._id, err)
+            self._report(err)
+            return
+        with self._lock:
+            self._dirty |= self._channel_mask
+        self.flush()
+
+    @property
+    def _online(self) -> bool:
+        return self._connection is None or self._connection.online
+
+    def _report(self, err: Optional[Exception] = None) -> None:
+        if self._connection is None:
+            return
+        if err:
+            self._connection.report_error(err)
+        else:
+            self._connection.report_ok()
+
+    def _schedule_verify(self) -> None:
+        self._loop.run_in_executor(self._executor, self.verify)
+
+    async def _run_verify(self) -> None:
+        while True:
+            await asyncio.sleep(self._verify_period)
+            await self._loop.run_in_executor(self._executor, self.verify)
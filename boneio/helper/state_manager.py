@@ -4,7 +4,8 @@ import asyncio
 import logging
 import json
 from typing import Any
-from concurrent.futures import ThreadPoolExecutor
+
+from boneio.helper.executor import ExecutorService
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ _LOGGER = logging.getLogger(__name__)
 class StateManager:
     """StateManager to load and save states to file."""
 
-    def __init__(self, state_file: str) -> None:
+    def __init__(self, state_file: str, executor_service: ExecutorService) -> None:
         """Initialize disk StateManager."""
         self._loop = asyncio.get_event_loop()
         self._lock = asyncio.Lock()
@@ -21,7 +22,7 @@ class StateManager:
         _LOGGER.info("Loaded state file from %s", self._file)
         self._file_uptodate = False
         self._save_attributes_callback = None
-        self.executor = ThreadPoolExecutor()
+        self._executor_service = executor_service
 
     def load_states(self) -> dict:
         """Load state file."""
@@ -71,4 +72,4 @@ class StateManager:
             # Let's not save state if something happens same time.
             return
         async with self._lock:
-            self._loop.run_in_executor(None, self._save_state)
+            self._loop.run_in_executor(self._executor_service.disk, self._save_state)
@@ -0,0 +1,135 @@
+"""Shared timer service with monotonic deadlines."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Callable, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TimerEntry:
+    """Scheduled call. Periodic if interval is set."""
+
+    __slots__ = ("when", "callback", "args", "interval", "cancelled")
+
+    def __init__(
+        self,
+        when: float,
+        callback: Callable,
+        args: tuple,
+        interval: Optional[float] = None,
+    ) -> None:
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancel entry. It is dropped from heap when its time comes."""
+        self.cancelled = True
+
+
+class TimerService:
+    """Multiplex all deadlines of boneIO on one loop timer.
+
+    Time is taken from monotonic clock, so every deadline can be given as
+    exact point in time (eg. edge timestamp + long press time). Without loop
+    service can be driven manually by run_due(), which is how engines using it
+    can be replayed and tested with fake time.
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize timer service."""
+        self._loop = loop
+        self._clock = clock
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_when: Optional[float] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Loop driving service, None if driven manually."""
+        return self._loop
+
+    def now(self) -> float:
+        """Current monotonic time in seconds."""
+        return self._clock()
+
+    def call_at(self, when: float, callback: Callable, *args: Any) -> TimerEntry:
+        """Call callback at monotonic time when."""
+        entry = TimerEntry(when=when, callback=callback, args=args)
+        self._push(entry)
+        return entry
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> TimerEntry:
+        """Call callback after delay in seconds."""
+        return self.call_at(self.now() + delay, callback, *args)
+
+    def call_every(self, interval: float, callback: Callable, *args: Any) -> TimerEntry:
+        """Call callback every interval seconds until cancelled. Frames don't drift."""
+        entry = TimerEntry(
+            when=self.now() + interval, callback=callback, args=args, interval=interval
+        )
+        self._push(entry)
+        return entry
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """Nearest pending deadline."""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Run every entry due at now. Return number of calls."""
+        now = self.now() if now is None else now
+        calls = 0
+        while self._heap and self._heap[0][0] <= now:
+            when, _, entry = heapq.heappop(self._heap)
+            if entry.cancelled:
+                continue
+            if entry.interval:
+                entry.when = when + entry.interval
+                if entry.when <= now:
+                    # We are late, skip missed frames.
+                    entry.when = now + entry.interval
+                heapq.heappush(self._heap, (entry.when, next(self._counter), entry))
+            try:
+                entry.callback(*entry.args)
+            except Exception as err:
+                _LOGGER.error("Error in timer callback %s. %s", entry.callback, err)
+            calls += 1
+        return calls
+
+    def _push(self, entry: TimerEntry) -> None:
+        heapq.heappush(self._heap, (entry.when, next(self._counter), entry))
+        if self._loop is not None and (
+            self._handle_when is None or entry.when < self._handle_when
+        ):
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._handle_when = self.next_deadline
+        if self._handle_when is not None:
+            self._handle = self._loop.call_later(
+                max(self._handle_when - self.now(), 0), self._fire
+            )
+
+    def _fire(self) -> None:
+        self._handle = None
+        self._handle_when = None
+        self.run_due()
+        self._schedule()
@@ -2,6 +2,13 @@
 
 from boneio.input.gpio import GpioEventButton as GpioEventButtonOld
 from boneio.input.gpio_new import GpioEventButtonNew
+from boneio.input.gpio_cdev import GpioEventButtonCdev
+from boneio.input.expander import ExpanderEventButton
 
 
-__all__ = ["GpioEventButtonOld", "GpioEventButtonNew"]
+__all__ = [
+    "GpioEventButtonOld",
+    "GpioEventButtonNew",
+    "GpioEventButtonCdev",
+    "ExpanderEventButton",
+]
@@ -0,0 +1,72 @@
+"""ExpanderEventButton to receive signals from MCP23017/PCF8575 pins."""
+from __future__ import annotations
+
+import logging
+
+from boneio.helper import GpioBaseClass
+from boneio.helper.click_engine import (
+    POLLED_DOUBLE_CLICK_DURATION_MS,
+    ClickEngine,
+    ClickInput,
+)
+from boneio.helper.expander_inputs import ExpanderInputs
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExpanderEventButton(ClickInput, GpioBaseClass):
+    """Represent input switch on expander pin."""
+
+    double_click_duration_ms = POLLED_DOUBLE_CLICK_DURATION_MS
+
+    def __init__(
+        self,
+        click_engine: ClickEngine,
+        expander_inputs: ExpanderInputs,
+        expander_pin: int,
+        **kwargs,
+    ) -> None:
+        """Setup expander Input Button"""
+        super().__init__(**kwargs)
+        self._click_engine = click_engine
+        self._expander_inputs = expander_inputs
+        self._expander_pin = expander_pin
+        self._add_click_input(kwargs)
+        # Pin is inactive until expander is read.
+        self._state = False
+        expander_inputs.register(
+            pin=expander_pin,
+            callback=self.check_state,
+            on_ready=self._set_initial_state,
+            bounce_time=self._bounce_time,
+        )
+        _LOGGER.debug(
+            "Configured input pin %s of expander %s", expander_pin, expander_inputs.id
+        )
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        """Expander pin is set up when registered."""
+
+    def _set_initial_state(self, state: bool) -> None:
+        """State read when pin was set up, nothing is sent for it."""
+        self._state = state
+
+    @property
+    def is_pressed(self) -> bool:
+        """Is button pressed."""
+        return self._expander_inputs.is_active(self._expander_pin)
+
+    def check_state(self, state: bool) -> None:
+        if not self._edge_allowed(self._click_engine.now()):
+            return
+        self.update_state(state)
+
+    def resync(self) -> None:
+        """Update state from last read expander value."""
+        self.update_state(self.is_pressed)
+
+    def update_state(self, state: bool) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        self._click_engine.feed(self._pin, state, self._click_engine.now())
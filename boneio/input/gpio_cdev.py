@@ -0,0 +1,69 @@
+"""GpioEventButtonCdev to receive signals from GPIO character device."""
+from __future__ import annotations
+
+import logging
+
+from boneio.helper import GpioBaseClass
+from boneio.helper.click_engine import ClickEngine, ClickInput
+from boneio.helper.gpio import configure_pin
+from boneio.helper.gpio_cdev import CdevEventSource, LineEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GpioEventButtonCdev(ClickInput, GpioBaseClass):
+    """Represent Gpio input switch with kernel timestamped edges."""
+
+    def __init__(
+        self, click_engine: ClickEngine, cdev_source: CdevEventSource, **kwargs
+    ) -> None:
+        """Setup GPIO Input Button"""
+        self._gpio_mode = None
+        super().__init__(**kwargs)
+        self._click_engine = click_engine
+        self._cdev_source = cdev_source
+        line = cdev_source.add_pin(
+            pin=self._pin,
+            callback=self.check_state,
+            bias=self._gpio_mode,
+            debounce=self._bounce_time,
+        )
+        # Kernel already debounced edges if it supports it.
+        self.click_debounce = not line.kernel_debounce
+        self._add_click_input(kwargs)
+        self._state = self.is_pressed
+        _LOGGER.debug(
+            "Configured cdev listening for input pin %s, kernel debounce %s",
+            self._pin,
+            line.kernel_debounce,
+        )
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        """Only set pinmux, line itself is requested from character device."""
+        self._gpio_mode = gpio_mode
+        configure_pin(pin=self._pin, mode=gpio_mode)
+
+    @property
+    def is_pressed(self) -> bool:
+        """Is button pressed."""
+        return self._cdev_source.value(self._pin)
+
+    def check_state(self, event: LineEvent) -> None:
+        if not self._edge_allowed(event.timestamp):
+            return
+        self._state = event.rising
+        self._click_engine.feed(self._pin, event.rising, event.timestamp)
+
+    def resync(self) -> None:
+        """Update state from current line value."""
+        state = self.is_pressed
+        if state == self._state:
+            return
+        self._state = state
+        self._click_engine.feed(self._pin, state, self._click_engine.now())
+
+    def _suspend_edges(self) -> None:
+        self._cdev_source.pause(self._pin)
+
+    def _resume_edges(self) -> None:
+        self._cdev_source.resume(self._pin)
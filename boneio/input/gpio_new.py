@@ -2,73 +2,41 @@
 from __future__ import annotations
 import time
 import logging
-from boneio.const import DOUBLE, LONG, SINGLE, BOTH
-from boneio.helper import GpioBaseClass, ClickTimer
+from boneio.const import BOTH
+from boneio.helper import GpioBaseClass
+from boneio.helper.click_engine import ClickEngine, ClickInput
 from boneio.helper.gpio import edge_detect
-from boneio.helper.timeperiod import TimePeriod
 _LOGGER = logging.getLogger(__name__)
 
-# TIMINGS FOR BUTTONS
-DOUBLE_CLICK_DURATION_MS = 180
-LONG_PRESS_DURATION_MS = 600
 
-
-class GpioEventButtonNew(GpioBaseClass):
+class GpioEventButtonNew(ClickInput, GpioBaseClass):
     """Represent Gpio input switch."""
 
-    def __init__(self, **kwargs) -> None:
+    click_debounce = True
+
+    def __init__(self, click_engine: ClickEngine, **kwargs) -> None:
         """Setup GPIO Input Button"""
         super().__init__(**kwargs)
         self._state = self.is_pressed
-        self.button_pressed_time = 0.0
-        self.last_click_time = 0.0
-        self._double_test = None
-        self._long_test = None
-
-        self._timer_double = ClickTimer(
-            delay=TimePeriod(milliseconds=DOUBLE_CLICK_DURATION_MS),
-            action=lambda x: self.single_click_callback(),
-        )
-        self._timer_long = ClickTimer(
-            delay=TimePeriod(milliseconds=LONG_PRESS_DURATION_MS),
-            action=lambda x: self.long_click_callback(x),
-        )
-        self._double_click_ran = False
-        self._long_press_ran = False
+        self._click_engine = click_engine
+        self._add_click_input(kwargs)
         edge_detect(pin=self._pin, callback=self.check_state, bounce=0, edge=BOTH)
         _LOGGER.debug("Configured NEW listening for input pin %s", self._pin)
 
-    def single_click_callback(self):
-        """This is invoked by double timer if time is up for double timer."""
-        if not self._state and not self._timer_long.is_waiting():
-            self.press_callback(click_type=SINGLE, duration=None)
-
-    def double_click_callback(self):
-        """This is double click callback."""
-        self.press_callback(click_type=DOUBLE, duration=None)
-
-    def long_click_callback(self, duration: float):
-        """This is long click callback."""
-        self.press_callback(click_type=LONG, duration=duration)
-
     def check_state(self, _) -> None:
-        time_now = time.time()
+        """Invoked from Adafruit_BBIO thread. Timestamp edge and pass it to loop."""
+        timestamp = time.monotonic()
+        if not self._edge_allowed(timestamp):
+            return
         self._state = self.is_pressed
-        if self._state:
-            if time_now - self.button_pressed_time >= self._bounce_time:
-                self.button_pressed_time = time_now
-                self._timer_long.start_timer()
-                if self._timer_double.is_waiting():
-                    self._timer_double.reset()
-                    self._double_click_ran = True
-                    self.double_click_callback()
-                    return
-                self._timer_double.start_timer()
-
-        else:
-            if not self._timer_double.is_waiting() and not self._double_click_ran:
-                if self._timer_long.is_waiting():
-                    self.press_callback(click_type=SINGLE, duration=None)
-            self._timer_long.reset()
-            self._double_click_ran = False
+        self._loop.call_soon_threadsafe(
+            self._click_engine.feed, self._pin, self._state, timestamp
+        )
 
+    def resync(self) -> None:
+        """Update state from current pin value."""
+        state = self.is_pressed
+        if state == self._state:
+            return
+        self._state = state
+        self._click_engine.feed(self._pin, state, self._click_engine.now())
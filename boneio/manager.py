@@ -1,13 +1,16 @@
 from __future__ import annotations
 import asyncio
+import json
 import logging
 from collections import deque
+from concurrent.futures import wait
 import datetime
-from typing import Callable, Coroutine, List, Optional, Set, Union, Awaitable
-from board import SCL, SDA
-from busio import I2C
-from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Coroutine, Dict, List, Optional, Set, Union, Awaitable
 
+if TYPE_CHECKING:
+    from busio import I2C
+
+    from boneio.group import CoverGroup
 
 from boneio.const import (
     ACTION,
@@ -18,9 +21,11 @@ from boneio.const import (
     COVER,
     DALLAS,
     EVENT_ENTITY,
+    GPIO,
     ID,
     INA219,
     INPUT,
+    KIND,
     LM75,
     MCP_TEMP_9808,
     MODBUS,
@@ -32,6 +37,7 @@ from boneio.const import (
     OUTPUT,
     PIN,
     RELAY,
+    SENSOR,
     STATE,
     STOP,
     TOPIC,
@@ -42,12 +48,27 @@ from boneio.const import (
     relay_actions,
     cover_actions,
     DS2482,
+    EDGE_GUARD,
     LIGHT,
     LED,
     SET_BRIGHTNESS,
+    BRIGHTNESS,
+    TRANSITION,
+    DIM,
+    HOLD,
+    ON,
+    OFF,
     MCP,
+    MCP_ID,
     PCA,
     PCF,
+    PCF_ID,
+    I2C_DEVICE_STATE,
+    I2C_STATE,
+    I2C_BUS,
+    VERIFY_INTERVAL,
+    ENABLED,
+    UPDATE_INTERVAL,
 )
 from boneio.helper import (
     GPIOInputException,
@@ -55,6 +76,9 @@ from boneio.helper import (
     I2CError,
     StateManager,
     ha_button_availabilty_message,
+    ha_edge_guard_availabilty_message,
+    ha_i2c_bus_availabilty_message,
+    ha_i2c_device_availabilty_message,
     ha_light_availabilty_message,
     ha_switch_availabilty_message,
     ha_led_availabilty_message,
@@ -63,8 +87,35 @@ from boneio.helper.util import strip_accents
 from boneio.helper.config import ConfigHelper
 from boneio.helper.events import EventBus
 from boneio.helper.exceptions import ModbusUartException
+from boneio.helper.executor import MQTT_POOL, ExecutorService
+from boneio.helper.gpio import create_gpio_backend
+from boneio.helper.click_engine import ClickEngine
+from boneio.helper.edge_guard import EdgeGuard, EdgeGuardMonitor
+from boneio.helper.expander_inputs import (
+    ExpanderInputs,
+    MCP23017InputReader,
+    PCF8575InputReader,
+)
+from boneio.helper.expander_outputs import (
+    EXPANDER_VERIFY_PERIOD,
+    ExpanderOutputs,
+    MCP23017OutputWriter,
+    PCF8575OutputWriter,
+)
+from boneio.helper.gpio_cdev import CdevEventSource
+from boneio.helper.executor import DEFAULT_I2C_BUS
+from boneio.helper.i2c_bus import open_i2c_bus
+from boneio.helper.i2c_stats import I2CStats
+from boneio.helper.i2c_worker import PRIORITY_INPUT, PRIORITY_OUTPUT, I2CBusWorker
+from boneio.helper.pca_outputs import PCA_VERIFY_PERIOD, PCA9685Writer, PCAOutputs
+from boneio.relay.fade import DEFAULT_FRAME_RATE, FadeEngine
+from boneio.cover import DEFAULT_DEAD_TIME, Cover
+from boneio.cover_engine import DEFAULT_COVER_UPDATE_INTERVAL, CoverEngine
+from boneio.helper.input_scanner import InputScanner
+from boneio.helper.timer import TimerService
 from boneio.helper.loader import (
     configure_cover,
+    configure_cover_group,
     configure_event_sensor,
     configure_binary_sensor,
     configure_relay,
@@ -72,6 +123,7 @@ from boneio.helper.loader import (
     create_dallas_sensor,
     create_expander,
     create_temp_sensor,
+    wait_for_expanders,
 )
 from boneio.helper.logger import configure_logger
 from boneio.helper.yaml_util import load_config_from_file
@@ -81,6 +133,9 @@ from w1thermsensor.errors import KernelModuleLoadError
 
 _LOGGER = logging.getLogger(__name__)
 
+# How often utilization of I2C buses is published by default.
+I2C_STATS_PERIOD = 60
+
 AVAILABILITY_FUNCTION_CHOOSER = {
     LIGHT: ha_light_availabilty_message,
     LED: ha_led_availabilty_message,
@@ -98,6 +153,7 @@ class Manager:
         state_manager: StateManager,
         config_helper: ConfigHelper,
         config_file_path: str,
+        executor_service: ExecutorService,
         relay_pins: List = [],
         event_pins: List = [],
         binary_pins: List = [],
@@ -112,6 +168,13 @@ class Manager:
         oled: dict = {},
         adc: Optional[List] = None,
         cover: list = [],
+        cover_group: list = [],
+        cover_engine: dict = {},
+        interlock: list = [],
+        gpio_backend: str = "bbio",
+        pulse_counter: list = [],
+        i2c_buses: list = [],
+        i2c_stats: dict = {},
     ) -> None:
         """Initialize the manager."""
         _LOGGER.info("Initializing manager module.")
@@ -123,24 +186,83 @@ class Manager:
         self._config_file_path = config_file_path
         self._state_manager = state_manager
         self._event_bus = EventBus(loop=self._loop)
+        self._executor_service = executor_service
+        self._event_bus.add_sigterm_listener(self._executor_service.shutdown)
 
         self.send_message = send_message
         self.stop_client = stop_client
         self._mqtt_state = mqtt_state
         self._event_pins = event_pins
         self._inputs = {}
+        self._input_scanner = InputScanner(backend=create_gpio_backend(gpio_backend))
+        self._timer_service = TimerService(loop=self._loop)
+        self._click_engine = ClickEngine(timer_service=self._timer_service)
+        self._cdev_source = CdevEventSource(loop=self._loop)
+        self._edge_guard_monitor = EdgeGuardMonitor(
+            timer_service=self._timer_service, listener=self._edge_guard_callback
+        )
+        self._edge_guard_discovered = set()
+        self._event_bus.add_sigterm_listener(self._cdev_source.close)
         self._binary_pins = binary_pins
-        self._i2cbusio = I2C(SCL, SDA)
+        self._i2c_buses: Dict[int, I2C] = {}
+        self._i2c_frequencies = {x["bus"]: x.get("frequency") for x in i2c_buses}
+        self._i2c_discovered = set()
+        self._i2c_stats_enabled = i2c_stats.get(ENABLED, False)
+        self._i2c_stats_period = (
+            i2c_stats[UPDATE_INTERVAL].total_in_seconds
+            if i2c_stats.get(UPDATE_INTERVAL)
+            else I2C_STATS_PERIOD
+        )
+        self._i2c_device_stats: Dict[str, I2CStats] = {}
+        self._expander_buses = {
+            (kind, expander[ID] or expander[ADDRESS]): expander.get(
+                I2C_BUS, DEFAULT_I2C_BUS
+            )
+            for kind, expanders in ((MCP, mcp23017), (PCF, pcf8575), (PCA, pca9685))
+            for expander in expanders
+        }
+        self._expander_verify_periods = {
+            (kind, expander[ID] or expander[ADDRESS]): expander[
+                VERIFY_INTERVAL
+            ].total_in_seconds
+            for kind, expanders in ((MCP, mcp23017), (PCF, pcf8575), (PCA, pca9685))
+            for expander in expanders
+            if expander.get(VERIFY_INTERVAL)
+        }
         self._mcp = {}
         self._pcf = {}
         self._pca = {}
         self._output = {}
         self._configured_output_groups = {}
+        self._interlocked_relays = {}
         self._oled = None
         self._tasks: List[asyncio.Task] = []
         self._covers = {}
+        self._cover_engine = CoverEngine(
+            timer_service=self._timer_service,
+            update_interval=cover_engine[UPDATE_INTERVAL].total_in_seconds
+            if cover_engine.get(UPDATE_INTERVAL)
+            else DEFAULT_COVER_UPDATE_INTERVAL,
+        )
         self._temp_sensors = []
         self._ina219_sensors = []
+        self._pulse_counters = {}
+        self._expander_inputs = {}
+        self._expander_outputs = {}
+        self._pca_outputs = {}
+        self._fade_engines = {}
+        self._fade_frame_rates = {
+            expander[ID] or expander[ADDRESS]: expander.get(
+                "fade_frame_rate", DEFAULT_FRAME_RATE
+            )
+            for expander in pca9685
+        }
+        self._expander_interrupts = {
+            (kind, expander[ID] or expander[ADDRESS]): expander["interrupt_pin"]
+            for kind, expanders in ((MCP, mcp23017), (PCF, pcf8575))
+            for expander in expanders
+            if expander.get("interrupt_pin")
+        }
         self._modbus = None
 
         self._configure_modbus(modbus=modbus)
@@ -154,27 +276,28 @@ class Manager:
         )
 
         self.grouped_outputs = create_expander(
+            manager=self,
             expander_dict=self._mcp,
             expander_config=mcp23017,
             exp_type=MCP,
-            i2cbusio=self._i2cbusio,
         )
         self.grouped_outputs.update(
             create_expander(
+                manager=self,
                 expander_dict=self._pcf,
                 expander_config=pcf8575,
                 exp_type=PCF,
-                i2cbusio=self._i2cbusio,
             )
         )
         self.grouped_outputs.update(
             create_expander(
+                manager=self,
                 expander_dict=self._pca,
                 expander_config=pca9685,
                 exp_type=PCA,
-                i2cbusio=self._i2cbusio,
             )
         )
+        wait_for_expanders(mcp23017, pcf8575, pca9685)
 
         self._configure_adc(adc_list=adc)
 
@@ -190,6 +313,7 @@ class Manager:
                 relay_callback=self._relay_callback,
                 config=_config,
                 event_bus=self._event_bus,
+                executor_service=self._executor_service,
             )
             if not out:
                 continue
@@ -209,6 +333,9 @@ class Manager:
                 out.send_state,
             )
 
+        self._configure_interlocks(interlock=interlock)
+        self._setup_expander_outputs()
+
         for _config in cover:
             _id = strip_accents(_config[ID])
             open_relay = self._output.get(_config.get("open_relay"))
@@ -232,6 +359,16 @@ class Manager:
                     "You have to explicity set types of relays to None so you can't turn it on directly.",
                 )
                 continue
+            if not self._add_interlock(
+                relays=[open_relay, close_relay],
+                dead_time=_config["dead_time"].total_in_seconds
+                if _config.get("dead_time")
+                else DEFAULT_DEAD_TIME,
+            ):
+                _LOGGER.debug(
+                    "Relays of cover %s are not on one expander, only cover keeps them apart.",
+                    _id,
+                )
             self._covers[_id] = configure_cover(
                 manager=self,
                 cover_id=_id,
@@ -241,14 +378,20 @@ class Manager:
                 close_relay=close_relay,
                 open_time=_config.get("open_time"),
                 close_time=_config.get("close_time"),
+                dead_time=_config.get("dead_time"),
+                tilt_time=_config.get("tilt_time"),
                 event_bus=self._event_bus,
+                cover_engine=self._cover_engine,
                 send_ha_autodiscovery=self.send_ha_autodiscovery,
                 topic_prefix=self._config_helper.topic_prefix,
             )
 
+        self._configure_cover_groups(cover_group=cover_group)
+
         self._output_group = output_group
         self._configure_output_group()
-        self.executor = ThreadPoolExecutor()
+
+        self._configure_pulse_counters(pulse_counter=pulse_counter)
 
         _LOGGER.info("Initializing inputs. This will take a while.")
         self.configure_inputs(reload_config=False)
@@ -272,10 +415,12 @@ class Manager:
                     screen_order=screens,
                     output_groups=list(self.grouped_outputs),
                     sleep_timeout=oled.get("screensaver_timeout", 60),
+                    i2c_worker=self._executor_service.i2c,
                 )
             except (GPIOInputException, I2CError) as err:
                 _LOGGER.error("Can't configure OLED display. %s", err)
         self.prepare_ha_buttons()
+        self.append_task(coro=self._i2c_stats_loop, name="i2c_stats")
 
         _LOGGER.info("BoneIO manager is ready.")
 
@@ -283,6 +428,33 @@ class Manager:
     def mqtt_state(self) -> bool:
         return self._mqtt_state()
 
+    def _configure_cover_groups(self, cover_group: list) -> None:
+        for group in cover_group:
+            _id = strip_accents(group[ID])
+            members = []
+            for cover_id in group["covers"]:
+                cover = self._covers.get(strip_accents(cover_id))
+                if not isinstance(cover, Cover):
+                    _LOGGER.warn(
+                        "Cover %s of group %s doesn't exist.", cover_id, group[ID]
+                    )
+                    continue
+                members.append(cover)
+            if not members:
+                _LOGGER.warn(
+                    "This cover group %s doesn't have any valid members. Not adding it.",
+                    group[ID],
+                )
+                continue
+            self._covers[_id] = configure_cover_group(
+                manager=self,
+                group_id=_id,
+                members=members,
+                config=group,
+                send_ha_autodiscovery=self.send_ha_autodiscovery,
+                topic_prefix=self._config_helper.topic_prefix,
+            )
+
     def _configure_output_group(self):
         def get_outputs(output_list):
             outputs = []
@@ -294,6 +466,9 @@ class Manager:
                         _LOGGER.warn("You can't add cover output to group.")
                     else:
                         outputs.append(output)
+                elif x.replace(" ", "") in self._configured_output_groups:
+                    # Group of groups. Only groups defined before can be used.
+                    outputs.append(self._configured_output_groups[x.replace(" ", "")])
             return outputs
 
         for group in self._output_group:
@@ -312,6 +487,7 @@ class Manager:
                 topic_prefix=self._config_helper.topic_prefix,
                 relay_id=group[ID].replace(" ", ""),
                 event_bus=self._event_bus,
+                executor_service=self._executor_service,
                 members=members,
             )
             self._configured_output_groups[configured_group.id] = configured_group
@@ -336,18 +512,40 @@ class Manager:
         """Configure inputs. Either events or binary sensors."""
 
         def check_if_pin_configured(pin: str) -> bool:
+            if pin in self._pulse_counters:
+                _LOGGER.warn("This PIN %s is used by pulse counter. Omitting it.", pin)
+                return True
             if pin in self._inputs:
                 if not reload_config:
                     _LOGGER.warn("This PIN %s is already configured. Omitting it.", pin)
                     return True
             return False
 
-        def configure_single_input(configure_sensor_func, gpio) -> None:
+        def configure_single_input(configure_sensor_func, gpio, **kwargs) -> None:
             try:
                 pin = gpio.pop(PIN)
             except AttributeError as err:
                 _LOGGER.error("Wrong config. Can't configure %s. Error %s", gpio, err)
                 return
+            # Anything else than expander, eg. legacy `sensor`, is pin of board.
+            kind = gpio.pop(KIND, GPIO)
+            expander_inputs = None
+            expander_pin = None
+            if kind in (MCP, PCF):
+                expander_id = gpio.pop(MCP_ID if kind == MCP else PCF_ID, None)
+                expander_inputs = self._get_expander_inputs(
+                    kind=kind, expander_id=expander_id
+                )
+                if not expander_inputs:
+                    _LOGGER.error(
+                        "Can't configure input %s. No such %s expander %s.",
+                        pin,
+                        kind,
+                        expander_id,
+                    )
+                    return
+                expander_pin = int(pin)
+                pin = f"{expander_id}_{pin}"
             if check_if_pin_configured(pin=pin):
                 return
             input = configure_sensor_func(
@@ -355,7 +553,13 @@ class Manager:
                 pin=pin,
                 press_callback=self.press_callback,
                 send_ha_autodiscovery=self.send_ha_autodiscovery,
+                input_scanner=self._input_scanner,
+                cdev_source=self._cdev_source,
+                edge_guard_monitor=self._edge_guard_monitor,
+                expander_inputs=expander_inputs,
+                expander_pin=expander_pin,
                 input=self._inputs.get(pin, None),
+                **kwargs,
             )
             if input:
                 self._inputs[input.pin] = input
@@ -369,13 +573,243 @@ class Manager:
                 self._config_helper.clear_autodiscovery_type(ha_type=BINARY_SENSOR)
         for gpio in self._event_pins:
             configure_single_input(
-                configure_sensor_func=configure_event_sensor, gpio=gpio
+                configure_sensor_func=configure_event_sensor,
+                gpio=gpio,
+                click_engine=self._click_engine,
             )
         for gpio in self._binary_pins:
             configure_single_input(
                 configure_sensor_func=configure_binary_sensor, gpio=gpio
             )
 
+    def _get_expander_inputs(
+        self, kind: str, expander_id: str
+    ) -> ExpanderInputs | None:
+        """Get inputs of expander, create them on first use."""
+        if (kind, expander_id) in self._expander_inputs:
+            return self._expander_inputs[(kind, expander_id)]
+        expander = (self._mcp if kind == MCP else self._pcf).get(expander_id)
+        if not expander:
+            return None
+        reader = (
+            MCP23017InputReader(mcp=expander)
+            if kind == MCP
+            else PCF8575InputReader(pcf=expander)
+        )
+        expander_inputs = ExpanderInputs(
+            expander_id=expander_id,
+            reader=reader,
+            executor=self._expander_worker(kind, expander_id).executor(PRIORITY_INPUT),
+            cdev_source=self._cdev_source,
+            interrupt_pin=self._expander_interrupts.get((kind, expander_id)),
+            connection=expander,
+            loop=self._loop,
+        )
+        expander.add_reconnect_listener(expander_inputs.restore)
+        self._expander_inputs[(kind, expander_id)] = expander_inputs
+        return expander_inputs
+
+    def get_i2c_bus(self, bus: int = DEFAULT_I2C_BUS) -> I2C:
+        """Get I2C bus by its number, open it on first use."""
+        if bus not in self._i2c_buses:
+            self._i2c_buses[bus] = open_i2c_bus(
+                bus=bus, frequency=self._i2c_frequencies.get(bus)
+            )
+        return self._i2c_buses[bus]
+
+    def get_i2c_worker(self, bus: int = DEFAULT_I2C_BUS) -> I2CBusWorker:
+        """Get worker owning I2C bus."""
+        return self._executor_service.i2c_worker(bus)
+
+    def get_i2c_stats(self, device_id: str) -> Optional[I2CStats]:
+        """Get transaction stats of I2C device, None if stats are disabled."""
+        if not self._i2c_stats_enabled:
+            return None
+        return self._i2c_device_stats.setdefault(device_id, I2CStats())
+
+    async def _i2c_stats_loop(self) -> None:
+        """Publish utilization of every I2C bus and stats of its devices."""
+        while True:
+            await asyncio.sleep(self._i2c_stats_period)
+            for bus, worker in self._executor_service.i2c_workers.items():
+                utilization, jobs = worker.take_stats()
+                if bus not in self._i2c_discovered:
+                    self._i2c_discovered.add(bus)
+                    self.send_ha_autodiscovery(
+                        id=bus,
+                        name=f"I2C bus {bus} utilization",
+                        ha_type=SENSOR,
+                        availability_msg_func=ha_i2c_bus_availabilty_message,
+                    )
+                self.send_message(
+                    topic=f"{self._config_helper.topic_prefix}/{I2C_STATE}/{bus}",
+                    payload={
+                        "utilization": round(utilization * 100, 1),
+                        "jobs": jobs,
+                        "pending": worker.pending,
+                    },
+                )
+            self._publish_i2c_device_stats()
+
+    def _publish_i2c_device_stats(self) -> None:
+        for device_id, stats in self._i2c_device_stats.items():
+            if (I2C_DEVICE_STATE, device_id) not in self._i2c_discovered:
+                self._i2c_discovered.add((I2C_DEVICE_STATE, device_id))
+                self.send_ha_autodiscovery(
+                    id=device_id,
+                    name=f"I2C {device_id} latency",
+                    ha_type=SENSOR,
+                    availability_msg_func=ha_i2c_device_availabilty_message,
+                )
+            self.send_message(
+                topic=f"{self._config_helper.topic_prefix}/{I2C_DEVICE_STATE}/{device_id}",
+                payload=stats.summary(),
+            )
+
+    def _dump_i2c_stats(self) -> None:
+        """Log stats of every I2C device and publish them at once."""
+        for device_id, stats in self._i2c_device_stats.items():
+            _LOGGER.info("I2C stats of %s: %s", device_id, json.dumps(stats.summary()))
+        self._publish_i2c_device_stats()
+
+    def _expander_worker(self, kind: str, expander_id: str) -> I2CBusWorker:
+        return self.get_i2c_worker(
+            self._expander_buses.get((kind, expander_id), DEFAULT_I2C_BUS)
+        )
+
+    def get_expander_outputs(
+        self, kind: str, expander_id: str
+    ) -> ExpanderOutputs | None:
+        """Get shadow latch of expander outputs, create it on first use."""
+        if (kind, expander_id) in self._expander_outputs:
+            return self._expander_outputs[(kind, expander_id)]
+        expander = (self._mcp if kind == MCP else self._pcf).get(expander_id)
+        if not expander:
+            return None
+        writer = (
+            MCP23017OutputWriter(mcp=expander)
+            if kind == MCP
+            else PCF8575OutputWriter(pcf=expander)
+        )
+        expander_outputs = ExpanderOutputs(
+            expander_id=expander_id,
+            writer=writer,
+            executor=self._expander_worker(kind, expander_id).executor(PRIORITY_OUTPUT),
+            verify_period=self._expander_verify_periods.get(
+                (kind, expander_id), EXPANDER_VERIFY_PERIOD
+            ),
+            on_reset=lambda: self._expander_reset(kind=kind, expander_id=expander_id),
+            on_interlock=lambda mask: self._interlock_released(
+                kind=kind, expander_id=expander_id, mask=mask
+            ),
+            connection=expander,
+            loop=self._loop,
+        )
+        expander.add_reconnect_listener(expander_outputs.restore)
+        self._expander_outputs[(kind, expander_id)] = expander_outputs
+        return expander_outputs
+
+    def _configure_interlocks(self, interlock: list) -> None:
+        for _config in interlock:
+            relays = [self._output.get(strip_accents(x)) for x in _config["outputs"]]
+            if None in relays:
+                _LOGGER.error(
+                    "Can't configure interlock of %s. Some of outputs don't exist.",
+                    _config["outputs"],
+                )
+                continue
+            if not self._add_interlock(
+                relays=relays, dead_time=_config["dead_time"].total_in_seconds
+            ):
+                _LOGGER.error(
+                    "Can't configure interlock of %s. Outputs have to be on one MCP or PCF expander.",
+                    _config["outputs"],
+                )
+
+    def _add_interlock(self, relays: list, dead_time: float) -> bool:
+        """Interlock relays in shadow of their expander."""
+        expanders = {
+            (getattr(x, "expander_type", None), getattr(x, "expander_id", None))
+            for x in relays
+        }
+        if len(expanders) != 1:
+            return False
+        (kind, expander_id) = expanders.pop()
+        expander_outputs = self._expander_outputs.get((kind, expander_id))
+        if expander_outputs is None:
+            return False
+        expander_outputs.add_interlock(
+            pins={x.pin_id: x.active_level for x in relays}, dead_time=dead_time
+        )
+        for x in relays:
+            self._interlocked_relays[(kind, expander_id, x.pin_id)] = x
+        return True
+
+    def _interlock_released(self, kind: str, expander_id: str, mask: int) -> None:
+        """Send state of relays whose level was changed by interlock."""
+        for pin in range(16):
+            relay = self._interlocked_relays.get((kind, expander_id, pin))
+            if relay and mask & (1 << pin):
+                relay.send_state()
+
+    def _expander_reset(self, kind: str, expander_id: str) -> None:
+        """Outputs of expander were set up again after reset, inputs too."""
+        expander_inputs = self._expander_inputs.get((kind, expander_id))
+        if expander_inputs:
+            expander_inputs.restore()
+
+    def _setup_expander_outputs(self) -> None:
+        """Write initial state of all expander outputs. Every expander takes
+        latch and direction write, expanders on different buses are set up
+        in parallel."""
+        futures = [
+            self._expander_worker(kind, expander_id).submit_with_priority(
+                PRIORITY_OUTPUT, expander_outputs.setup
+            )
+            for (kind, expander_id), expander_outputs in self._expander_outputs.items()
+        ]
+        wait(futures)
+
+    def get_pca_outputs(self, pca_id: str) -> PCAOutputs | None:
+        """Get shadow of PCA duty cycles, create it on first use."""
+        if pca_id in self._pca_outputs:
+            return self._pca_outputs[pca_id]
+        pca = self._pca.get(pca_id)
+        if not pca:
+            return None
+        try:
+            pca_outputs = PCAOutputs(
+                pca_id=pca_id,
+                writer=PCA9685Writer(pca=pca),
+                executor=self._expander_worker(PCA, pca_id).executor(PRIORITY_OUTPUT),
+                verify_period=self._expander_verify_periods.get(
+                    (PCA, pca_id), PCA_VERIFY_PERIOD
+                ),
+                connection=pca,
+                loop=self._loop,
+            )
+        except OSError as err:
+            _LOGGER.error("Can't read channels of PCA %s. %s", pca_id, err)
+            return None
+        pca.add_reconnect_listener(pca_outputs.restore)
+        self._pca_outputs[pca_id] = pca_outputs
+        return pca_outputs
+
+    def get_fade_engine(self, pca_id: str) -> FadeEngine | None:
+        """Get brightness transitions engine of PCA, create it on first use."""
+        if pca_id in self._fade_engines:
+            return self._fade_engines[pca_id]
+        pca_outputs = self.get_pca_outputs(pca_id=pca_id)
+        if not pca_outputs:
+            return None
+        fade_engine = FadeEngine(
+            pca_outputs=pca_outputs,
+            frame_rate=self._fade_frame_rates.get(pca_id, DEFAULT_FRAME_RATE),
+            loop=self._loop,
+        )
+        self._fade_engines[pca_id] = fade_engine
+        return fade_engine
+
     def append_task(self, coro: Coroutine, name: str = "Unknown") -> asyncio.Future:
         """Add task to run with asyncio loop."""
         _LOGGER.debug("Appending update task for %s", name)
@@ -397,6 +831,7 @@ class Manager:
 
         _one_wire_devices = {}
         _ds_onewire_bus = {}
+        _ds_i2c_workers = {}
 
         for _single_ds in ds2482:
             _LOGGER.debug("Preparing DS2482 bus at address %s.", _single_ds[ADDRESS])
@@ -405,9 +840,15 @@ class Manager:
             )
             from boneio.sensor import DallasSensorDS2482
 
-            _ds_onewire_bus[_single_ds[ID]] = configure_ds2482(
-                i2cbusio=self._i2cbusio, address=_single_ds[ADDRESS]
-            )
+            ds_i2c_bus = _single_ds.get(I2C_BUS, DEFAULT_I2C_BUS)
+            try:
+                _ds_onewire_bus[_single_ds[ID]] = configure_ds2482(
+                    i2cbusio=self.get_i2c_bus(ds_i2c_bus), address=_single_ds[ADDRESS]
+                )
+            except I2CError as err:
+                _LOGGER.error("Can't configure DS2482 %s. %s", _single_ds[ID], err)
+                continue
+            _ds_i2c_workers[_single_ds[ID]] = self.get_i2c_worker(ds_i2c_bus)
             _one_wire_devices.update(
                 find_onewire_devices(
                     ow_bus=_ds_onewire_bus[_single_ds[ID]],
@@ -445,6 +886,7 @@ class Manager:
                 kwargs = {
                     "bus": _ds_onewire_bus[ds2482_bus_id],
                     "cls": DallasSensorDS2482,
+                    "i2c_worker": _ds_i2c_workers[ds2482_bus_id],
                 }
             else:
                 kwargs = {"cls": DallasSensorW1}
@@ -491,7 +933,6 @@ class Manager:
                         topic_prefix=self._config_helper.topic_prefix,
                         sensor_type=sensor_type,
                         config=temp_def,
-                        i2cbusio=self._i2cbusio,
                     )
                     if temp_sensor:
                         self._temp_sensors.append(temp_sensor)
@@ -509,6 +950,21 @@ class Manager:
                 if ina219:
                     self._ina219_sensors.append(ina219)
 
+    def _configure_pulse_counters(self, pulse_counter: list) -> None:
+        if pulse_counter:
+            from boneio.helper.loader import create_pulse_counter
+
+            for counter_config in pulse_counter:
+                counter = create_pulse_counter(
+                    manager=self,
+                    topic_prefix=self._config_helper.topic_prefix,
+                    state_manager=self._state_manager,
+                    cdev_source=self._cdev_source,
+                    config=counter_config,
+                )
+                if counter:
+                    self._pulse_counters[counter_config[PIN]] = counter
+
     def _configure_modbus_sensors(self, sensors: dict) -> None:
         if sensors.get(MODBUS) and self._modbus:
             from boneio.helper.loader import create_modbus_sensors
@@ -584,6 +1040,15 @@ class Manager:
             availability_msg_func=ha_button_availabilty_message,
             entity_category="config",
         )
+        if self._i2c_stats_enabled:
+            self.send_ha_autodiscovery(
+                id="i2c_stats",
+                name="Dump I2C stats",
+                ha_type=BUTTON,
+                payload_press="dump",
+                availability_msg_func=ha_button_availabilty_message,
+                entity_category="diagnostic",
+            )
 
     @property
     def mcp(self):
@@ -650,6 +1115,21 @@ class Manager:
                         _LOGGER.warn("Action doesn't exists %s. Check spelling", action)
                     if not output:
                         _LOGGER.warn("Device %s for action not found", device)
+            elif action_definition[ACTION] == DIM:
+                device = action_definition.get(PIN)
+                output = self._output.get(strip_accents(device.replace(" ", ""))) if device else None
+                if not output or not hasattr(output, "start_dim"):
+                    _LOGGER.warn("Dimmable output %s for action not found", device)
+                    continue
+                if x == HOLD and output.is_dimming:
+                    # Repeated hold keeps ramp started by first one.
+                    continue
+                # Input could be released before this task run.
+                if self._click_engine.on_release(inpin, output.stop_dim):
+                    output.start_dim(
+                        duration=action_definition["dim_duration"].total_in_seconds,
+                        direction=action_definition["dim_direction"],
+                    )
             elif action_definition[ACTION] == MQTT:
                 action_topic = action_definition.get(TOPIC)
                 action_payload = action_definition.get("action_mqtt_msg")
@@ -657,13 +1137,34 @@ class Manager:
                     self.send_message(
                         topic=action_topic, payload=action_payload, retain=False
                     )
-        self._loop.run_in_executor(self.executor, lambda: self.send_message(topic=topic, payload=generate_payload(), retain=False))
+        self._executor_service.run(MQTT_POOL, lambda: self.send_message(topic=topic, payload=generate_payload(), retain=False))
         # This is similar how Z2M is clearing click sensor.
         if empty_message_after:
             self._loop.call_soon_threadsafe(
                 self._loop.call_later, 0.2, self.send_message, topic, ""
             )
 
+    def _edge_guard_callback(self, guard: EdgeGuard) -> None:
+        """Publish state of input edge guard. HA entity is created on first trip."""
+        if guard.pin not in self._edge_guard_discovered:
+            self._edge_guard_discovered.add(guard.pin)
+            input = self._inputs.get(guard.pin)
+            self.send_ha_autodiscovery(
+                id=guard.pin,
+                name=f"{input.name if input else guard.pin} edge guard",
+                ha_type=SENSOR,
+                availability_msg_func=ha_edge_guard_availabilty_message,
+            )
+        self.send_message(
+            topic=f"{self._config_helper.topic_prefix}/{EDGE_GUARD}/{guard.pin}",
+            payload={
+                STATE: guard.state,
+                "rate": round(guard.rate),
+                "dropped": guard.total_dropped,
+            },
+            retain=True,
+        )
+
     def send_ha_autodiscovery(
         self,
         id: str,
@@ -689,6 +1190,57 @@ class Manager:
         for msg in self._config_helper.autodiscovery_msgs:
             self.send_message(**msg, retain=True)
 
+    def _led_command(self, target_device, message: str) -> None:
+        """Handle JSON command of HA light, which can carry brightness
+        and transition in seconds."""
+        try:
+            command = json.loads(message)
+            transition = command.get(TRANSITION)
+            if transition is not None:
+                transition = float(transition)
+            brightness = command.get(BRIGHTNESS)
+            if brightness is not None:
+                brightness = int(brightness)
+            state = str(command.get(STATE, ON)).upper()
+        except (ValueError, TypeError, AttributeError) as err:
+            _LOGGER.error("Wrong LED command %s. %s", message, err)
+            return
+        if state == OFF:
+            target_device.turn_off(transition=transition)
+            return
+        if brightness is not None:
+            target_device.set_brightness(brightness, transition=transition)
+        target_device.turn_on(transition=transition)
+
+    async def _cover_command(
+        self, cover: Cover | CoverGroup, command: str, message: str
+    ) -> None:
+        """Run set, pos or tilt command of cover or cover group."""
+        if command == "set":
+            if message in (
+                OPEN,
+                CLOSE,
+                STOP,
+                "toggle",
+                "toggle_open",
+                "toggle_close",
+            ):
+                getattr(cover, message.lower())()
+        elif command == "pos":
+            position = int(message)
+            if 0 <= position <= 100:
+                await cover.set_cover_position(position=position)
+            else:
+                _LOGGER.warn(
+                    "Positon cannot be set. Not number between 0-100. %s", message
+                )
+        elif command == "tilt":
+            tilt = int(message)
+            if 0 <= tilt <= 100:
+                await cover.set_tilt(tilt=tilt)
+            else:
+                _LOGGER.warn("Tilt cannot be set. Not number between 0-100. %s", message)
+
     async def receive_message(self, topic: str, message: str) -> None:
         """Callback for receiving action from Mqtt."""
         _LOGGER.debug("Processing topic %s with message %s.", topic, message)
@@ -716,7 +1268,9 @@ class Manager:
         if msg_type == RELAY and command == "set":
             target_device = self._output.get(device_id)
 
-            if target_device and target_device.output_type != NONE:
+            if target_device and target_device.output_type == LED and message.startswith("{"):
+                self._led_command(target_device=target_device, message=message)
+            elif target_device and target_device.output_type != NONE:
                 action_from_msg = relay_actions.get(message.upper())
                 if action_from_msg:
                     _f = getattr(target_device, action_from_msg)
@@ -735,24 +1289,7 @@ class Manager:
             cover = self._covers.get(device_id)
             if not cover:
                 return
-            if command == "set":
-                if message in (
-                    OPEN,
-                    CLOSE,
-                    STOP,
-                    "toggle",
-                    "toggle_open",
-                    "toggle_close",
-                ):
-                    getattr(cover, message.lower())()
-            elif command == "pos":
-                position = int(message)
-                if 0 <= position <= 100:
-                    await cover.set_cover_position(position=position)
-                else:
-                    _LOGGER.warn(
-                        "Positon cannot be set. Not number between 0-100. %s", message
-                    )
+            await self._cover_command(cover=cover, command=command, message=message)
         elif msg_type == "group" and command == "set":
             target_device = self._configured_output_groups.get(device_id)
             if target_device and target_device.output_type != NONE:
@@ -773,6 +1310,8 @@ class Manager:
             elif device_id == "inputs_reload" and message == "inputs_reload":
                 _LOGGER.info("Reloading events and binary sensors actions")
                 self.configure_inputs(reload_config=True)
+            elif device_id == "i2c_stats" and message == "dump":
+                self._dump_i2c_stats()
 
     @property
     def output(self) -> dict:
@@ -5,9 +5,8 @@ from typing import List
 
 from luma.core.error import DeviceNotFoundError
 from luma.core.interface.serial import i2c
-from luma.core.render import canvas
 from luma.oled.device import sh1106
-from PIL import ImageDraw
+from PIL import Image, ImageDraw
 
 from boneio.const import OLED_PIN, UPTIME, WHITE
 from boneio.helper import (
@@ -19,6 +18,7 @@ from boneio.helper import (
     setup_input,
 )
 from boneio.helper.events import async_track_point_in_time, utcnow
+from boneio.helper.i2c_worker import I2CBusWorker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,9 +53,11 @@ class Oled:
         output_groups: List[str],
         sleep_timeout: TimePeriod,
         screen_order: List[str],
+        i2c_worker: I2CBusWorker,
     ) -> None:
         """Initialize OLED screen."""
         self._loop = asyncio.get_running_loop()
+        self._i2c_worker = i2c_worker
         self._output_groups = None
         try:
             _ind_screen = screen_order.index("outputs")
@@ -94,9 +96,13 @@ class Oled:
             )
             i += 1
 
+    def _display(self, image: Image.Image) -> None:
+        """Send frame to screen in I2C worker, it takes whole I2C transfer
+        of 1kB."""
+        self._i2c_worker.submit(self._device.display, image)
+
     def _sleeptime(self):
-        with canvas(self._device) as draw:
-            draw.rectangle(self._device.bounding_box, outline="black", fill="black")
+        self._display(Image.new(self._device.mode, self._device.size))
         self._sleep = True
 
     def _draw_uptime(self, data: dict, draw: ImageDraw) -> None:
@@ -132,13 +138,15 @@ class Oled:
         """Render display."""
         data = self._host_data.get(self._current_screen)
         if data:
-            with canvas(self._device) as draw:
-                if self._output_groups and self._current_screen in self._output_groups:
-                    self._draw_output(data, draw)
-                elif self._current_screen == UPTIME:
-                    self._draw_uptime(data, draw)
-                else:
-                    self._draw_standard(data, draw)
+            image = Image.new(self._device.mode, self._device.size)
+            draw = ImageDraw.Draw(image)
+            if self._output_groups and self._current_screen in self._output_groups:
+                self._draw_output(data, draw)
+            elif self._current_screen == UPTIME:
+                self._draw_uptime(data, draw)
+            else:
+                self._draw_standard(data, draw)
+            self._display(image)
         if not self._sleep_handle and self._sleep_timeout.total_seconds > 0:
             self._sleep_handle = async_track_point_in_time(
                 loop=self._loop,
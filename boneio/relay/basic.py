@@ -1,13 +1,13 @@
 """Basic Relay module."""
 from __future__ import annotations
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import logging
 from typing import Callable
 from boneio.helper.util import callback
 from boneio.const import COVER, LIGHT, NONE, OFF, ON, RELAY, STATE, SWITCH
 from boneio.helper import BasicMqtt
 from boneio.helper.events import EventBus, async_track_point_in_time, utcnow
+from boneio.helper.executor import ExecutorService
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +20,7 @@ class BasicRelay(BasicMqtt):
         callback: Callable,
         id: str,
         event_bus: EventBus,
+        executor_service: ExecutorService,
         name: str | None = None,
         output_type=SWITCH,
         restored_state: bool = False,
@@ -39,7 +40,7 @@ class BasicRelay(BasicMqtt):
         self._callback = callback
         self._momentary_action = None
         self._loop = asyncio.get_running_loop()
-        self.executor = ThreadPoolExecutor()
+        self._executor_service = executor_service
 
     @property
     def is_mcp_type(self) -> bool:
@@ -0,0 +1,152 @@
+"""Brightness transitions of PCA9685 channels."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Dict, Optional
+
+from boneio.helper.pca_outputs import PCAOutputs
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FRAME_RATE = 50
+MAX_DUTY = 0xFFFF
+
+
+class Fade:
+    """Transition of one channel from start to target duty cycle.
+
+    With gamma other than 1 duty cycle is interpolated on perceived
+    brightness curve, so fade looks linear to eye. Start and target are
+    kept as they are.
+    """
+
+    __slots__ = (
+        "start",
+        "target",
+        "start_time",
+        "duration",
+        "gamma",
+        "_from",
+        "_to",
+        "on_done",
+    )
+
+    def __init__(
+        self,
+        start: int,
+        target: int,
+        start_time: float,
+        duration: float,
+        gamma: float = 1.0,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.start = start
+        self.target = target
+        self.start_time = start_time
+        self.duration = duration
+        self.gamma = gamma
+        self.on_done = on_done
+        if gamma == 1.0:
+            self._from, self._to = start, target
+        else:
+            self._from = (start / MAX_DUTY) ** (1 / gamma)
+            self._to = (target / MAX_DUTY) ** (1 / gamma)
+
+    def value(self, progress: float) -> int:
+        """Duty cycle at progress 0-1."""
+        if progress >= 1:
+            return self.target
+        level = self._from + (self._to - self._from) * progress
+        if self.gamma == 1.0:
+            return round(level)
+        return round(level**self.gamma * MAX_DUTY)
+
+
+class FadeEngine:
+    """Run brightness transitions of channels of one PCA9685.
+
+    While any channel fades, frame runs frame_rate times per second in loop.
+    Frame computes duty cycles of all fading channels and passes them to
+    PCA outputs at once, so they are written with one block write. If I2C is
+    slower than frame rate, frames are merged in shadow instead of queued.
+    """
+
+    def __init__(
+        self,
+        pca_outputs: PCAOutputs,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Initialize fade engine."""
+        self._pca_outputs = pca_outputs
+        self._period = 1 / frame_rate
+        self._loop = loop or asyncio.get_event_loop()
+        self._fades: Dict[int, Fade] = {}
+        self._task = None
+
+    def fade(
+        self,
+        channel: int,
+        target: int,
+        duration: float,
+        gamma: float = 1.0,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Fade channel from current duty cycle to target.
+        Running fade of channel is retargeted from where it is now."""
+        self._fades.pop(channel, None)
+        start = self._pca_outputs.duty_cycle(channel)
+        if duration <= 0 or start == target:
+            self._pca_outputs.set_duty_cycle(channel, target)
+            if on_done:
+                on_done()
+            return
+        self._fades[channel] = Fade(
+            start=start,
+            target=target,
+            start_time=self._loop.time(),
+            duration=duration,
+            gamma=gamma,
+            on_done=on_done,
+        )
+        if self._task is None:
+            self._task = self._loop.create_task(self._run())
+
+    def cancel(self, channel: int) -> None:
+        """Stop fade of channel where it is."""
+        self._fades.pop(channel, None)
+
+    def target(self, channel: int) -> Optional[int]:
+        """Target of running fade of channel."""
+        fade = self._fades.get(channel)
+        return fade.target if fade else None
+
+    def frame(self, now: float) -> None:
+        """Set duty cycles of all fading channels for time now."""
+        values = {}
+        done = []
+        for channel, fade in self._fades.items():
+            progress = (now - fade.start_time) / fade.duration
+            values[channel] = fade.value(progress)
+            if progress >= 1:
+                done.append(channel)
+        self._pca_outputs.set_duty_cycles(values)
+        for channel in done:
+            fade = self._fades.pop(channel)
+            if fade.on_done:
+                fade.on_done()
+
+    async def _run(self) -> None:
+        next_frame = self._loop.time()
+        try:
+            while self._fades:
+                next_frame += self._period
+                now = self._loop.time()
+                if next_frame < now:
+                    # Loop was busy, skip missed frames.
+                    next_frame = now
+                await asyncio.sleep(next_frame - now)
+                self.frame(self._loop.time())
+        finally:
+            self._task = None
@@ -2,8 +2,8 @@
 
 import logging
 
-from adafruit_mcp230xx.mcp23017 import MCP23017, DigitalInOut
 from boneio.const import SWITCH, MCP, COVER, ON, OFF
+from boneio.helper.expander_outputs import ExpanderOutputs
 from boneio.relay.basic import BasicRelay
 
 _LOGGER = logging.getLogger(__name__)
@@ -15,18 +15,18 @@ class MCPRelay(BasicRelay):
     def __init__(
         self,
         pin: int,
-        mcp: MCP23017,
+        expander_outputs: ExpanderOutputs,
         mcp_id: str,
         output_type: str = SWITCH,
         restored_state: bool = False,
         **kwargs
     ) -> None:
         """Initialize MCP relay."""
-        self._pin: DigitalInOut = mcp.get_pin(pin)
+        self._expander_outputs = expander_outputs
         if output_type == COVER:
             """Just in case to not restore state of covers etc."""
             restored_state = False
-        self._pin.switch_to_output(value=restored_state)
+        expander_outputs.setup_output(pin=pin, level=restored_state)
         super().__init__(
             **kwargs, output_type=output_type, restored_state=restored_state
         )
@@ -40,6 +40,11 @@ class MCPRelay(BasicRelay):
         """Check expander type."""
         return MCP
 
+    @property
+    def active_level(self) -> bool:
+        """Level of pin when relay is active."""
+        return True
+
     @property
     def pin_id(self) -> int:
         """Return PIN id."""
@@ -53,21 +58,18 @@ class MCPRelay(BasicRelay):
     @property
     def is_active(self) -> bool:
         """Is relay active."""
-        return self.pin.value
-
-    @property
-    def pin(self) -> DigitalInOut:
-        """PIN of the relay"""
-        return self._pin
+        return self._expander_outputs.level(self._pin_id)
 
     def turn_on(self) -> None:
         """Call turn on action."""
-        self.pin.value = True
+        applied = self._expander_outputs.set_level(self._pin_id, True)
         self._execute_momentary_turn(momentary_type=ON)
-        self._loop.call_soon_threadsafe(self.send_state, ON)
+        if applied:
+            # Otherwise interlock holds pin for dead time and reports it later.
+            self._loop.call_soon_threadsafe(self.send_state, ON)
 
     def turn_off(self) -> None:
         """Call turn off action."""
-        self.pin.value = False
+        self._expander_outputs.set_level(self._pin_id, False)
         self._execute_momentary_turn(momentary_type=OFF)
         self._loop.call_soon_threadsafe(self.send_state, OFF)
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 import logging
-from adafruit_pca9685 import PCA9685, PCAChannels
 
 from boneio.const import LED, OFF, ON, STATE, SWITCH, BRIGHTNESS, PCA
+from boneio.helper.pca_outputs import PCAOutputs
+from boneio.helper.timeperiod import TimePeriod
 from boneio.relay.basic import BasicRelay
+from boneio.relay.fade import FadeEngine
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,21 +18,30 @@ class PWMPCA(BasicRelay):
     def __init__(
         self,
         pin: int,
-        pca: PCA9685,
+        pca_outputs: PCAOutputs,
+        fade_engine: FadeEngine,
         percentage_default_brightness: int,
         output_type=SWITCH,
         restored_state: bool = False,
         restored_brightness: int = 0,
+        transition: TimePeriod | None = None,
+        gamma: float = 1.0,
         **kwargs,
     ) -> None:
         """Initialize PWMPCA."""
-        self._pin: PCAChannels = pca.channels[pin]
+        self._pca_outputs = pca_outputs
+        self._fade_engine = fade_engine
+        self._transition = transition.total_in_seconds if transition else 0
+        self._gamma = gamma
+        pca_outputs.setup_channel(pin)
         super().__init__(
             **kwargs, output_type=output_type, restored_state=restored_state
         )
         self._percentage_default_brightness = percentage_default_brightness
         self._brightness = restored_brightness if restored_state else 0
         self._pin_id = pin
+        self._dim_up = False
+        self._dimming = False
         _LOGGER.debug("Setup PCA with pin %s", self._pin_id)
 
     @property
@@ -45,41 +56,97 @@ class PWMPCA(BasicRelay):
 
     @property
     def brightness(self) -> int:
-        """Get brightness in 0-65535 scale. PCA can force over 65535 value after restart, so we treat that as a 0"""
-        try:
-            if self._pin.duty_cycle > 65535:
-                return 0
-            return self._pin.duty_cycle
-        except:
-            _LOGGER.error("Cant read value form driver on pin %s", self._pin_id)
-            return 0
-
-    def set_brightness(self, value: int):
-        try:
-            """Set brightness in 0-65535 vale"""
-            _LOGGER.debug("Set brightness relay %s.", value)
-            self._pin.duty_cycle = value
-        except:
-            _LOGGER.error("Cant set value form driver on pin %s", self._pin_id)
+        """Get brightness in 0-65535 scale from channel cache.
+        During transition it is brightness channel fades to."""
+        target = self._fade_engine.target(self._pin_id)
+        if target is not None:
+            return target
+        return self._pca_outputs.duty_cycle(self._pin_id)
+
+    def set_brightness(self, value: int, transition: float | None = None):
+        """Set brightness in 0-65535 value. Transition in seconds, default
+        transition of output is used if not given."""
+        if not 0 <= value <= 65535:
+            _LOGGER.error("Brightness %s out of range on pin %s", value, self._pin_id)
+            return
+        _LOGGER.debug("Set brightness relay %s.", value)
+        self._dimming = False
+        self._fade_engine.fade(
+            channel=self._pin_id,
+            target=value,
+            duration=self._transition if transition is None else transition,
+            gamma=self._gamma,
+        )
+
+    @property
+    def _default_brightness(self) -> int:
+        return int(65535 / 100 * self._percentage_default_brightness)
+
+    def _perceived(self, value: int) -> float:
+        return (value / 65535) ** (1 / self._gamma)
+
+    def start_dim(self, duration: float, direction: str = "toggle") -> None:
+        """Ramp brightness until stop_dim. Duration is time of ramp over
+        whole range. Toggle direction goes the other way than last time,
+        unless output is at its limit. Ramp never goes below default brightness."""
+        current = self._pca_outputs.duty_cycle(self._pin_id)
+        low = self._default_brightness
+        if direction != "toggle":
+            up = direction == "up"
+        elif current <= low:
+            up = True
+        elif current >= 65535:
+            up = False
+        else:
+            up = not self._dim_up
+        self._dim_up = up
+        self._dimming = True
+        target = 65535 if up else low
+        _LOGGER.debug("Dim relay %s %s.", self.id, "up" if up else "down")
+        self._fade_engine.fade(
+            channel=self._pin_id,
+            target=target,
+            duration=duration * abs(self._perceived(target) - self._perceived(current)),
+            gamma=self._gamma,
+        )
+
+    @property
+    def is_dimming(self) -> bool:
+        """Is ramp started by start_dim running until stop_dim."""
+        return self._dimming
+
+    def stop_dim(self) -> None:
+        """Stop ramp where it is and send final brightness."""
+        if not self._dimming:
+            return
+        self._dimming = False
+        self._fade_engine.cancel(self._pin_id)
+        self.send_state()
 
     @property
     def is_active(self) -> bool:
         """Is relay active."""
         return self.brightness > 1
 
-    def turn_on(self) -> None:
+    async def async_turn_on(self, transition: float | None = None) -> None:
+        self.turn_on(transition=transition)
+
+    async def async_turn_off(self, transition: float | None = None) -> None:
+        self.turn_off(transition=transition)
+
+    def turn_on(self, transition: float | None = None) -> None:
         """Call turn on action. When brightness is 0, and turn on by switch, default set value to 1%"""
         _LOGGER.debug("Turn on relay.")
         if self.brightness == 0:
-            self.set_brightness(int(65535 / 100 * self._percentage_default_brightness))
+            self.set_brightness(self._default_brightness, transition=transition)
         self._execute_momentary_turn(momentary_type=ON)
         self._loop.call_soon_threadsafe(self.send_state)
         self._loop.call_soon_threadsafe(self._callback)
 
-    def turn_off(self) -> None:
+    def turn_off(self, transition: float | None = None) -> None:
         """Call turn off action."""
         _LOGGER.debug("Turn off relay.")
-        self._pin.duty_cycle = 0
+        self.set_brightness(0, transition=transition)
         self._execute_momentary_turn(momentary_type=OFF)
         self._loop.call_soon_threadsafe(self.send_state)
         self._loop.call_soon_threadsafe(self._callback)
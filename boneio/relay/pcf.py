@@ -2,11 +2,9 @@
 
 import logging
 
-from adafruit_pcf8575 import DigitalInOut
-
 from boneio.const import NONE, SWITCH, PCF, ON, OFF
 from boneio.helper.events import async_track_point_in_time, utcnow
-from boneio.helper.pcf8575 import PCF8575
+from boneio.helper.expander_outputs import ExpanderOutputs
 from boneio.relay.basic import BasicRelay
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,24 +16,24 @@ class PCFRelay(BasicRelay):
     def __init__(
         self,
         pin: int,
-        expander: PCF8575,
+        expander_outputs: ExpanderOutputs,
         expander_id: str,
         output_type: str = SWITCH,
         restored_state: bool = False,
         **kwargs,
     ) -> None:
         """Initialize MCP relay."""
-        self._pin: DigitalInOut = expander.get_pin(pin)
+        self._expander_outputs = expander_outputs
+        self._active_state = False
         if output_type == NONE:
             """Just in case to not restore state of covers etc."""
             restored_state = False
-        self._pin.switch_to_output(value=restored_state)
+        expander_outputs.setup_output(pin=pin, level=restored_state)
         super().__init__(
             **kwargs, output_type=output_type, restored_state=restored_state
         )
         self._pin_id = pin
         self._expander_id = expander_id
-        self._active_state = False
         _LOGGER.debug("Setup PCF with pin %s", self._pin_id)
 
     @property
@@ -43,6 +41,11 @@ class PCFRelay(BasicRelay):
         """Check expander type."""
         return PCF
 
+    @property
+    def active_level(self) -> bool:
+        """Level of pin when relay is active."""
+        return self._active_state
+
     @property
     def pin_id(self) -> int:
         """Return PIN id."""
@@ -56,23 +59,20 @@ class PCFRelay(BasicRelay):
     @property
     def is_active(self) -> bool:
         """Is relay active."""
-        return self.pin.value == self._active_state
-
-    @property
-    def pin(self) -> str:
-        """PIN of the relay"""
-        return self._pin
+        return self._expander_outputs.level(self._pin_id) == self._active_state
 
     def turn_on(self) -> None:
         """Call turn on action."""
-        self.pin.value = self._active_state
+        applied = self._expander_outputs.set_level(self._pin_id, self._active_state)
         self._execute_momentary_turn(momentary_type=ON)
-        self._loop.call_soon_threadsafe(self.send_state)
-        self._loop.call_soon_threadsafe(self._callback)
+        if applied:
+            # Otherwise interlock holds pin for dead time and reports it later.
+            self._loop.call_soon_threadsafe(self.send_state)
+            self._loop.call_soon_threadsafe(self._callback)
 
     def turn_off(self) -> None:
         """Call turn off action."""
-        self.pin.value = not self._active_state
+        self._expander_outputs.set_level(self._pin_id, not self._active_state)
         self._execute_momentary_turn(momentary_type=OFF)
         self._loop.call_soon_threadsafe(self.send_state)
         self._loop.call_soon_threadsafe(self._callback)
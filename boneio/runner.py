@@ -10,13 +10,19 @@ from boneio.const import (
     ADC,
     BINARY_SENSOR,
     COVER,
+    COVER_ENGINE,
+    COVER_GROUP,
     DALLAS,
     DS2482,
     ENABLED,
     EVENT_ENTITY,
+    GPIO_BACKEND,
     HA_DISCOVERY,
     HOST,
+    I2C_BUSES,
+    I2C_STATS,
     INA219,
+    INTERLOCK,
     LM75,
     MCP23017,
     MCP_TEMP_9808,
@@ -30,12 +36,14 @@ from boneio.const import (
     PCA9685,
     PCF8575,
     PORT,
+    PULSE_COUNTER,
     SENSOR,
     TOPIC_PREFIX,
     USERNAME,
 )
 from boneio.helper import StateManager
 from boneio.helper.config import ConfigHelper
+from boneio.helper.executor import ExecutorService
 from boneio.manager import Manager
 from boneio.mqtt_client import MQTTClient
 
@@ -48,10 +56,17 @@ config_modules = [
     {"name": DS2482, "default": []},
     {"name": ADC, "default": []},
     {"name": COVER, "default": []},
+    {"name": COVER_GROUP, "default": []},
+    {"name": COVER_ENGINE, "default": {}},
+    {"name": INTERLOCK, "default": []},
     {"name": MODBUS, "default": {}},
     {"name": OLED, "default": {}},
     {"name": DALLAS, "default": None},
     {"name": OUTPUT_GROUP, "default": []},
+    {"name": GPIO_BACKEND, "default": "bbio"},
+    {"name": PULSE_COUNTER, "default": []},
+    {"name": I2C_BUSES, "default": []},
+    {"name": I2C_STATS, "default": {}},
 ]
 
 
@@ -81,6 +96,7 @@ async def async_run(
     }
 
 
+    executor_service = ExecutorService()
     manager = Manager(
         send_message=client.send_message,
         stop_client=client.stop_client,
@@ -89,8 +105,10 @@ async def async_run(
         event_pins=config.get(EVENT_ENTITY, []),
         binary_pins=config.get(BINARY_SENSOR, []),
         config_file_path=config_file,
+        executor_service=executor_service,
         state_manager=StateManager(
-            state_file=f"{os.path.split(config_file)[0]}state.json"
+            state_file=f"{os.path.split(config_file)[0]}state.json",
+            executor_service=executor_service,
         ),
         config_helper=_config_helper,
         sensors={
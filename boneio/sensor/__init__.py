@@ -2,10 +2,13 @@
 from boneio.sensor.adc import GpioADCSensor, initialize_adc
 from boneio.sensor.gpio import GpioInputBinarySensor as GpioInputBinarySensorOld
 from boneio.sensor.gpio_new import GpioInputBinarySensorNew
+from boneio.sensor.gpio_cdev import GpioInputBinarySensorCdev
+from boneio.sensor.expander import ExpanderInputBinarySensor
 from boneio.sensor.temp.dallas import DallasSensorDS2482
 from boneio.sensor.temp.lm75 import LM75Sensor
 from boneio.sensor.temp.mcp9808 import MCP9808Sensor
 from boneio.sensor.ina219 import INA219
+from boneio.sensor.pulse_counter import GpioPulseSource, PulseCounter
 
 __all__ = [
     "DallasSensorDS2482",
@@ -13,7 +16,11 @@ __all__ = [
     "MCP9808Sensor",
     "GpioInputBinarySensorOld",
     "GpioInputBinarySensorNew",
+    "GpioInputBinarySensorCdev",
+    "ExpanderInputBinarySensor",
     "initialize_adc",
     "GpioADCSensor",
-    "INA219"
+    "INA219",
+    "GpioPulseSource",
+    "PulseCounter",
 ]
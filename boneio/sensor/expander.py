@@ -0,0 +1,66 @@
+"""ExpanderInputBinarySensor to receive signals from MCP23017/PCF8575 pins."""
+import logging
+import time
+
+from boneio.const import PRESSED, RELEASED
+from boneio.helper import GpioBaseClass
+from boneio.helper.expander_inputs import ExpanderInputs
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExpanderInputBinarySensor(GpioBaseClass):
+    """Represent binary sensor on expander pin."""
+
+    def __init__(
+        self, expander_inputs: ExpanderInputs, expander_pin: int, **kwargs
+    ) -> None:
+        """Setup expander binary sensor"""
+        super().__init__(**kwargs)
+        self._expander_inputs = expander_inputs
+        self._expander_pin = expander_pin
+        # Pin is inactive until expander is read.
+        self._state = False
+        expander_inputs.register(
+            pin=expander_pin,
+            callback=self.check_state,
+            on_ready=self._set_initial_state,
+            bounce_time=self._bounce_time,
+        )
+        self._click_type = (
+            (RELEASED, PRESSED)
+            if kwargs.get("inverted", False)
+            else (PRESSED, RELEASED)
+        )
+        _LOGGER.debug(
+            "Configured sensor pin %s of expander %s", expander_pin, expander_inputs.id
+        )
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        """Expander pin is set up when registered."""
+
+    def _set_initial_state(self, state: bool) -> None:
+        """State read when pin was set up, nothing is sent for it."""
+        self._state = state
+
+    @property
+    def is_pressed(self) -> bool:
+        """Is sensor active."""
+        return self._expander_inputs.is_active(self._expander_pin)
+
+    def check_state(self, state: bool) -> None:
+        if not self._edge_allowed(time.monotonic()):
+            return
+        self.update_state(state)
+
+    def resync(self) -> None:
+        """Update state from last read expander value."""
+        self.update_state(self.is_pressed)
+
+    def update_state(self, state: bool) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        click_type = self._click_type[0] if state else self._click_type[1]
+        _LOGGER.debug("%s event on pin %s", click_type, self._pin)
+        self.press_callback(click_type=click_type, duration=None)
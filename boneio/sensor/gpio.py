@@ -1,6 +1,6 @@
 """GpioInputBinarySensor to receive signals."""
 import logging
-import asyncio
+import time
 from boneio.const import PRESSED, RELEASED
 from boneio.helper import GpioBaseClass
 
@@ -13,21 +13,26 @@ class GpioInputBinarySensor(GpioBaseClass):
     def __init__(self, **kwargs) -> None:
         """Setup GPIO Input Button"""
         super().__init__(**kwargs)
-        self._state = self.is_pressed
+        self._state = kwargs["input_scanner"].register(
+            pin=self._pin, callback=self.check_state, bounce_time=self._bounce_time
+        )
         self._click_type = (
             (RELEASED, PRESSED)
             if kwargs.get("inverted", False)
             else (PRESSED, RELEASED)
         )
         _LOGGER.debug("Configured sensor pin %s", self._pin)
-        asyncio.create_task(self._run())
-
-    async def _run(self) -> None:
-        while True:
-            self.check_state(state=self.is_pressed)
-            await asyncio.sleep(self._bounce_time)
 
     def check_state(self, state: bool) -> None:
+        if not self._edge_allowed(time.monotonic()):
+            return
+        self.update_state(state)
+
+    def resync(self) -> None:
+        """Update state from current pin value."""
+        self.update_state(self.is_pressed)
+
+    def update_state(self, state: bool) -> None:
         if state == self._state:
             return
         self._state = state
@@ -0,0 +1,73 @@
+"""GpioInputBinarySensorCdev to receive signals from GPIO character device."""
+import logging
+
+from boneio.const import PRESSED, RELEASED
+from boneio.helper import GpioBaseClass
+from boneio.helper.gpio import configure_pin
+from boneio.helper.gpio_cdev import CdevEventSource, LineEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GpioInputBinarySensorCdev(GpioBaseClass):
+    """Represent Gpio sensor on input boards with kernel timestamped edges."""
+
+    def __init__(self, cdev_source: CdevEventSource, **kwargs) -> None:
+        """Setup GPIO Input Button"""
+        self._gpio_mode = None
+        super().__init__(**kwargs)
+        self._cdev_source = cdev_source
+        line = cdev_source.add_pin(
+            pin=self._pin,
+            callback=self.check_state,
+            bias=self._gpio_mode,
+            debounce=self._bounce_time,
+        )
+        # Without kernel debounce, drop edges closer than bounce time.
+        self._bounce_ns = 0 if line.kernel_debounce else int(self._bounce_time * 1e9)
+        self._last_event_ns = 0
+        self._state = self.is_pressed
+        self._click_type = (
+            (RELEASED, PRESSED)
+            if kwargs.get("inverted", False)
+            else (PRESSED, RELEASED)
+        )
+        _LOGGER.debug("Configured cdev sensor pin %s", self._pin)
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        """Only set pinmux, line itself is requested from character device."""
+        self._gpio_mode = gpio_mode
+        configure_pin(pin=self._pin, mode=gpio_mode)
+
+    @property
+    def is_pressed(self) -> bool:
+        """Is sensor active."""
+        return self._cdev_source.value(self._pin)
+
+    def check_state(self, event: LineEvent) -> None:
+        if not self._edge_allowed(event.timestamp):
+            return
+        if event.timestamp_ns - self._last_event_ns < self._bounce_ns:
+            # Line may settle in other state, check it when bounce time is over.
+            self._loop.call_later(self._bounce_time, self.resync)
+            return
+        self._last_event_ns = event.timestamp_ns
+        self.update_state(event.rising)
+
+    def resync(self) -> None:
+        """Update state from current line value."""
+        self.update_state(self.is_pressed)
+
+    def _suspend_edges(self) -> None:
+        self._cdev_source.pause(self._pin)
+
+    def _resume_edges(self) -> None:
+        self._cdev_source.resume(self._pin)
+
+    def update_state(self, state: bool) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        click_type = self._click_type[0] if state else self._click_type[1]
+        _LOGGER.debug("%s event on pin %s - %s", click_type, self._pin, self.name)
+        self.press_callback(click_type=click_type, duration=None)
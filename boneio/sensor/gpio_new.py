@@ -1,5 +1,6 @@
 """GpioInputBinarySensorNew to receive signals."""
 import logging
+import time
 from boneio.const import PRESSED, RELEASED, BOTH
 from boneio.helper import GpioBaseClass
 from boneio.helper.gpio import add_event_callback, add_event_detect
@@ -24,6 +25,12 @@ class GpioInputBinarySensorNew(GpioBaseClass):
         add_event_callback(pin=self._pin, callback=self.check_state)
 
     def check_state(self, _) -> None:
+        if not self._edge_allowed(time.monotonic()):
+            return
+        self.resync()
+
+    def resync(self) -> None:
+        """Update state from current pin value."""
         state = self.is_pressed
         if state == self._state:
             return
@@ -6,6 +6,7 @@ import asyncio
 from boneio.const import SENSOR, STATE
 from boneio.helper import BasicMqtt, AsyncUpdater
 from boneio.helper.filter import Filter
+from boneio.helper.i2c_worker import I2CBusWorker
 from boneio.helper.sensor.ina_219_smbus import INA219_I2C
 
 _LOGGER = logging.getLogger(__name__)
@@ -65,10 +66,19 @@ class INA219Sensor(BasicMqtt, Filter):
 class INA219(AsyncUpdater, Filter):
     """Represent INA219 sensors."""
 
-    def __init__(self, address: int, id: str, sensors: list[dict] = [], **kwargs) -> None:
+    def __init__(
+        self,
+        address: int,
+        id: str,
+        i2c_worker: I2CBusWorker,
+        i2c_bus: int = 2,
+        sensors: list[dict] = [],
+        **kwargs,
+    ) -> None:
         """Setup GPIO ADC Sensor"""
         self._loop = asyncio.get_event_loop()
-        self._ina_219 = INA219_I2C(address=address)
+        self._i2c_worker = i2c_worker
+        self._ina_219 = INA219_I2C(address=address, _bus=i2c_bus)
         self._sensors = {}
         self._states = {}
         self._id = id
@@ -95,10 +105,18 @@ class INA219(AsyncUpdater, Filter):
     def sensors(self) -> dict:
         return self._sensors
 
+    def _read(self) -> dict:
+        """Read all configured values. Runs in I2C worker."""
+        return {k: getattr(self._ina_219, k) for k in self._states.keys()}
+
     async def async_update(self, time: datetime) -> None:
         """Fetch temperature periodically and send to MQTT."""
-        for k in self._states.keys():
-            value = getattr(self._ina_219, k)
+        try:
+            values = await self._i2c_worker.run(self._read)
+        except OSError as err:
+            _LOGGER.error("Can't read INA219 %s. %s", self._id, err)
+            return
+        for k, value in values.items():
             self._states[k] = value
             _LOGGER.debug("Read %s with value: %s", k, value)
         for k, sensor in self._sensors.items():
@@ -0,0 +1,105 @@
+"""Pulse counter for S0 energy meters, water and gas meters."""
+from __future__ import annotations
+
+import logging
+from time import monotonic
+
+from boneio.const import FALLING, PULSE_COUNTER, SENSOR
+from boneio.helper import AsyncUpdater, BasicMqtt, StateManager
+from boneio.helper.gpio import add_event_callback, add_event_detect, setup_input
+
+_LOGGER = logging.getLogger(__name__)
+
+RATE_TIME_UNITS = {"s": 1, "min": 60, "h": 3600}
+
+
+class GpioPulseSource:
+    """Count pulses with Adafruit_BBIO edge detection.
+
+    Used if GPIO character device can't be used. Callback only bumps counter
+    in BBIO thread, nothing is passed to loop.
+    """
+
+    def __init__(self, pin: str, gpio_mode: str) -> None:
+        """Setup pin and edge detection."""
+        self.pin = pin
+        self.pulses = 0
+        self.last_pulse: float | None = None
+        setup_input(pin=pin, pull_mode=gpio_mode)
+        add_event_detect(pin=pin, edge=FALLING)
+        add_event_callback(pin=pin, callback=self._pulse)
+
+    def _pulse(self, _) -> None:
+        self.pulses += 1
+        self.last_pulse = monotonic()
+
+
+class PulseCounter(BasicMqtt, AsyncUpdater):
+    """Publish total and rate of pulses counted by source.
+
+    Source is anything with pulses (counter since start) and last_pulse
+    (monotonic time of last pulse) attributes. Rate is computed from pulse
+    timestamps, so slow meters giving one pulse per minute are still precise.
+    """
+
+    def __init__(
+        self,
+        source,
+        state_manager: StateManager,
+        pulses_per_unit: float,
+        rate_time_unit: str = "h",
+        rate_multiplier: float = 1,
+        **kwargs,
+    ) -> None:
+        """Setup pulse counter."""
+        super().__init__(topic_type=SENSOR, **kwargs)
+        self._source = source
+        self._state_manager = state_manager
+        self._pulses_per_unit = pulses_per_unit
+        self._rate_factor = RATE_TIME_UNITS[rate_time_unit] * rate_multiplier
+        self._total = float(
+            state_manager.get(attr_type=PULSE_COUNTER, attr=self.id, default_value=0)
+        )
+        self._last_pulses = source.pulses
+        self._last_pulse = source.last_pulse
+        self._started = monotonic()
+        # Pulses per second.
+        self._rate = 0.0
+        AsyncUpdater.__init__(self, **kwargs)
+        _LOGGER.debug("Configured pulse counter %s, total %s", self.id, self._total)
+
+    @property
+    def total(self) -> float:
+        """Total in units."""
+        return self._total
+
+    @property
+    def rate(self) -> float:
+        """Rate in units per rate time unit."""
+        return self._rate / self._pulses_per_unit * self._rate_factor
+
+    def update(self, time: float) -> None:
+        """Account pulses since last update and send state to MQTT."""
+        now = monotonic()
+        pulses = self._source.pulses
+        last_pulse = self._source.last_pulse
+        delta = pulses - self._last_pulses
+        if delta:
+            self._last_pulses = pulses
+            self._total += delta / self._pulses_per_unit
+            self._state_manager.save_attribute(
+                attr_type=PULSE_COUNTER, attribute=self.id, value=self._total
+            )
+            if self._last_pulse is not None and last_pulse > self._last_pulse:
+                # Delta pulses happened after previous last pulse.
+                self._rate = delta / (last_pulse - self._last_pulse)
+            else:
+                self._rate = delta / max(now - self._started, 1)
+            self._last_pulse = last_pulse
+        elif self._last_pulse is not None:
+            # Next pulse hasn't come yet, so rate is at most one pulse since last one.
+            self._rate = min(self._rate, 1 / max(now - self._last_pulse, 1e-3))
+        self._send_message(
+            topic=self._send_topic,
+            payload={"total": round(self.total, 4), "rate": round(self.rate, 4)},
+        )
@@ -8,6 +8,7 @@ from boneio.const import SENSOR, STATE, TEMPERATURE
 from boneio.helper import BasicMqtt, AsyncUpdater
 from boneio.helper.exceptions import I2CError
 from boneio.helper.filter import Filter
+from boneio.helper.i2c_worker import I2CBusWorker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +22,7 @@ class TempSensor(BasicMqtt, AsyncUpdater, Filter):
     def __init__(
         self,
         i2c,
+        i2c_worker: I2CBusWorker,
         address: str,
         id: str = DefaultName,
         filters: list = ["round(x, 2)"],
@@ -29,6 +31,7 @@ class TempSensor(BasicMqtt, AsyncUpdater, Filter):
         """Initialize Temp class."""
         super().__init__(id=id, topic_type=SENSOR, **kwargs)
         self._loop = asyncio.get_event_loop()
+        self._i2c_worker = i2c_worker
         self._filters = filters
         try:
             self._pct = self.SensorClass(i2c_bus=i2c, address=address)
@@ -42,13 +45,17 @@ class TempSensor(BasicMqtt, AsyncUpdater, Filter):
         """Give rounded value of temperature."""
         return self._state
 
-    def update(self, time: datetime) -> None:
+    def _read(self) -> float:
+        """Read temperature. Runs in I2C worker."""
+        return self._pct.temperature
+
+    async def async_update(self, time: datetime) -> None:
         """Fetch temperature periodically and send to MQTT."""
         try:
-            _temp = self._pct.temperature
+            _temp = await self._i2c_worker.run(self._read)
             _LOGGER.debug("Fetched temperature %s. Applying filters.", _temp)
-            _temp = self._apply_filters(value=self._pct.temperature)
-        except RuntimeError as err:
+            _temp = self._apply_filters(value=_temp)
+        except (RuntimeError, OSError) as err:
             _temp = None
             _LOGGER.error("Sensor error: %s %s", err, self.id)
         if _temp is None:
@@ -10,6 +10,7 @@ from w1thermsensor import SensorNotReadyError, NoSensorFoundError
 from boneio.const import SENSOR, STATE, TEMPERATURE
 from boneio.helper import AsyncUpdater, BasicMqtt
 from boneio.helper.exceptions import OneWireError
+from boneio.helper.i2c_worker import I2CBusWorker
 from boneio.helper.onewire import AsyncBoneIOW1ThermSensor, OneWireAddress, OneWireBus
 
 from . import TempSensor
@@ -25,11 +26,13 @@ class DallasSensorDS2482(TempSensor, AsyncUpdater):
         self,
         bus: OneWireBus,
         address: OneWireAddress,
+        i2c_worker: I2CBusWorker,
         id: str = DefaultName,
         **kwargs,
     ):
         """Initialize Temp class."""
         self._loop = asyncio.get_event_loop()
+        self._i2c_worker = i2c_worker
         BasicMqtt.__init__(self, id=id, topic_type=SENSOR, **kwargs)
         try:
             self._pct = DS18X20(bus=bus, address=address)
@@ -38,6 +41,26 @@ class DallasSensorDS2482(TempSensor, AsyncUpdater):
             raise OneWireError(err)
         AsyncUpdater.__init__(self, **kwargs)
 
+    async def async_update(self, time: datetime) -> None:
+        """Start conversion, wait for it outside of I2C worker and read result,
+        so bus is free during conversion."""
+        try:
+            delay = await self._i2c_worker.run(self._pct.start_temperature_read)
+            await asyncio.sleep(delay)
+            _temp = await self._i2c_worker.run(self._pct.read_temperature)
+            _LOGGER.debug("Fetched temperature %s. Applying filters.", _temp)
+            _temp = self._apply_filters(value=_temp)
+        except (RuntimeError, OSError) as err:
+            _LOGGER.error("Sensor error: %s %s", err, self.id)
+            return
+        if _temp is None:
+            return
+        self._state = _temp
+        self._send_message(
+            topic=self._send_topic,
+            payload={STATE: self._state},
+        )
+
 
 class DallasSensorW1(TempSensor, AsyncUpdater):
     DefaultName = TEMPERATURE
@@ -0,0 +1,102 @@
+import logging
+import time
+
+from boneio.const import DOUBLE, HOLD, LONG, SINGLE, TRIPLE
+from boneio.helper.click_engine import ClickTimings, replay
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMINGS = ClickTimings(
+    multi_click=0.18, long_press=0.6, hold_repeat=0.2, max_clicks=3, bounce=0.03
+)
+
+# Recorded (pressed, timestamp) edges of one button and events they must give
+# as (timestamp, click_type, duration).
+TRACES = {
+    "single": (
+        [(True, 0.0), (False, 0.05)],
+        [(0.18, SINGLE, None)],
+    ),
+    "double": (
+        [(True, 0.0), (False, 0.05), (True, 0.1), (False, 0.15)],
+        [(0.28, DOUBLE, None)],
+    ),
+    # Third click reaches max_clicks, so it is sent without waiting.
+    "triple": (
+        [(True, 0.0), (False, 0.05), (True, 0.1), (False, 0.15), (True, 0.2)]
+        + [(False, 0.25)],
+        [(0.2, TRIPLE, None)],
+    ),
+    "long_hold": (
+        [(True, 0.0), (False, 1.1)],
+        [(0.6, LONG, 0.6), (0.8, HOLD, 0.8), (1.0, HOLD, 1.0)],
+    ),
+    "click_then_long": (
+        [(True, 0.0), (False, 0.05), (True, 0.5), (False, 1.35)],
+        [(0.18, SINGLE, None), (1.1, LONG, 0.6), (1.3, HOLD, 0.8)],
+    ),
+    # Contact bounces 5 ms after press, second press is within bounce time.
+    "bounce": (
+        [(True, 0.0), (False, 0.005), (True, 0.01), (False, 0.06)],
+        [(0.18, SINGLE, None)],
+    ),
+}
+
+PINS = 256
+CYCLE = 0.3
+DURATION = 10.0
+# Double click of every pin in each cycle: press, release, press, release.
+CYCLE_EDGES = ((0.0, True), (0.04, False), (0.08, True), (0.12, False))
+
+
+def test_click_replay():
+    """Replay recorded traces, all of them at once on separate pins."""
+    edges = sorted(
+        (
+            (name, pressed, ts)
+            for name, (trace, _) in TRACES.items()
+            for pressed, ts in trace
+        ),
+        key=lambda x: x[2],
+    )
+    events = replay(edges, TIMINGS)
+    for name, (_, expected) in TRACES.items():
+        got = [
+            (round(ts, 3), click_type, duration)
+            for ts, pin, click_type, duration in events
+            if pin == name
+        ]
+        assert got == expected, f"{name}: {got} != {expected}"
+    print(f"{len(TRACES)} traces replayed, {len(events)} events as expected")
+
+
+def test_click_replay_throughput():
+    """Replay double clicks of PINS buttons, thousands of edges per second of
+    trace time, and measure how fast engine classifies them."""
+    edges = []
+    cycles = int(DURATION / CYCLE)
+    for i in range(PINS):
+        offset = i * CYCLE / PINS
+        for cycle in range(cycles):
+            start = cycle * CYCLE + offset
+            edges.extend(
+                (f"pin{i}", pressed, start + ts) for ts, pressed in CYCLE_EDGES
+            )
+    edges.sort(key=lambda x: x[2])
+    start = time.perf_counter()
+    events = replay(edges, TIMINGS)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(edges)} edges ({len(edges) / DURATION:.0f}/s of trace) classified "
+        f"in {elapsed:.2f}s, {len(edges) / elapsed:.0f} edges/s, {len(events)} events"
+    )
+    assert len(events) == PINS * cycles
+    assert all(click_type == DOUBLE for _, _, click_type, _ in events)
+    # Engine must keep up with trace in real time with plenty of margin.
+    assert elapsed < DURATION / 10
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    test_click_replay()
+    test_click_replay_throughput()
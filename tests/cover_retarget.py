@@ -0,0 +1,102 @@
+import asyncio
+import logging
+
+from boneio.cover import Cover
+from boneio.cover_engine import CoverEngine
+from boneio.helper.timeperiod import TimePeriod
+from boneio.helper.timer import TimerService
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATES = 50
+DURATION = 2.0
+# Slider is dragged from 50% down to 40% and back up to 60%, so cover
+# reverses once.
+START = 50
+DRAG = [START - round(10 * (i + 1) / 25) for i in range(25)] + [
+    40 + round(20 * (i + 1) / 25) for i in range(25)
+]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRelay:
+    """Relay which counts switching of its contact."""
+
+    def __init__(self) -> None:
+        self.is_active = False
+        self.transitions = 0
+
+    def turn_on(self) -> None:
+        if not self.is_active:
+            self.transitions += 1
+        self.is_active = True
+
+    def turn_off(self) -> None:
+        if self.is_active:
+            self.transitions += 1
+        self.is_active = False
+
+
+class FakeEventBus:
+    def add_sigterm_listener(self, target) -> None:
+        pass
+
+
+def run_until(timer_service: TimerService, clock: FakeClock, until: float) -> None:
+    """Run timers in order of their deadlines up to until."""
+    while (
+        timer_service.next_deadline is not None and timer_service.next_deadline <= until
+    ):
+        clock.now = timer_service.next_deadline
+        timer_service.run_due()
+    clock.now = until
+
+
+async def test_cover_retarget():
+    """Send UPDATES positions in DURATION like HA slider drag and count
+    relay transitions and messages."""
+    clock = FakeClock()
+    timer_service = TimerService(clock=clock)
+    open_relay = FakeRelay()
+    close_relay = FakeRelay()
+    messages = []
+    cover = Cover(
+        id="cover",
+        open_relay=open_relay,
+        close_relay=close_relay,
+        state_save=lambda position: None,
+        open_time=TimePeriod(seconds=30),
+        close_time=TimePeriod(seconds=30),
+        event_bus=FakeEventBus(),
+        cover_engine=CoverEngine(timer_service=timer_service),
+        dead_time=TimePeriod(milliseconds=500),
+        restored_state=START,
+        send_message=lambda topic, payload, retain=False: messages.append(
+            (topic, payload)
+        ),
+        topic_prefix="boneio",
+    )
+    for i, position in enumerate(DRAG):
+        run_until(timer_service, clock, i * DURATION / UPDATES)
+        await cover.set_cover_position(position=position)
+    run_until(timer_service, clock, 60)
+    transitions = open_relay.transitions + close_relay.transitions
+    print(
+        f"{UPDATES} updates in {DURATION}s: {transitions} relay transitions, "
+        f"{len(messages)} messages, position {cover.current_cover_position}"
+    )
+    # Close on, close off, open on after dead time, open off at target.
+    assert transitions == 4
+    assert cover.current_cover_position == DRAG[-1]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(test_cover_retarget())
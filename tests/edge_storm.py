@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import statistics
+import threading
+import time
+
+from boneio.const import INPUT
+from boneio.helper.click_engine import ClickEngine
+from boneio.helper.edge_guard import (
+    GUARD_OK,
+    GUARD_QUARANTINED,
+    RECOVERY_TIME,
+    EdgeGuardMonitor,
+)
+from boneio.helper.gpio_cdev import CdevEventSource, pack_line_event
+from boneio.helper.timer import TimerService
+from boneio.input.gpio_cdev import GpioEventButtonCdev
+
+_LOGGER = logging.getLogger(__name__)
+
+STORM_PIN = "P8_30"
+STORM_RATE = 10_000
+QUIET_PINS = ("P8_31", "P8_32", "P8_33")
+DURATION = 5.0
+# Quiet pins send single click on release, measured from release edge.
+QUIET_P99_LIMIT = 0.05
+
+
+class PipeEventSource(CdevEventSource):
+    """Event source with pipes instead of requested GPIO lines."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(loop=loop)
+        self.writers = {}
+        self.values = {}
+
+    def add_pin(self, pin: str, callback, **kwargs):
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self.writers[pin] = write_fd
+        self.values[pin] = False
+        return self.add_fd(pin=pin, fd=read_fd, callback=callback)
+
+    def value(self, pin: str) -> bool:
+        return self.values[pin]
+
+    def write(self, pin: str, rising: bool) -> None:
+        self.values[pin] = rising
+        try:
+            os.write(self.writers[pin], pack_line_event(time.monotonic_ns(), rising))
+        except BlockingIOError:
+            # Kernel drops events once nobody reads them.
+            pass
+
+    def close(self) -> None:
+        super().close()
+        for fd in self.writers.values():
+            os.close(fd)
+
+
+class PipeEventButton(GpioEventButtonCdev):
+    """Cdev button without pinmux of real board."""
+
+    def _setup_pin(self, gpio_mode: str) -> None:
+        self._gpio_mode = gpio_mode
+
+
+def storm(source: PipeEventSource, stop: threading.Event) -> None:
+    """Write edges of STORM_PIN at STORM_RATE."""
+    rising = True
+    period = 1 / STORM_RATE
+    next_edge = time.monotonic()
+    while not stop.is_set():
+        now = time.monotonic()
+        if now < next_edge:
+            time.sleep(next_edge - now)
+        source.write(STORM_PIN, rising)
+        rising = not rising
+        next_edge += period
+    source.write(STORM_PIN, False)
+
+
+async def wait_for(condition, timeout: float) -> bool:
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        await asyncio.sleep(0.1)
+    return True
+
+
+async def run_storm(guarded: bool) -> dict:
+    """Run storm next to quiet pins, all of them real cdev buttons whose
+    clicks are sent through press callback."""
+    loop = asyncio.get_running_loop()
+    timer_service = TimerService(loop=loop)
+    source = PipeEventSource(loop=loop)
+    guard_states = []
+    monitor = (
+        EdgeGuardMonitor(
+            timer_service=timer_service,
+            listener=lambda guard: guard_states.append(guard.state),
+        )
+        if guarded
+        else None
+    )
+    click_engine = ClickEngine(timer_service=timer_service)
+    released = {}
+    latencies = []
+    messages = []
+
+    async def press_callback(
+        x, inpin, actions, input_type, empty_message_after, duration
+    ):
+        # Stands for mqtt message sent by manager.
+        messages.append((inpin, x))
+        if inpin in released:
+            latencies.append(time.monotonic() - released.pop(inpin))
+
+    buttons = {
+        pin: PipeEventButton(
+            pin=pin,
+            name=pin,
+            input_type=INPUT,
+            empty_message_after=False,
+            actions={},
+            press_callback=press_callback,
+            click_engine=click_engine,
+            cdev_source=source,
+            edge_guard_monitor=monitor,
+            max_clicks=2 if pin == STORM_PIN else 1,
+        )
+        for pin in (STORM_PIN,) + QUIET_PINS
+    }
+
+    stop = threading.Event()
+    thread = threading.Thread(target=storm, args=(source, stop))
+    thread.start()
+    end = time.monotonic() + DURATION
+    while time.monotonic() < end:
+        for pin in QUIET_PINS:
+            source.write(pin, True)
+        await asyncio.sleep(0.025)
+        for pin in QUIET_PINS:
+            released[pin] = time.monotonic()
+            source.write(pin, False)
+        await asyncio.sleep(0.025)
+    stop.set()
+    thread.join()
+    storm_messages = sum(1 for pin, _ in messages if pin == STORM_PIN)
+    result = {
+        "latencies": latencies,
+        "storm_messages": storm_messages,
+        "quarantined": False,
+        "recovered": False,
+        "clicks_after_recovery": 0,
+    }
+    guard = buttons[STORM_PIN].edge_guard
+    if guard is not None:
+        result["quarantined"] = GUARD_QUARANTINED in guard_states
+        result["recovered"] = await wait_for(
+            lambda: guard.state == GUARD_OK, timeout=2 * RECOVERY_TIME + 5
+        )
+        messages.clear()
+        for _ in range(3):
+            source.write(STORM_PIN, True)
+            await asyncio.sleep(0.05)
+            source.write(STORM_PIN, False)
+            await asyncio.sleep(1)
+        result["clicks_after_recovery"] = sum(
+            1 for pin, _ in messages if pin == STORM_PIN
+        )
+    source.close()
+    return result
+
+
+def report(name: str, result: dict) -> None:
+    ms = sorted(x * 1000 for x in result["latencies"])
+    print(
+        f"{name}: {result['storm_messages']} messages from storm pin, "
+        f"{len(ms)} clicks on quiet pins, "
+        f"p50 {statistics.median(ms):.2f} ms, "
+        f"p99 {ms[int(len(ms) * 0.99)]:.2f} ms, max {ms[-1]:.2f} ms"
+    )
+
+
+async def test_edge_storm():
+    """Inject STORM_RATE edges on one pipe line and measure latency of clicks
+    on other lines, without and with edge guard. Guarded storm pin must be
+    quarantined, quiet pins must stay responsive and storm pin must work
+    again after storm stops."""
+    report("Unguarded", await run_storm(guarded=False))
+    result = await run_storm(guarded=True)
+    report("Guarded", result)
+    latencies = sorted(result["latencies"])
+    assert result["quarantined"]
+    assert latencies[int(len(latencies) * 0.99)] < QUIET_P99_LIMIT
+    assert result["recovered"]
+    assert result["clicks_after_recovery"] == 3
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(test_edge_storm())
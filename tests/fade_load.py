@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boneio.helper.pca_outputs import PCAOutputs
+from boneio.relay.fade import FadeEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+PCA_COUNT = 2
+FRAME_RATE = 50
+DURATION = 5.0
+# Time of one 65 byte block write at 100 kHz.
+BLOCK_WRITE_TIME = 0.0065
+
+
+class FakeWriter:
+    """PCA9685 writer which only takes as long as real I2C block write."""
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def setup(self) -> None:
+        pass
+
+    def read_channels(self) -> list:
+        return [0] * 16
+
+    def write_channels(self, first: int, values: list) -> None:
+        time.sleep(BLOCK_WRITE_TIME)
+        self.writes += 1
+
+
+async def test_fade_load():
+    """Fade 16 channels on each PCA back and forth for DURATION and measure
+    written frames and loop lag seen by input handling."""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    writers = []
+    engines = []
+    for i in range(PCA_COUNT):
+        writer = FakeWriter()
+        pca_outputs = PCAOutputs(
+            pca_id=f"pca{i}", writer=writer, executor=executor, loop=loop
+        )
+        writers.append(writer)
+        engines.append(
+            FadeEngine(pca_outputs=pca_outputs, frame_rate=FRAME_RATE, loop=loop)
+        )
+    lags = []
+    end = loop.time() + DURATION
+    target = 65535
+    while loop.time() < end:
+        for engine in engines:
+            for channel in range(16):
+                engine.fade(channel=channel, target=target, duration=1, gamma=2.2)
+        target = 65535 - target
+        next_check = loop.time() + 1
+        while loop.time() < next_check:
+            # Input callback delay.
+            expected = loop.time() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append(loop.time() - expected)
+    ms = sorted(x * 1000 for x in lags)
+    frames = [writer.writes / DURATION for writer in writers]
+    print(
+        f"{PCA_COUNT * 16} channels at {FRAME_RATE} fps: "
+        f"{', '.join(f'{x:.1f}' for x in frames)} block writes/s per PCA, "
+        f"loop lag p50 {statistics.median(ms):.2f} ms, "
+        f"p99 {ms[int(len(ms) * 0.99)]:.2f} ms"
+    )
+    for engine in engines:
+        for channel in range(16):
+            engine.cancel(channel)
+    await asyncio.sleep(0.1)
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(test_fade_load())
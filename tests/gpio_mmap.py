@@ -0,0 +1,69 @@
+import logging
+import os
+import struct
+import tempfile
+
+from boneio.helper.gpio import (
+    GPIO_BANK_SIZE,
+    GPIO_CLEARDATAOUT,
+    GPIO_DATAIN,
+    GPIO_SETDATAOUT,
+    MmapGpioBackend,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BANKS = 4
+BANK_ADDRESSES = tuple(bank * GPIO_BANK_SIZE for bank in range(BANKS))
+
+
+def read_register(path: str, bank: int, register: int) -> int:
+    with open(path, "rb") as file:
+        file.seek(bank * GPIO_BANK_SIZE + register)
+        return struct.unpack("<I", file.read(4))[0]
+
+
+def write_register(path: str, bank: int, register: int, value: int) -> None:
+    with open(path, "r+b") as file:
+        file.seek(bank * GPIO_BANK_SIZE + register)
+        file.write(struct.pack("<I", value))
+
+
+def test_gpio_mmap():
+    """Map file standing in for /dev/mem and check that bank reads are masked
+    and bank writes go to SETDATAOUT/CLEARDATAOUT of the right bank only."""
+    fd, path = tempfile.mkstemp()
+    try:
+        os.write(fd, bytes(BANKS * GPIO_BANK_SIZE))
+        os.close(fd)
+        backend = MmapGpioBackend(path=path, bank_addresses=BANK_ADDRESSES)
+
+        write_register(path, 1, GPIO_DATAIN, 0xA5A5_0F0F)
+        assert backend.read_bank(1) == 0xA5A5_0F0F
+        assert backend.read_bank(1, mask=0x0000_FFFF) == 0x0F0F
+        assert backend.read_bank(1, mask=1 << 31) == 1 << 31
+        assert backend.read_bank(1, mask=1 << 4) == 0
+        assert backend.read_bank(2) == 0
+
+        backend.write_bank(2, set_mask=0x0000_0011)
+        assert read_register(path, 2, GPIO_SETDATAOUT) == 0x0000_0011
+        assert read_register(path, 2, GPIO_CLEARDATAOUT) == 0
+        backend.write_bank(2, clear_mask=0x8000_0000)
+        assert read_register(path, 2, GPIO_SETDATAOUT) == 0x0000_0011
+        assert read_register(path, 2, GPIO_CLEARDATAOUT) == 0x8000_0000
+        backend.write_bank(3, set_mask=0x2, clear_mask=0x4)
+        assert read_register(path, 3, GPIO_SETDATAOUT) == 0x2
+        assert read_register(path, 3, GPIO_CLEARDATAOUT) == 0x4
+        for bank in (0, 1):
+            assert read_register(path, bank, GPIO_SETDATAOUT) == 0
+            assert read_register(path, bank, GPIO_CLEARDATAOUT) == 0
+
+        backend.close()
+        print("mmap backend reads masked banks and writes set/clear registers")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    test_gpio_mmap()
@@ -0,0 +1,70 @@
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+from boneio.helper.expander_outputs import MCP23017OutputWriter
+
+_LOGGER = logging.getLogger(__name__)
+
+# MCP23017 on boneIO board. Its current latch is written back, outputs don't change.
+BUS = 2
+ADDRESS = 0x20
+WRITES = 2000
+IMPORT_RUNS = 5
+
+IMPORTS = {
+    "blinka": "import busio, board, adafruit_mcp230xx.mcp23017, adafruit_pca9685, adafruit_pcf8575",
+    # boneio.helper package is imported by app anyway, driver itself only needs smbus2.
+    "native": "import smbus2",
+}
+
+
+def import_time(statement: str) -> float:
+    """Import time in fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - start)"
+    )
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def create_mcp(driver: str):
+    if driver == "native":
+        from boneio.helper.i2c_native import NativeMCP23017
+
+        return NativeMCP23017(bus=BUS, address=ADDRESS)
+    from adafruit_mcp230xx.mcp23017 import MCP23017
+
+    from boneio.helper.i2c_bus import open_i2c_bus
+
+    return MCP23017(open_i2c_bus(BUS), address=ADDRESS, reset=False)
+
+
+def write_latency(driver: str) -> list:
+    """Latency of 16-bit latch write, as done by every relay flush."""
+    writer = MCP23017OutputWriter(mcp=create_mcp(driver))
+    latch = writer.read_latch()
+    times = []
+    for _ in range(WRITES):
+        start = time.perf_counter()
+        writer.write_latch(latch, 0xFFFF)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def test_i2c_drivers():
+    for driver, statement in IMPORTS.items():
+        imports = [import_time(statement) * 1000 for _ in range(IMPORT_RUNS)]
+        us = sorted(x * 1_000_000 for x in write_latency(driver))
+        print(
+            f"{driver}: import {statistics.median(imports):.1f} ms, "
+            f"write p50 {statistics.median(us):.0f} us, "
+            f"p99 {us[int(len(us) * 0.99)]:.0f} us"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    test_i2c_drivers()